@@ -5,93 +5,447 @@ Example client for the MCP Server
 This script demonstrates how to communicate with the MCP server using JSON-RPC.
 """
 
+import asyncio
+import atexit
+import contextlib
+import functools
+import hashlib
+import itertools
 import json
+import os
 import socket
+import struct
 import sys
-import argparse
+import time
+from collections import OrderedDict
 
+try:
+    import orjson
+except ImportError:
+    # Fall back to the standard library serializer
+    orjson = None
 
-def send_request(request, host="127.0.0.1", port=9000):
-    """Send a JSON-RPC request to the server and return the response"""
-    # Create a socket connection
-    sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+try:
+    import diskcache
+except ImportError:
+    # Responses are then only cached for the lifetime of the process
+    diskcache = None
+
+
+def _dumps(data):
+    """Serialize data to compact JSON bytes"""
+    if orjson is not None:
+        return orjson.dumps(data)
+    return json.dumps(data).encode('utf-8')
+
+
+def _loads(data):
+    """Parse JSON from bytes"""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+# Frame requests with a 4-byte big-endian length prefix instead of a trailing
+# newline. The server answers in the framing each request used.
+_length_prefixed = False
+
+# The server recognizes length-prefixed messages by their leading zero byte,
+# so longer payloads fall back to newline framing
+_MAX_PREFIXED_LENGTH = 1 << 24
+
+
+def _frame(payload):
+    """Return the buffers that make up one framed message and whether it is length-prefixed"""
+    if _length_prefixed and len(payload) < _MAX_PREFIXED_LENGTH:
+        return (struct.pack(">I", len(payload)), payload), True
+    return (payload, b"\n"), False
+
+
+def _send_frame(sock, parts):
+    """Send the parts of a framed message without concatenating them"""
+    if not hasattr(sock, 'sendmsg'):
+        # sendmsg is not available on Windows
+        sock.sendall(b"".join(parts))
+        return
     
-    try:
-        # Connect to the server
-        sock.connect((host, port))
-        
-        # Send the request
-        request_json = json.dumps(request) + "\n"
-        sock.sendall(request_json.encode('utf-8'))
+    sent = sock.sendmsg(parts)
+    if sent < sum(len(part) for part in parts):
+        sock.sendall(b"".join(parts)[sent:])
+
+
+def _recv_exact(reader, size):
+    """Read exactly size bytes into a preallocated buffer"""
+    buffer = bytearray(size)
+    view = memoryview(buffer)
+    received = 0
+    while received < size:
+        count = reader.readinto(view[received:])
+        if not count:
+            raise ConnectionResetError("Server closed the connection")
+        received += count
+    return buffer
+
+
+def _configure_socket(sock):
+    """Tune a client socket for small request/response exchanges"""
+    if sock.family in (socket.AF_INET, socket.AF_INET6):
+        # Send small frames immediately instead of waiting for Nagle's
+        # algorithm to coalesce them, which stalls on the server's delayed ACK
+        sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        sock.setsockopt(socket.SOL_SOCKET, socket.SO_KEEPALIVE, 1)
+    # Large enough that a typical request leaves in a single send call
+    sock.setsockopt(socket.SOL_SOCKET, socket.SO_SNDBUF, 65536)
+
+
+# Where requests go by default: a (host, port) tuple for TCP, or a filesystem
+# path for a Unix domain socket
+_default_address = ("127.0.0.1", 9000)
+
+
+def _address(host=None, port=None, unix_path=None):
+    """Resolve connection arguments to a socket address"""
+    if unix_path is not None:
+        return unix_path
+    if host is None and port is None:
+        return _default_address
+    return (host or "127.0.0.1", port or 9000)
+
+
+def _describe(address):
+    return address if isinstance(address, str) else f"{address[0]}:{address[1]}"
+
+
+class _Connection:
+    """An open socket plus a buffered reader for newline-delimited responses"""
+
+    def __init__(self, sock):
+        self.sock = sock
+        self.reader = sock.makefile('rb')
+
+    def close(self):
+        self.reader.close()
+        self.sock.close()
+
+
+class _ConnectionPool:
+    """Keeps one open connection per server address so chained calls reuse it"""
+
+    def __init__(self):
+        self._connections = {}
+
+    def acquire(self, address):
+        """Return the pooled connection for address, connecting if needed"""
+        conn = self._connections.pop(address, None)
+        if conn is None:
+            # Same-host clients can skip the TCP stack with a Unix domain socket
+            family = socket.AF_UNIX if isinstance(address, str) else socket.AF_INET
+            sock = socket.socket(family, socket.SOCK_STREAM)
+            _configure_socket(sock)
+            try:
+                sock.connect(address)
+            except Exception:
+                sock.close()
+                raise
+            conn = _Connection(sock)
+        return conn
+
+    def release(self, address, conn):
+        """Return a healthy connection to the pool"""
+        stale = self._connections.pop(address, None)
+        if stale is not None:
+            stale.close()
+        self._connections[address] = conn
+
+    def close_all(self):
+        """Close every pooled connection"""
+        for conn in self._connections.values():
+            conn.close()
+        self._connections.clear()
+
+
+_pool = _ConnectionPool()
+atexit.register(_pool.close_all)
+
+
+def _exchange(conn, request):
+    """Send one request over an open connection and return the parsed response"""
+    # Send the request
+    parts, length_prefixed = _frame(_serialize(request))
+    _send_frame(conn.sock, parts)
+    
+    # Read exactly one response, however many packets it spans
+    if length_prefixed:
+        size = struct.unpack(">I", _recv_exact(conn.reader, 4))[0]
+        response_data = _recv_exact(conn.reader, size)
+    else:
+        response_data = conn.reader.readline()
+        if not response_data.endswith(b"\n"):
+            raise ConnectionResetError("Server closed the connection")
+    
+    # Parse the JSON response
+    return _loads(response_data)
+
+
+class _ResponseCache:
+    """Small LRU cache with per-entry expiry for idempotent requests
+    
+    Results of pure tools never go stale, so they are memoized for the life of
+    the process and only leave the cache through LRU eviction. Read-only
+    server methods expire after the TTL and are additionally persisted on disk
+    (when the optional diskcache package is installed) so that separate CLI
+    invocations can reuse them.
+    """
+
+    # Methods whose responses do not depend on server-side state changes
+    CACHEABLE_METHODS = frozenset({"initialize", "tools/list", "system/info", "system/health"})
+    # Tools that are pure functions of their arguments
+    CACHEABLE_TOOLS = frozenset({"echo", "calculate"})
+
+    def __init__(self, maxsize=4096, ttl=300, directory="~/.cache/mcp-client"):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.enabled = True
+        self.directory = os.path.expanduser(directory)
+        self._entries = OrderedDict()
+        self._disk = None
+
+    def key_for(self, request, address):
+        """Return the cache key for a request to address, or None if it is not cacheable"""
+        if not self.enabled or not isinstance(request, dict):
+            return None
+        method = request.get("method")
+        params = request.get("params")
+        if method == "tools/call":
+            if not params or params.get("name") not in self.CACHEABLE_TOOLS:
+                return None
+        elif method not in self.CACHEABLE_METHODS:
+            return None
+        return method, json.dumps(params, sort_keys=True, separators=(',', ':')), _describe(address)
+
+    def _disk_cache(self, key):
+        """Return the on-disk cache if this key should be persisted"""
+        if diskcache is None or key[0] not in self.CACHEABLE_METHODS:
+            return None
+        if self._disk is None:
+            self._disk = diskcache.Cache(self.directory)
+            atexit.register(self._disk.close)
+        return self._disk
+
+    @staticmethod
+    def _disk_key(key):
+        return hashlib.blake2b("\0".join(key).encode('utf-8')).hexdigest()
+
+    def get(self, key):
+        """Return a fresh cached response or None"""
+        entry = self._entries.get(key)
+        if entry is not None:
+            expires_at, response = entry
+            if expires_at >= time.monotonic():
+                self._entries.move_to_end(key)
+                return response
+            del self._entries[key]
         
-        # Receive the response
-        response_data = sock.recv(65536).decode('utf-8')
+        disk = self._disk_cache(key)
+        if disk is not None:
+            response = disk.get(self._disk_key(key))
+            if response is not None:
+                self._remember(key, response)
+                return response
+        return None
+
+    def put(self, key, response):
+        """Store a response, evicting the least recently used entry if full"""
+        self._remember(key, response)
+        disk = self._disk_cache(key)
+        if disk is not None:
+            disk.set(self._disk_key(key), response, expire=self.ttl)
+
+    def _remember(self, key, response):
+        if key[0] == "tools/call":
+            expires_at = float("inf")
+        else:
+            expires_at = time.monotonic() + self.ttl
+        self._entries[key] = (expires_at, response)
+        self._entries.move_to_end(key)
+        if len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+
+
+_response_cache = _ResponseCache()
+
+
+# Requests queued while a batched() block is active
+_pending = None
+
+
+def send_request(request, host=None, port=None, unix_path=None):
+    """Send a JSON-RPC request to the server and return the response
+    
+    The server is reached at host:port, or through the Unix domain socket at
+    unix_path; without either the address given on the command line is used.
+    The connection is kept open and reused by subsequent calls. If the pooled
+    connection turns out to be dead, it is discarded and the request is retried
+    once on a fresh connection.
+    
+    Responses to idempotent methods are served from an in-process cache.
+    Inside a batched() block the request is queued instead and None is
+    returned; the response is delivered when the block exits.
+    """
+    if _pending is not None:
+        _pending.append(request)
+        return None
+    
+    address = _address(host, port, unix_path)
+    cache_key = _response_cache.key_for(request, address)
+    if cache_key is not None:
+        cached = _response_cache.get(cache_key)
+        if cached is not None:
+            return dict(cached, id=request.get("id"))
+    
+    for attempt in range(2):
+        conn = None
+        try:
+            conn = _pool.acquire(address)
+            response = _exchange(conn, request)
+            _pool.release(address, conn)
+            if cache_key is not None and "error" not in response:
+                _response_cache.put(cache_key, response)
+            return response
         
-        # Parse the JSON response
-        response = json.loads(response_data)
-        return response
+        except (ConnectionRefusedError, FileNotFoundError):
+            print(f"Error: Could not connect to server at {_describe(address)}")
+            print("Make sure the server is running in TCP mode with: python mcp_server.py --tcp")
+            sys.exit(1)
+        except (BrokenPipeError, ConnectionResetError) as e:
+            if conn is not None:
+                conn.close()
+            if attempt == 0:
+                continue
+            print(f"Error: {e}")
+            sys.exit(1)
+        except Exception as e:
+            if conn is not None:
+                conn.close()
+            print(f"Error: {e}")
+            sys.exit(1)
+
+
+def send_batch(requests, host=None, port=None, unix_path=None):
+    """Send several JSON-RPC requests as one batch array and return the responses"""
+    if not requests:
+        return []
+    response = send_request(list(requests), host, port, unix_path)
+    # A single error object is returned when the server rejects the whole batch
+    return response if isinstance(response, list) else [response]
+
+
+@contextlib.contextmanager
+def batched(host=None, port=None, unix_path=None):
+    """Queue requests made inside the block and send them in a single batch
+    
+    Yields a list that is filled with the batch responses when the block exits:
     
-    except ConnectionRefusedError:
-        print(f"Error: Could not connect to server at {host}:{port}")
-        print("Make sure the server is running in TCP mode with: python mcp_server.py --tcp")
-        sys.exit(1)
-    except Exception as e:
-        print(f"Error: {e}")
-        sys.exit(1)
+        with batched() as responses:
+            initialize()
+            list_tools()
+    """
+    global _pending
+    if _pending is not None:
+        raise RuntimeError("batched() blocks cannot be nested")
+    
+    responses = []
+    _pending = []
+    try:
+        yield responses
+        requests = _pending
     finally:
-        sock.close()
+        _pending = None
+    responses.extend(send_batch(requests, host, port, unix_path))
+
+
+# Request ids are unique per process so batched responses can be told apart
+_next_id = itertools.count(1).__next__
+
+
+def _request(method, params=None):
+    """Build a JSON-RPC request for method with a fresh id"""
+    request = {"jsonrpc": "2.0", "method": method, "id": _next_id()}
+    if params is not None:
+        request["params"] = params
+    return request
+
+
+def _tool_call(name, arguments):
+    """Build a tools/call request for the named tool"""
+    return _request("tools/call", {"name": name, "arguments": arguments})
+
+
+class _PreserializedRequest(dict):
+    """A request that carries its already serialized JSON payload"""
+    __slots__ = ("payload",)
+
+
+def _serialize(request):
+    """Return the JSON payload of a request, reusing a precomputed one if present"""
+    payload = getattr(request, "payload", None)
+    return payload if payload is not None else _dumps(request)
+
+
+def _payload_prefix(method):
+    """Serialize an argument-less request up to (not including) its id"""
+    template = _dumps({"jsonrpc": "2.0", "method": method, "id": 0})
+    return template[:-len(b"0}")]
+
+
+# Methods without parameters serialize identically apart from the id, so
+# their payloads are assembled from bytes computed once at import time
+_FIXED_PREFIXES = {
+    method: _payload_prefix(method)
+    for method in ("initialize", "tools/list", "system/info", "system/health")
+}
+
+
+def _fixed_request(method):
+    """Build an argument-less request from its precomputed payload prefix"""
+    request_id = _next_id()
+    request = _PreserializedRequest(jsonrpc="2.0", method=method, id=request_id)
+    request.payload = b"%s%d}" % (_FIXED_PREFIXES[method], request_id)
+    return request
 
 
 def initialize():
     """Initialize connection with the server"""
-    request = {
-        "jsonrpc": "2.0",
-        "method": "initialize",
-        "id": 1
-    }
-    return send_request(request)
+    return send_request(_fixed_request("initialize"))
 
 
 def list_tools():
     """List available tools"""
-    request = {
-        "jsonrpc": "2.0",
-        "method": "tools/list",
-        "id": 2
-    }
-    return send_request(request)
+    return send_request(_fixed_request("tools/list"))
 
 
 def echo(text):
     """Call the echo tool"""
-    request = {
-        "jsonrpc": "2.0",
-        "method": "tools/call",
-        "params": {
-            "name": "echo",
-            "arguments": {
-                "text": text
-            }
-        },
-        "id": 3
-    }
-    return send_request(request)
+    return send_request(_tool_call("echo", {"text": text}))
 
 
 def calculate(expression):
     """Call the calculate tool"""
-    request = {
-        "jsonrpc": "2.0",
-        "method": "tools/call",
-        "params": {
-            "name": "calculate",
-            "arguments": {
-                "expression": expression
-            }
-        },
-        "id": 4
+    return send_request(_tool_call("calculate", {"expression": expression}))
+
+
+def _ai_message_request(prompt, service_name=None, model=None, max_tokens=None, temperature=None, system=None):
+    """Build the tools/call request for the ai/message tool"""
+    options = {
+        "service_name": service_name,
+        "model": model,
+        "max_tokens": max_tokens,
+        "temperature": temperature,
+        "system": system,
     }
-    return send_request(request)
+    args = {"prompt": prompt}
+    args.update({k: v for k, v in options.items() if v is not None})
+    return _tool_call("ai/message", args)
 
 
 def ask_ai(prompt, service_name=None, model=None, max_tokens=None, temperature=None, system=None):
@@ -105,28 +459,51 @@ def ask_ai(prompt, service_name=None, model=None, max_tokens=None, temperature=N
         temperature: Temperature - optional, uses service default if not specified
         system: System prompt - optional
     """
-    args = {"prompt": prompt}
-    if service_name:
-        args["service_name"] = service_name
-    if model:
-        args["model"] = model
-    if max_tokens:
-        args["max_tokens"] = max_tokens
-    if temperature:
-        args["temperature"] = temperature
-    if system:
-        args["system"] = system
+    return send_request(_ai_message_request(prompt, service_name, model, max_tokens, temperature, system))
+
+
+async def send_request_async(request, host=None, port=None, unix_path=None):
+    """Send a JSON-RPC request on its own connection without blocking the event loop
     
-    request = {
-        "jsonrpc": "2.0",
-        "method": "tools/call",
-        "params": {
-            "name": "ai/message",
-            "arguments": args
-        },
-        "id": 5
-    }
-    return send_request(request)
+    The server answers requests on one connection in order, so concurrent
+    requests each get a dedicated connection.
+    """
+    address = _address(host, port, unix_path)
+    if isinstance(address, str):
+        reader, writer = await asyncio.open_unix_connection(address, limit=2 ** 24)
+    else:
+        reader, writer = await asyncio.open_connection(*address, limit=2 ** 24)
+    try:
+        parts, length_prefixed = _frame(_serialize(request))
+        writer.writelines(parts)
+        await writer.drain()
+        if length_prefixed:
+            size = struct.unpack(">I", await reader.readexactly(4))[0]
+            response_data = await reader.readexactly(size)
+        else:
+            response_data = await reader.readline()
+    finally:
+        writer.close()
+        await writer.wait_closed()
+    
+    if not response_data:
+        raise ConnectionResetError("Server closed the connection")
+    return _loads(response_data)
+
+
+async def ask_ai_many(prompts, service_name=None, model=None, max_tokens=None, temperature=None,
+                      system=None, host=None, port=None, unix_path=None):
+    """Send several prompts to an AI service concurrently
+    
+    Returns the responses in the same order as the prompts.
+    """
+    return await asyncio.gather(*(
+        send_request_async(
+            _ai_message_request(prompt, service_name, model, max_tokens, temperature, system),
+            host, port, unix_path
+        )
+        for prompt in prompts
+    ))
 
 
 def ask_claude(prompt, model=None, max_tokens=None, temperature=None, system=None):
@@ -141,83 +518,172 @@ def ask_openai(prompt, model=None, max_tokens=None, temperature=None, system=Non
 
 def system_info():
     """Get system information"""
-    request = {
-        "jsonrpc": "2.0",
-        "method": "system/info",
-        "id": 7
-    }
-    return send_request(request)
+    return send_request(_fixed_request("system/info"))
 
 
 def system_health():
     """Check system health"""
-    request = {
-        "jsonrpc": "2.0",
-        "method": "system/health",
-        "id": 8
-    }
-    return send_request(request)
+    return send_request(_fixed_request("system/health"))
 
 
 def print_json(data):
-    """Pretty print JSON data"""
-    print(json.dumps(data, indent=2))
+    """Pretty print JSON data
+    
+    The output is written straight to stdout rather than first being built
+    into one string and then copied again by print().
+    """
+    if orjson is not None:
+        # orjson produces UTF-8 bytes, so skip the text-mode encoder
+        sys.stdout.flush()
+        sys.stdout.buffer.write(orjson.dumps(data, option=orjson.OPT_INDENT_2 | orjson.OPT_APPEND_NEWLINE))
+        sys.stdout.buffer.flush()
+    else:
+        json.dump(data, sys.stdout, indent=2)
+        sys.stdout.write("\n")
 
 
-def main():
-    """Main entry point"""
-    parser = argparse.ArgumentParser(description='MCP Server Example Client')
+# Commands without arguments that can be combined with --batch
+BATCHABLE_COMMANDS = {
+    'initialize': initialize,
+    'list-tools': list_tools,
+    'system-info': system_info,
+    'system-health': system_health,
+}
+
+
+# Commands taking only fixed positional arguments: name -> (argument count, function)
+FAST_COMMANDS = {
+    'initialize': (0, initialize),
+    'list-tools': (0, list_tools),
+    'echo': (1, echo),
+    'calculate': (1, calculate),
+    'system-info': (0, system_info),
+    'system-health': (0, system_health),
+}
+
+
+def _add_ask_arguments(parser):
+    parser.add_argument('prompt', nargs='?', help='Prompt to send to the AI')
+    parser.add_argument('--prompt-file', help='File with one prompt per line; prompts are sent concurrently')
+    parser.add_argument('--service', dest='service_name', help='AI service to use (claude, openai, mock) - uses default if not specified')
+    parser.add_argument('--model', help='Model to use - uses service default if not specified')
+    parser.add_argument('--max-tokens', type=int, help='Maximum tokens - uses service default if not specified')
+    parser.add_argument('--temperature', type=float, help='Temperature - uses service default if not specified')
+    parser.add_argument('--system', help='System prompt (optional)')
+
+
+def _service_arguments_adder(service):
+    """Return an argument builder for the service-specific ask commands"""
+    def add_arguments(parser):
+        parser.add_argument('prompt', help=f'Prompt to send to {service}')
+        parser.add_argument('--model', help=f'{service} model to use')
+        parser.add_argument('--max-tokens', type=int, help='Maximum tokens')
+        parser.add_argument('--temperature', type=float, help='Temperature')
+        parser.add_argument('--system', help='System prompt')
+    return add_arguments
+
+
+# Subcommands: name -> (help text, function adding its arguments)
+COMMANDS = {
+    'initialize': ('Initialize connection', None),
+    'list-tools': ('List available tools', None),
+    'echo': ('Echo text', lambda p: p.add_argument('text', help='Text to echo')),
+    'calculate': ('Calculate expression', lambda p: p.add_argument('expression', help='Expression to calculate')),
+    'ask': ('Ask any AI service', _add_ask_arguments),
+    # Service-specific commands kept for backward compatibility
+    'ask-claude': ('Ask Claude specifically', _service_arguments_adder('Claude')),
+    'ask-openai': ('Ask OpenAI specifically', _service_arguments_adder('OpenAI')),
+    'system-info': ('Get system information', None),
+    'system-health': ('Check system health', None),
+}
+
+
+@functools.lru_cache(maxsize=None)
+def _build_global_parser():
+    """Build the parser for options shared by every command"""
+    import argparse
+    
+    parser = argparse.ArgumentParser(add_help=False)
     parser.add_argument('--host', default='127.0.0.1', help='Server host address')
     parser.add_argument('--port', type=int, default=9000, help='Server port')
+    parser.add_argument('--unix', metavar='PATH',
+                        help='Connect through a Unix domain socket instead of TCP')
+    parser.add_argument('--batch', nargs='+', choices=sorted(BATCHABLE_COMMANDS),
+                        metavar='COMMAND',
+                        help='Send several argument-less commands in a single batch request')
+    parser.add_argument('--length-prefixed', action='store_true',
+                        help='Frame messages with a 4-byte length prefix instead of a newline')
+    parser.add_argument('--no-cache', action='store_true',
+                        help='Always send requests instead of reusing cached responses')
+    parser.add_argument('--cache-ttl', type=int, default=300,
+                        help='Seconds to reuse cached responses of read-only methods (default: 300)')
+    return parser
+
+
+@functools.lru_cache(maxsize=None)
+def _build_parser(command=None):
+    """Build the full CLI parser
     
-    subparsers = parser.add_subparsers(dest='command', help='Command to execute')
-    
-    # Initialize command
-    subparsers.add_parser('initialize', help='Initialize connection')
-    
-    # List tools command
-    subparsers.add_parser('list-tools', help='List available tools')
-    
-    # Echo command
-    echo_parser = subparsers.add_parser('echo', help='Echo text')
-    echo_parser.add_argument('text', help='Text to echo')
+    When the command is known up front only its subparser is registered;
+    otherwise (e.g. for --help) every subcommand is added. Parsers are cached,
+    so repeated calls to main() from a host process build each one only once.
+    """
+    import argparse
     
-    # Calculate command
-    calc_parser = subparsers.add_parser('calculate', help='Calculate expression')
-    calc_parser.add_argument('expression', help='Expression to calculate')
+    parser = argparse.ArgumentParser(description='MCP Server Example Client', parents=[_build_global_parser()])
+    subparsers = parser.add_subparsers(dest='command', help='Command to execute')
     
-    # General AI command (can specify service)
-    ai_parser = subparsers.add_parser('ask', help='Ask any AI service')
-    ai_parser.add_argument('prompt', help='Prompt to send to the AI')
-    ai_parser.add_argument('--service', dest='service_name', help='AI service to use (claude, openai, mock) - uses default if not specified')
-    ai_parser.add_argument('--model', help='Model to use - uses service default if not specified')
-    ai_parser.add_argument('--max-tokens', type=int, help='Maximum tokens - uses service default if not specified')
-    ai_parser.add_argument('--temperature', type=float, help='Temperature - uses service default if not specified')
-    ai_parser.add_argument('--system', help='System prompt (optional)')
+    for name in ([command] if command in COMMANDS else COMMANDS):
+        help_text, add_arguments = COMMANDS[name]
+        command_parser = subparsers.add_parser(name, help=help_text)
+        if add_arguments is not None:
+            add_arguments(command_parser)
     
-    # Claude command (for backward compatibility)
-    claude_parser = subparsers.add_parser('ask-claude', help='Ask Claude specifically')
-    claude_parser.add_argument('prompt', help='Prompt to send to Claude')
-    claude_parser.add_argument('--model', help='Claude model to use')
-    claude_parser.add_argument('--max-tokens', type=int, help='Maximum tokens')
-    claude_parser.add_argument('--temperature', type=float, help='Temperature')
-    claude_parser.add_argument('--system', help='System prompt')
+    return parser
+
+
+def _configure(host="127.0.0.1", port=9000, unix_path=None,
+               length_prefixed=False, no_cache=False, cache_ttl=300):
+    """Apply the global CLI options"""
+    global _default_address, _length_prefixed
+    _default_address = unix_path if unix_path is not None else (host, port)
+    _length_prefixed = length_prefixed
+    _response_cache.ttl = cache_ttl
+    _response_cache.enabled = not no_cache and cache_ttl > 0
+
+
+def main(argv=None):
+    """Main entry point"""
+    if argv is None:
+        argv = sys.argv[1:]
     
-    # OpenAI command (for backward compatibility)
-    openai_parser = subparsers.add_parser('ask-openai', help='Ask OpenAI specifically')
-    openai_parser.add_argument('prompt', help='Prompt to send to OpenAI')
-    openai_parser.add_argument('--model', help='OpenAI model to use')
-    openai_parser.add_argument('--max-tokens', type=int, help='Maximum tokens')
-    openai_parser.add_argument('--temperature', type=float, help='Temperature')
-    openai_parser.add_argument('--system', help='System prompt')
+    # Commands with only fixed positional arguments and no options skip
+    # argparse (and its import) entirely
+    fast_command = FAST_COMMANDS.get(argv[0]) if argv else None
+    if fast_command is not None:
+        arg_count, function = fast_command
+        arguments = argv[1:]
+        if len(arguments) == arg_count and not any(a.startswith('-') for a in arguments):
+            _configure()
+            print_json(function(*arguments))
+            return
     
-    # System info command
-    subparsers.add_parser('system-info', help='Get system information')
+    # Find the subcommand first so only its parser has to be built
+    _, remaining = _build_global_parser().parse_known_args(argv)
+    command = remaining[0] if remaining else None
+    parser = _build_parser(command)
     
-    # System health command
-    subparsers.add_parser('system-health', help='Check system health')
+    args = parser.parse_args(argv)
+    _configure(args.host, args.port, args.unix,
+               args.length_prefixed, args.no_cache, args.cache_ttl)
     
-    args = parser.parse_args()
+    # Send several argument-less commands in one round trip
+    if args.batch:
+        with batched() as responses:
+            for command in args.batch:
+                BATCHABLE_COMMANDS[command]()
+        print_json(responses)
+        return
     
     # Execute the appropriate command
     if args.command == 'initialize':
@@ -228,7 +694,24 @@ def main():
         print_json(echo(args.text))
     elif args.command == 'calculate':
         print_json(calculate(args.expression))
+    elif args.command == 'ask' and args.prompt_file:
+        with open(args.prompt_file, 'r', encoding='utf-8') as f:
+            prompts = [line.strip() for line in f if line.strip()]
+        try:
+            print_json(asyncio.run(ask_ai_many(
+                prompts,
+                args.service_name,
+                args.model,
+                args.max_tokens,
+                args.temperature,
+                args.system
+            )))
+        except OSError as e:
+            print(f"Error: {e}")
+            sys.exit(1)
     elif args.command == 'ask':
+        if args.prompt is None:
+            parser.error("a prompt or --prompt-file is required")
         print_json(ask_ai(
             args.prompt,
             args.service_name,
@@ -14,13 +14,14 @@ import argparse
 import logging
 import sys
 import os
-from pathlib import Path
+from functools import cached_property, lru_cache
+from typing import TYPE_CHECKING, Any, Dict, NamedTuple, Optional, Tuple
 
-from mcp_server.config.settings import MCPServerConfig
+from mcp_server.config.settings import ENV_FILE, ENV_FILE_PRESENT, MCPServerConfig
 from mcp_server.models.json_rpc import JSONRPCErrorCode
 from mcp_server.services import create_ai_services_from_config, AIServiceRegistry
 from mcp_server.core.server import MCPServer
-from mcp_server.transports.base import StdioTransport, TCPTransport
+from mcp_server.transports.base import StdioTransport, TCPTransport, UnixSocketTransport
 from mcp_server.transports.websocket import WebSocketTransport
 from mcp_server.handlers.base_handlers import (
     InitializeHandler,
@@ -33,25 +34,177 @@ from mcp_server.handlers.system_handlers import (
     SystemInfoHandler,
     SystemHealthHandler
 )
-from mcp_server.handlers.knowledge_handlers import (
-    RepositoryAnalysisHandler,
-    KnowledgeExtractionHandler
+from mcp_server.services.lazy import LazyService
+
+# Knowledge services pull in qdrant_client, motor and the scanners; they are
+# imported by the accessors that build them so startup and --help skip them
+if TYPE_CHECKING:
+    from mcp_server.services.scanners.csharp_scanner import CSharpScannerService
+    from mcp_server.services.scanners.angular_scanner import AngularScannerService
+    from mcp_server.services.vector_store.qdrant_service import QdrantVectorService
+    from mcp_server.services.mongodb_service import MongoDBService
+    from mcp_server.services.embedding_service import EmbeddingService
+
+logger = logging.getLogger("mcp_server.app")
+
+
+class ToolProperty(NamedTuple):
+    """A single inputSchema property of a tool"""
+    name: str
+    type: str
+    description: str
+    enum: Optional[Tuple[str, ...]] = None
+    items: Optional[str] = None
+
+
+class ToolSpec(NamedTuple):
+    """Declarative description of a tool registered by the server"""
+    name: str
+    description: str
+    properties: Tuple[ToolProperty, ...] = ()
+    required: Tuple[str, ...] = ()
+
+
+_FRAMEWORKS = ("csharp", "angular", "both", "auto")
+
+# Properties shared by several tools; _compile_property turns each into a
+# single schema dict that every tool using it references
+_PROMPT = ToolProperty("prompt", "string", "The message to send to the AI")
+_SERVICE_NAME = ToolProperty("service_name", "string", "AI service to use (defaults to server configuration)")
+_SYSTEM_PROMPT = ToolProperty("system", "string", "Optional system prompt to guide the model's behavior")
+_REPO_PATH = ToolProperty("repo_path", "string", "Path to the repository")
+_REPO_NAME = ToolProperty("repo_name", "string", "Name of the repository (defaults to directory name)")
+_EXCLUDE_PATTERNS = ToolProperty("exclude_patterns", "array", "Patterns to ignore (glob format)", items="string")
+_OUTPUT_DIR = ToolProperty("output_dir", "string", "Directory to store analysis output")
+_REPOSITORY_ID = ToolProperty("repo_id", "string", "Repository ID from repository/analyze")
+_CODEBASE_ID = ToolProperty("repo_id", "string", "Repository ID from codebase/analyze")
+
+DEFAULT_TOOL_SPECS = (
+    ToolSpec("echo", "Echo back the provided text", (
+        ToolProperty("text", "string", "Text to echo back"),
+    ), ("text",)),
+    ToolSpec("calculate", "Perform basic arithmetic calculations", (
+        ToolProperty("expression", "string", "Mathematical expression to evaluate (e.g., '2 + 3 * 4')"),
+    ), ("expression",)),
 )
-from mcp_server.handlers.enhanced_knowledge_handlers import (
-    EnhancedRepositoryAnalysisHandler,
-    EnhancedCodeSearchHandler,
-    DependencyAnalysisHandler
+
+# The service_name enum depends on the configured services and is filled in
+# when the AI tools are registered
+AI_TOOL_SPECS = (
+    ToolSpec("ai/message", "Send a message to any configured AI service and get a response", (
+        _PROMPT,
+        _SERVICE_NAME,
+        ToolProperty("model", "string", "Model to use (optional - each service will use its default model if not specified)"),
+        ToolProperty("max_tokens", "integer", "Maximum number of tokens in response (optional - uses service defaults)"),
+        ToolProperty("temperature", "number", "Temperature for response generation (optional - uses service defaults)"),
+        _SYSTEM_PROMPT,
+    ), ("prompt",)),
+    ToolSpec("ai/stream", "Stream a response from any configured AI service (TCP mode only)", (
+        _PROMPT,
+        _SERVICE_NAME,
+        ToolProperty("model", "string", "Model to use (specific to the service)"),
+        ToolProperty("max_tokens", "integer", "Maximum number of tokens in response"),
+        ToolProperty("temperature", "number", "Temperature for response generation"),
+        _SYSTEM_PROMPT,
+    ), ("prompt",)),
 )
-from mcp_server.handlers.ai_development_handlers import (
-    CodebaseAnalysisHandler,
-    CodeSearchHandler,
-    KnowledgeGraphQueryHandler
+
+SYSTEM_TOOL_SPECS = (
+    ToolSpec("system/info", "Get detailed system information including CPU, memory, and disk usage"),
+    ToolSpec("system/health", "Check the health status of the server and its dependencies"),
 )
-from mcp_server.services.scanners.csharp_scanner import CSharpScannerService
-from mcp_server.services.scanners.angular_scanner import AngularScannerService
-from mcp_server.services.vector_store.qdrant_service import QdrantVectorService
-from mcp_server.services.mongodb_service import MongoDBService
-from mcp_server.services.embedding_service import EmbeddingService
+
+KNOWLEDGE_TOOL_SPECS = (
+    ToolSpec("repository/analyze", "Analyze a repository to extract structure and key components", (
+        _REPO_PATH,
+        _REPO_NAME,
+        _EXCLUDE_PATTERNS,
+        ToolProperty("framework_hint", "string", "Framework hint ('csharp', 'angular', 'both', or 'auto')", enum=_FRAMEWORKS),
+    ), ("repo_path",)),
+    ToolSpec("knowledge/extract", "Extract knowledge from a repository and generate documentation", (
+        _REPOSITORY_ID,
+        ToolProperty("output_dir", "string", "Directory to store generated documentation"),
+        ToolProperty("framework_focus", "string", "Framework to focus on ('csharp', 'angular', 'both', or 'auto')", enum=_FRAMEWORKS),
+    ), ("repo_id", "output_dir")),
+    # Enhanced knowledge tools
+    ToolSpec("repository/enhanced_analyze", "Perform deep code analysis with call graphs, patterns, and environment analysis", (
+        _REPO_PATH,
+        _REPO_NAME,
+        _EXCLUDE_PATTERNS,
+        ToolProperty("extract_patterns", "boolean", "Whether to extract code patterns"),
+        ToolProperty("extract_call_graphs", "boolean", "Whether to extract function call graphs"),
+        ToolProperty("extract_environment", "boolean", "Whether to analyze environment and dependencies"),
+        _OUTPUT_DIR,
+    ), ("repo_path",)),
+    ToolSpec("knowledge/search", "Search for code using semantic embeddings", (
+        _REPOSITORY_ID,
+        ToolProperty("query", "string", "Natural language search query"),
+        ToolProperty("language", "string", "Optional language filter"),
+        ToolProperty("max_results", "integer", "Maximum number of results to return"),
+        ToolProperty("include_code", "boolean", "Whether to include code snippets in results"),
+    ), ("repo_id", "query")),
+    ToolSpec("knowledge/dependencies", "Analyze dependencies between components", (
+        _REPOSITORY_ID,
+        ToolProperty("component_id", "string", "Component ID to analyze dependencies for"),
+        ToolProperty("component_type", "string", "Component type to analyze dependencies for"),
+        ToolProperty("include_transitive", "boolean", "Whether to include transitive dependencies"),
+    ), ("repo_id",)),
+    # AI Development Tools
+    ToolSpec("codebase/analyze", "Analyze a codebase and generate AI-friendly documentation and knowledge", (
+        _REPO_PATH,
+        _REPO_NAME,
+        _EXCLUDE_PATTERNS,
+        ToolProperty("file_limit", "integer", "Maximum number of files to analyze"),
+        _OUTPUT_DIR,
+    ), ("repo_path",)),
+    ToolSpec("code/search", "Search code and documentation using natural language queries", (
+        _CODEBASE_ID,
+        ToolProperty("query", "string", "Natural language query"),
+        ToolProperty("search_type", "string", "Type of search", enum=("all", "code", "documentation")),
+        ToolProperty("language", "string", "Language to filter results by"),
+        ToolProperty("limit", "integer", "Maximum number of results to return"),
+    ), ("repo_id", "query")),
+    ToolSpec("knowledge/query", "Query the knowledge graph for information about a codebase", (
+        _CODEBASE_ID,
+        ToolProperty("query_type", "string", "Type of query", enum=("general", "component", "pattern")),
+        ToolProperty("component_name", "string", "Name of the component to query"),
+        ToolProperty("pattern_name", "string", "Name of the pattern to query"),
+        ToolProperty("include", "array", "Views to answer together in one request ('general', 'component', 'pattern')", items="string"),
+    ), ("repo_id",)),
+)
+
+TOOL_SPECS = DEFAULT_TOOL_SPECS + AI_TOOL_SPECS + SYSTEM_TOOL_SPECS + KNOWLEDGE_TOOL_SPECS
+
+
+@lru_cache(maxsize=None)
+def _compile_property(type_: str, description: str,
+                      enum: Optional[Tuple[str, ...]], items: Optional[str]) -> Dict[str, Any]:
+    """Build a property schema, sharing one dict between identical properties"""
+    schema: Dict[str, Any] = {"type": type_}
+    if items is not None:
+        schema["items"] = {"type": items}
+    schema["description"] = description
+    if enum is not None:
+        schema["enum"] = list(enum)
+    return schema
+
+
+def _compile_tool(spec: ToolSpec) -> Dict[str, Any]:
+    """Build the tool definition served by tools/list from a ToolSpec"""
+    input_schema: Dict[str, Any] = {
+        "type": "object",
+        "properties": {
+            prop.name: _compile_property(prop.type, prop.description, prop.enum, prop.items)
+            for prop in spec.properties
+        }
+    }
+    if spec.required:
+        input_schema["required"] = list(spec.required)
+    return {
+        "name": spec.name,
+        "description": spec.description,
+        "inputSchema": input_schema
+    }
 
 
 class AIMCPServerApp(MCPServer):
@@ -64,13 +217,10 @@ class AIMCPServerApp(MCPServer):
         super().__init__(config, None)  # Don't pass ai_service to parent, we use ai_services instead
     
     def initialize(self):
-        """Initialize server components"""
-        # Setup logging
-        logging.basicConfig(
-            level=logging.INFO,
-            format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
-        )
+        """Initialize server components
         
+        Logging is configured by the caller (see main()), not here.
+        """
         # Setup tools
         self._setup_default_tools()
         self._setup_ai_tools()  # Unified AI tools
@@ -78,230 +228,158 @@ class AIMCPServerApp(MCPServer):
         self._setup_knowledge_tools()  # Add knowledge extraction tools
         self._setup_default_resources()
         
-        # Register method handlers
-        self.register_method_handler("initialize", 
-            InitializeHandler(self.name, self.version))
-        
-        self.register_method_handler("tools/list", 
-            ToolsListHandler(self.tools))
-        
-        self.register_method_handler("tools/call", 
-            ToolsCallHandler(self.tools, self.ai_services))
-        
-        self.register_method_handler("resources/list", 
-            ResourcesListHandler(self.resources))
-        
-        self.register_method_handler("resources/read", 
-            ResourcesReadHandler(self.name, self.version, self.tools, self.resources))
+        # Knowledge services connect to external systems, so they are only
+        # built when a handler first uses them
+        csharp_scanner = LazyService(lambda: self.csharp_scanner)
+        angular_scanner = LazyService(lambda: self.angular_scanner)
+        embedding_service = LazyService(lambda: self.embedding_service)
+        vector_service = LazyService(lambda: self.vector_service)
+        mongodb_service = LazyService(lambda: self.mongodb_service)
+        
+        # Knowledge handler modules load the extraction services, so they are
+        # imported here rather than at module level to keep --help fast
+        from mcp_server.handlers.knowledge_handlers import (
+            RepositoryAnalysisHandler,
+            KnowledgeExtractionHandler
+        )
+        from mcp_server.handlers.enhanced_knowledge_handlers import (
+            EnhancedRepositoryAnalysisHandler,
+            EnhancedCodeSearchHandler,
+            DependencyAnalysisHandler
+        )
+        from mcp_server.handlers.ai_development_handlers import (
+            CodebaseAnalysisHandler,
+            CodeSearchHandler,
+            KnowledgeGraphQueryHandler
+        )
         
-        # Create required services for knowledge extraction
-        csharp_scanner = CSharpScannerService()
-        angular_scanner = AngularScannerService()
+        # Get AI service, handling the case where no AI services are configured
+        ai_service = None
+        if self.ai_services:
+            ai_service = self.ai_services.get_service()
         
-        # Get API keys from config
+        self.register_method_handlers({
+            # Core MCP methods
+            "initialize": InitializeHandler(self.name, self.version),
+            "tools/list": ToolsListHandler(self.list_tools),
+            "tools/call": ToolsCallHandler(self.tools, self.ai_services),
+            "resources/list": ResourcesListHandler(self.list_resources),
+            "resources/read": ResourcesReadHandler(self.name, self.version, self.tools, self.resources),
+            
+            # System handlers
+            "system/info": SystemInfoHandler(),
+            "system/health": SystemHealthHandler(
+                service_dependencies=["claude_api"] if self.ai_service else []
+            ),
+            
+            # Knowledge handlers
+            "repository/analyze": RepositoryAnalysisHandler(
+                csharp_scanner=csharp_scanner,
+                angular_scanner=angular_scanner,
+                mongodb_service=mongodb_service
+            ),
+            "knowledge/extract": KnowledgeExtractionHandler(
+                mongodb_service=mongodb_service,
+                embedding_service=embedding_service,
+                vector_service=vector_service,
+                ai_service=ai_service
+            ),
+            
+            # Enhanced knowledge handlers
+            "repository/enhanced_analyze": EnhancedRepositoryAnalysisHandler(
+                mongodb_service=mongodb_service,
+                embedding_service=embedding_service,
+                vector_service=vector_service,
+                ai_service=ai_service
+            ),
+            "knowledge/search": EnhancedCodeSearchHandler(
+                mongodb_service=mongodb_service,
+                embedding_service=embedding_service,
+                vector_service=vector_service
+            ),
+            "knowledge/dependencies": DependencyAnalysisHandler(
+                mongodb_service=mongodb_service
+            ),
+            
+            # AI development handlers
+            "codebase/analyze": CodebaseAnalysisHandler(
+                mongodb_service=mongodb_service,
+                embedding_service=embedding_service,
+                vector_service=vector_service,
+                ai_service=ai_service
+            ),
+            "code/search": CodeSearchHandler(
+                mongodb_service=mongodb_service,
+                embedding_service=embedding_service,
+                vector_service=vector_service
+            ),
+            "knowledge/query": KnowledgeGraphQueryHandler(
+                mongodb_service=mongodb_service,
+                ai_service=ai_service
+            ),
+        })
+    
+    @cached_property
+    def csharp_scanner(self) -> "CSharpScannerService":
+        """C# scanner service"""
+        from mcp_server.services.scanners.csharp_scanner import CSharpScannerService
+        return CSharpScannerService()
+    
+    @cached_property
+    def angular_scanner(self) -> "AngularScannerService":
+        """Angular scanner service"""
+        from mcp_server.services.scanners.angular_scanner import AngularScannerService
+        return AngularScannerService()
+    
+    @cached_property
+    def embedding_service(self) -> "EmbeddingService":
+        """Embedding service - prefers OpenAI for embeddings if available"""
+        from mcp_server.services.embedding_service import EmbeddingService
         openai_api_key = self.config.openai_api_key
-        anthropic_api_key = self.config.anthropic_api_key
-        
-        # Create embedding service - prefer OpenAI for embeddings if available
-        embedding_service = EmbeddingService(
+        return EmbeddingService(
             openai_api_key=openai_api_key,
-            anthropic_api_key=anthropic_api_key,
+            anthropic_api_key=self.config.anthropic_api_key,
             model="text-embedding-3-small" if openai_api_key else "claude-3-haiku-20240307"
         )
-        
-        # Create vector store service
-        qdrant_url = self.config.qdrant_url
-        qdrant_api_key = self.config.qdrant_api_key
-        vector_service = QdrantVectorService(url=qdrant_url, api_key=qdrant_api_key)
-        
-        # Create MongoDB service
-        mongodb_service = MongoDBService(
+    
+    @cached_property
+    def vector_service(self) -> "QdrantVectorService":
+        """Vector store service"""
+        from mcp_server.services.vector_store.qdrant_service import QdrantVectorService
+        return QdrantVectorService(url=self.config.qdrant_url, api_key=self.config.qdrant_api_key)
+    
+    @cached_property
+    def mongodb_service(self) -> "MongoDBService":
+        """MongoDB service"""
+        from mcp_server.services.mongodb_service import MongoDBService
+        return MongoDBService(
             uri="mongodb://localhost:27017",
             db_name="mcp-server"
         )
-        
-        # Register system handlers
-        self.register_method_handler("system/info", SystemInfoHandler())
-        self.register_method_handler("system/health", SystemHealthHandler(
-            service_dependencies=["claude_api"] if self.ai_service else []
-        ))
-        
-        # Register knowledge handlers
-        self.register_method_handler("repository/analyze", RepositoryAnalysisHandler(
-            csharp_scanner=csharp_scanner,
-            angular_scanner=angular_scanner,
-            mongodb_service=mongodb_service
-        ))
-        
-        # Get AI service, handling the case where ai_services might not be available
-        ai_service = None
-        if hasattr(self, 'ai_services') and self.ai_services:
-            ai_service = self.ai_services.get_service()
-        
-        self.register_method_handler("knowledge/extract", KnowledgeExtractionHandler(
-            mongodb_service=mongodb_service,
-            embedding_service=embedding_service,
-            vector_service=vector_service,
-            ai_service=ai_service
-        ))
-        
-        # Register enhanced knowledge handlers
-        self.register_method_handler("repository/enhanced_analyze", EnhancedRepositoryAnalysisHandler(
-            mongodb_service=mongodb_service,
-            embedding_service=embedding_service,
-            vector_service=vector_service,
-            ai_service=ai_service
-        ))
-        
-        self.register_method_handler("knowledge/search", EnhancedCodeSearchHandler(
-            mongodb_service=mongodb_service,
-            embedding_service=embedding_service,
-            vector_service=vector_service
-        ))
-        
-        self.register_method_handler("knowledge/dependencies", DependencyAnalysisHandler(
-            mongodb_service=mongodb_service
-        ))
-        
-        # Register AI development handlers
-        self.register_method_handler("codebase/analyze", CodebaseAnalysisHandler(
-            mongodb_service=mongodb_service,
-            embedding_service=embedding_service,
-            vector_service=vector_service,
-            ai_service=ai_service
-        ))
-        
-        self.register_method_handler("code/search", CodeSearchHandler(
-            mongodb_service=mongodb_service,
-            embedding_service=embedding_service,
-            vector_service=vector_service
-        ))
-        
-        self.register_method_handler("knowledge/query", KnowledgeGraphQueryHandler(
-            mongodb_service=mongodb_service,
-            ai_service=ai_service
-        ))
+    
+    def _register_tool_specs(self, specs):
+        """Register every tool described by a sequence of ToolSpecs"""
+        self.register_tools({spec.name: _compile_tool(spec) for spec in specs})
     
     def _setup_default_tools(self):
         """Setup default tools the server provides"""
-        self.register_tool("echo", {
-            "name": "echo",
-            "description": "Echo back the provided text",
-            "inputSchema": {
-                "type": "object",
-                "properties": {
-                    "text": {
-                        "type": "string",
-                        "description": "Text to echo back"
-                    }
-                },
-                "required": ["text"]
-            }
-        })
-        
-        self.register_tool("calculate", {
-            "name": "calculate",
-            "description": "Perform basic arithmetic calculations",
-            "inputSchema": {
-                "type": "object",
-                "properties": {
-                    "expression": {
-                        "type": "string",
-                        "description": "Mathematical expression to evaluate (e.g., '2 + 3 * 4')"
-                    }
-                },
-                "required": ["expression"]
-            }
-        })
+        self._register_tool_specs(DEFAULT_TOOL_SPECS)
     
     def _setup_ai_tools(self):
         """Setup AI tools with dynamic service selection"""
         # Get available services
-        if hasattr(self, 'ai_services') and self.ai_services:
+        if self.ai_services:
             available_services = list(self.ai_services.list_services().keys())
         else:
             available_services = ["mock"]
         
-        # Get default models for each service
-        default_models = {
-            "claude": self.config.claude_default_model if hasattr(self.config, 'claude_default_model') else "claude-3-opus-20240229",
-            "openai": self.config.openai_default_model if hasattr(self.config, 'openai_default_model') else "gpt-4o",
-            "mock": "mock-model"
-        }
-        
-        # Register the unified AI message tool
-        self.register_tool("ai/message", {
-            "name": "ai/message",
-            "description": "Send a message to any configured AI service and get a response",
-            "inputSchema": {
-                "type": "object",
-                "properties": {
-                    "prompt": {
-                        "type": "string",
-                        "description": "The message to send to the AI"
-                    },
-                    "service_name": {
-                        "type": "string",
-                        "description": "AI service to use (defaults to server configuration)",
-                        "enum": available_services
-                    },
-                    "model": {
-                        "type": "string",
-                        "description": "Model to use (optional - each service will use its default model if not specified)"
-                    },
-                    "max_tokens": {
-                        "type": "integer",
-                        "description": "Maximum number of tokens in response (optional - uses service defaults)"
-                    },
-                    "temperature": {
-                        "type": "number",
-                        "description": "Temperature for response generation (optional - uses service defaults)"
-                    },
-                    "system": {
-                        "type": "string",
-                        "description": "Optional system prompt to guide the model's behavior"
-                    }
-                },
-                "required": ["prompt"]
-            }
-        })
-        
-        # Register the unified AI streaming tool
-        self.register_tool("ai/stream", {
-            "name": "ai/stream",
-            "description": "Stream a response from any configured AI service (TCP mode only)",
-            "inputSchema": {
-                "type": "object",
-                "properties": {
-                    "prompt": {
-                        "type": "string",
-                        "description": "The message to send to the AI"
-                    },
-                    "service_name": {
-                        "type": "string",
-                        "description": "AI service to use (defaults to server configuration)",
-                        "enum": available_services
-                    },
-                    "model": {
-                        "type": "string",
-                        "description": "Model to use (specific to the service)"
-                    },
-                    "max_tokens": {
-                        "type": "integer",
-                        "description": "Maximum number of tokens in response"
-                    },
-                    "temperature": {
-                        "type": "number",
-                        "description": "Temperature for response generation"
-                    },
-                    "system": {
-                        "type": "string",
-                        "description": "Optional system prompt to guide the model's behavior"
-                    }
-                },
-                "required": ["prompt"]
-            }
-        })
+        # Register the unified AI message and streaming tools
+        tools = {}
+        for spec in AI_TOOL_SPECS:
+            tool = tools[spec.name] = _compile_tool(spec)
+            properties = tool["inputSchema"]["properties"]
+            properties["service_name"] = dict(properties["service_name"], enum=available_services)
+        self.register_tools(tools)
         
         # For backward compatibility, we would setup service-specific tools,
         # but they are now handled by the unified tools
@@ -310,270 +388,11 @@ class AIMCPServerApp(MCPServer):
     
     def _setup_system_tools(self):
         """Setup system-related tools"""
-        self.register_tool("system/info", {
-            "name": "system/info",
-            "description": "Get detailed system information including CPU, memory, and disk usage",
-            "inputSchema": {
-                "type": "object",
-                "properties": {}  # No parameters needed
-            }
-        })
-        
-        self.register_tool("system/health", {
-            "name": "system/health",
-            "description": "Check the health status of the server and its dependencies",
-            "inputSchema": {
-                "type": "object",
-                "properties": {}  # No parameters needed
-            }
-        })
+        self._register_tool_specs(SYSTEM_TOOL_SPECS)
     
     def _setup_knowledge_tools(self):
         """Setup knowledge extraction tools"""
-        self.register_tool("repository/analyze", {
-            "name": "repository/analyze",
-            "description": "Analyze a repository to extract structure and key components",
-            "inputSchema": {
-                "type": "object",
-                "properties": {
-                    "repo_path": {
-                        "type": "string",
-                        "description": "Path to the repository"
-                    },
-                    "repo_name": {
-                        "type": "string",
-                        "description": "Name of the repository (defaults to directory name)"
-                    },
-                    "exclude_patterns": {
-                        "type": "array",
-                        "items": {"type": "string"},
-                        "description": "Patterns to ignore (glob format)"
-                    },
-                    "framework_hint": {
-                        "type": "string",
-                        "description": "Framework hint ('csharp', 'angular', 'both', or 'auto')",
-                        "enum": ["csharp", "angular", "both", "auto"]
-                    }
-                },
-                "required": ["repo_path"]
-            }
-        })
-        
-        self.register_tool("knowledge/extract", {
-            "name": "knowledge/extract",
-            "description": "Extract knowledge from a repository and generate documentation",
-            "inputSchema": {
-                "type": "object",
-                "properties": {
-                    "repo_id": {
-                        "type": "string",
-                        "description": "Repository ID from repository/analyze"
-                    },
-                    "output_dir": {
-                        "type": "string",
-                        "description": "Directory to store generated documentation"
-                    },
-                    "framework_focus": {
-                        "type": "string",
-                        "description": "Framework to focus on ('csharp', 'angular', 'both', or 'auto')",
-                        "enum": ["csharp", "angular", "both", "auto"]
-                    }
-                },
-                "required": ["repo_id", "output_dir"]
-            }
-        })
-        
-        # Enhanced knowledge tools
-        self.register_tool("repository/enhanced_analyze", {
-            "name": "repository/enhanced_analyze",
-            "description": "Perform deep code analysis with call graphs, patterns, and environment analysis",
-            "inputSchema": {
-                "type": "object",
-                "properties": {
-                    "repo_path": {
-                        "type": "string",
-                        "description": "Path to the repository"
-                    },
-                    "repo_name": {
-                        "type": "string",
-                        "description": "Name of the repository (defaults to directory name)"
-                    },
-                    "exclude_patterns": {
-                        "type": "array",
-                        "items": {"type": "string"},
-                        "description": "Patterns to ignore (glob format)"
-                    },
-                    "extract_patterns": {
-                        "type": "boolean",
-                        "description": "Whether to extract code patterns"
-                    },
-                    "extract_call_graphs": {
-                        "type": "boolean",
-                        "description": "Whether to extract function call graphs"
-                    },
-                    "extract_environment": {
-                        "type": "boolean",
-                        "description": "Whether to analyze environment and dependencies"
-                    },
-                    "output_dir": {
-                        "type": "string",
-                        "description": "Directory to store analysis output"
-                    }
-                },
-                "required": ["repo_path"]
-            }
-        })
-        
-        self.register_tool("knowledge/search", {
-            "name": "knowledge/search",
-            "description": "Search for code using semantic embeddings",
-            "inputSchema": {
-                "type": "object",
-                "properties": {
-                    "repo_id": {
-                        "type": "string",
-                        "description": "Repository ID from repository/analyze"
-                    },
-                    "query": {
-                        "type": "string",
-                        "description": "Natural language search query"
-                    },
-                    "language": {
-                        "type": "string",
-                        "description": "Optional language filter"
-                    },
-                    "max_results": {
-                        "type": "integer",
-                        "description": "Maximum number of results to return"
-                    },
-                    "include_code": {
-                        "type": "boolean",
-                        "description": "Whether to include code snippets in results"
-                    }
-                },
-                "required": ["repo_id", "query"]
-            }
-        })
-        
-        self.register_tool("knowledge/dependencies", {
-            "name": "knowledge/dependencies",
-            "description": "Analyze dependencies between components",
-            "inputSchema": {
-                "type": "object",
-                "properties": {
-                    "repo_id": {
-                        "type": "string",
-                        "description": "Repository ID from repository/analyze"
-                    },
-                    "component_id": {
-                        "type": "string",
-                        "description": "Component ID to analyze dependencies for"
-                    },
-                    "component_type": {
-                        "type": "string",
-                        "description": "Component type to analyze dependencies for"
-                    },
-                    "include_transitive": {
-                        "type": "boolean",
-                        "description": "Whether to include transitive dependencies"
-                    }
-                },
-                "required": ["repo_id"]
-            }
-        })
-        
-        # AI Development Tools
-        self.register_tool("codebase/analyze", {
-            "name": "codebase/analyze",
-            "description": "Analyze a codebase and generate AI-friendly documentation and knowledge",
-            "inputSchema": {
-                "type": "object",
-                "properties": {
-                    "repo_path": {
-                        "type": "string",
-                        "description": "Path to the repository"
-                    },
-                    "repo_name": {
-                        "type": "string",
-                        "description": "Name of the repository (defaults to directory name)"
-                    },
-                    "exclude_patterns": {
-                        "type": "array",
-                        "items": {"type": "string"},
-                        "description": "Patterns to ignore (glob format)"
-                    },
-                    "file_limit": {
-                        "type": "integer",
-                        "description": "Maximum number of files to analyze"
-                    },
-                    "output_dir": {
-                        "type": "string",
-                        "description": "Directory to store analysis output"
-                    }
-                },
-                "required": ["repo_path"]
-            }
-        })
-        
-        self.register_tool("code/search", {
-            "name": "code/search",
-            "description": "Search code and documentation using natural language queries",
-            "inputSchema": {
-                "type": "object",
-                "properties": {
-                    "repo_id": {
-                        "type": "string",
-                        "description": "Repository ID from codebase/analyze"
-                    },
-                    "query": {
-                        "type": "string",
-                        "description": "Natural language query"
-                    },
-                    "search_type": {
-                        "type": "string",
-                        "description": "Type of search",
-                        "enum": ["all", "code", "documentation"]
-                    },
-                    "language": {
-                        "type": "string",
-                        "description": "Language to filter results by"
-                    },
-                    "limit": {
-                        "type": "integer",
-                        "description": "Maximum number of results to return"
-                    }
-                },
-                "required": ["repo_id", "query"]
-            }
-        })
-        
-        self.register_tool("knowledge/query", {
-            "name": "knowledge/query",
-            "description": "Query the knowledge graph for information about a codebase",
-            "inputSchema": {
-                "type": "object",
-                "properties": {
-                    "repo_id": {
-                        "type": "string",
-                        "description": "Repository ID from codebase/analyze"
-                    },
-                    "query_type": {
-                        "type": "string",
-                        "description": "Type of query",
-                        "enum": ["general", "component", "pattern"]
-                    },
-                    "component_name": {
-                        "type": "string",
-                        "description": "Name of the component to query"
-                    },
-                    "pattern_name": {
-                        "type": "string",
-                        "description": "Name of the pattern to query"
-                    }
-                },
-                "required": ["repo_id"]
-            }
-        })
+        self._register_tool_specs(KNOWLEDGE_TOOL_SPECS)
     
     def _setup_default_resources(self):
         """Setup default resources the server provides"""
@@ -585,8 +404,35 @@ class AIMCPServerApp(MCPServer):
         })
 
 
-async def main():
-    """Main entry point"""
+async def _run_transports(transports):
+    """Run transports concurrently until the first one stops, then cancel the rest"""
+    tasks = []
+    
+    def stop_others(finished):
+        for task in tasks:
+            if task is not finished:
+                task.cancel()
+    
+    if hasattr(asyncio, "TaskGroup"):
+        # Python 3.11+: the task group awaits the cancelled transports and
+        # propagates a transport failure instead of leaving it unretrieved
+        async with asyncio.TaskGroup() as group:
+            for transport in transports:
+                task = group.create_task(transport.start())
+                task.add_done_callback(stop_others)
+                tasks.append(task)
+    else:
+        loop = asyncio.get_running_loop()
+        for transport in transports:
+            task = loop.create_task(transport.start())
+            task.add_done_callback(stop_others)
+            tasks.append(task)
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+
+@lru_cache(maxsize=None)
+def _build_parser() -> argparse.ArgumentParser:
+    """Build the command line parser once per process"""
     parser = argparse.ArgumentParser(description='AI MCP Server with JSON-RPC')
     
     # Transport options
@@ -599,6 +445,8 @@ async def main():
     transport_group.add_argument('--host', help='Host to bind server (can also set MCP_TCP_HOST in .env)')
     transport_group.add_argument('--port', type=int, help='Port for server (can also set MCP_TCP_PORT for TCP or MCP_WS_PORT for WebSocket)')
     transport_group.add_argument('--ws-path', help='URL path for WebSocket server (default: /)')
+    transport_group.add_argument('--unix-socket', metavar='PATH',
+                              help='Also serve on a Unix domain socket at PATH (can also set MCP_UNIX_SOCKET in .env)')
     
     # AI service options
     service_group = parser.add_argument_group('AI Service Options')
@@ -614,16 +462,22 @@ async def main():
     parser.add_argument('--log-level', default='INFO', choices=['DEBUG', 'INFO', 'WARNING', 'ERROR'],
                        help='Logging level')
     parser.add_argument('--env-file', help='Path to .env file (default: .env in project root)')
-    args = parser.parse_args()
+    return parser
+
+
+async def main(argv=None):
+    """Main entry point"""
+    args = _build_parser().parse_args(argv)
     
     # Load custom .env file if specified
     if args.env_file:
         try:
             from dotenv import load_dotenv
             load_dotenv(dotenv_path=args.env_file)
-            logging.info(f"Loaded environment variables from {args.env_file}")
+            MCPServerConfig.clear_env_cache()
+            logger.info("Loaded environment variables from %s", args.env_file)
         except ImportError:
-            logging.error("--env-file specified but python-dotenv not installed. Please install with: pip install python-dotenv")
+            logger.error("--env-file specified but python-dotenv not installed. Please install with: pip install python-dotenv")
             sys.exit(1)
     
     # Configure logging
@@ -642,10 +496,10 @@ async def main():
     # Log the available services
     available_services = ai_services.list_services()
     if available_services:
-        logging.info(f"Available AI services: {', '.join(available_services.keys())}")
-        logging.info(f"Default AI service: {ai_services.default_service}")
+        logger.info("Available AI services: %s", ", ".join(available_services.keys()))
+        logger.info("Default AI service: %s", ai_services.default_service)
     else:
-        logging.warning("No AI services configured. AI functionality will be unavailable.")
+        logger.warning("No AI services configured. AI functionality will be unavailable.")
     
     # Create server with service registry
     server = AIMCPServerApp(config, ai_services)
@@ -658,24 +512,32 @@ async def main():
     
     # Check if stdio is enabled
     if 'stdio' in config.transport_types:
-        logging.info("Setting up stdio transport")
+        logger.info("Setting up stdio transport")
         transports.append(StdioTransport(server))
     
     # Check if TCP is enabled
     if 'tcp' in config.transport_types:
         port = args.port or config.tcp_port
-        logging.info(f"Setting up TCP transport on {host}:{port}")
+        logger.info("Setting up TCP transport on %s:%s", host, port)
         transports.append(TCPTransport(server, host, port))
     
     # Check if WebSocket is enabled
     if 'websocket' in config.transport_types:
         port = args.port or config.ws_port
         ws_path = args.ws_path or config.ws_path
-        logging.info(f"Setting up WebSocket transport on {host}:{port}{ws_path}")
+        logger.info("Setting up WebSocket transport on %s:%s%s", host, port, ws_path)
         transports.append(WebSocketTransport(server, host, port, path=ws_path))
     
+    # Check if the Unix domain socket is enabled
+    if 'unix' in config.transport_types:
+        if config.unix_socket_path:
+            logger.info("Setting up Unix socket transport on %s", config.unix_socket_path)
+            transports.append(UnixSocketTransport(server, config.unix_socket_path))
+        else:
+            logger.warning("Unix socket transport requested but no socket path configured (set MCP_UNIX_SOCKET)")
+    
     if not transports:
-        logging.warning("No transports configured. Defaulting to stdio.")
+        logger.warning("No transports configured. Defaulting to stdio.")
         transports.append(StdioTransport(server))
     
     # Start all transports
@@ -684,38 +546,22 @@ async def main():
         await transports[0].start()
     else:
         # Multiple transports - run them concurrently
-        logging.info(f"Starting {len(transports)} transports")
-        
-        # Create tasks for each transport
-        transport_tasks = [asyncio.create_task(transport.start()) for transport in transports]
-        
-        # Wait for any transport to complete (or all if all complete normally)
-        done, pending = await asyncio.wait(
-            transport_tasks, 
-            return_when=asyncio.FIRST_COMPLETED
-        )
-        
-        # If any transport ended, cancel the others
-        for task in pending:
-            task.cancel()
+        logger.info("Starting %d transports", len(transports))
         
-        # Wait for the cancellations to complete
-        if pending:
-            await asyncio.wait(pending, return_when=asyncio.ALL_COMPLETED)
+        await _run_transports(transports)
 
 
 if __name__ == "__main__":
     try:
         # Display info about configuration
-        env_file = Path(__file__).resolve().parent / '.env'
-        if env_file.exists():
-            print(f"Using configuration from .env file: {env_file}", file=sys.stderr)
+        if ENV_FILE_PRESENT:
+            print(f"Using configuration from .env file: {ENV_FILE}", file=sys.stderr)
         else:
             print("No .env file found. Using environment variables or defaults.", file=sys.stderr)
             
         asyncio.run(main())
     except KeyboardInterrupt:
-        logging.info("Server stopped by user")
+        logger.info("Server stopped by user")
     except Exception as e:
-        logging.error(f"Unhandled exception: {e}", exc_info=True)
+        logger.error("Unhandled exception: %s", e, exc_info=True)
         sys.exit(1)
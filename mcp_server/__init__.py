@@ -1,7 +1,10 @@
 """MCP Server package exports."""
 
+import logging
+
 from .config import MCPServerConfig
 from .core import MCPServer
+from .models import dumps, loads
 from .services import AIServiceRegistry, create_ai_services_from_config
 
 __all__ = [
@@ -9,5 +12,9 @@ __all__ = [
     "MCPServer",
     "AIServiceRegistry",
     "create_ai_services_from_config",
+    "dumps",
+    "loads",
 ]
 
+# Library logging stays silent unless the application configures handlers
+logging.getLogger(__name__).addHandler(logging.NullHandler())
@@ -6,40 +6,118 @@ Loads configuration from .env file and environment variables.
 """
 
 import os
+import sys
 import logging
+from functools import lru_cache
 from pathlib import Path
-from dataclasses import dataclass
-from typing import Optional, Dict, Any
+from dataclasses import dataclass, replace
+from typing import Optional, Dict, Any, FrozenSet, Tuple
 
 from mcp_server.services.secrets_manager import get_secrets_manager
 
-# Import dotenv for .env file support
-try:
-    from dotenv import load_dotenv
-    # Try to load from .env file
-    env_path = Path(__file__).resolve().parents[2] / '.env'
-    load_dotenv(dotenv_path=env_path)
-    logging.info(f"Loaded environment variables from {env_path}")
-except ImportError:
-    logging.warning("python-dotenv not installed. Environment variables will only be loaded from system environment.")
-    pass
+logger = logging.getLogger(__name__)
 
+# Project-level .env file, shared with the entry point; __file__ is already
+# absolute for imported modules, so no resolve() (realpath) is needed
+ENV_FILE = Path(__file__).parents[2] / '.env'
 
-@dataclass
+# Whether the .env file existed at import time, so callers need not stat it again
+ENV_FILE_PRESENT = ENV_FILE.is_file()
+
+# Import dotenv for .env file support, but only when there is a file to load;
+# deployments that inject the environment directly (or set MCP_SKIP_DOTENV=1)
+# skip both the import and the file probe done by load_dotenv
+if ENV_FILE_PRESENT and os.environ.get("MCP_SKIP_DOTENV") != "1":
+    try:
+        from dotenv import load_dotenv
+        # Try to load from .env file
+        load_dotenv(dotenv_path=ENV_FILE, override=False)
+        logger.info("Loaded environment variables from %s", ENV_FILE)
+    except ImportError:
+        logger.warning("python-dotenv not installed. Environment variables will only be loaded from system environment.")
+
+
+def _split_transports(value: str) -> FrozenSet[str]:
+    """Parse a comma-separated MCP_TRANSPORT_TYPE value"""
+    return frozenset(t.strip() for t in value.split(","))
+
+
+def _split_list(value: str) -> Tuple[str, ...]:
+    """Parse a comma-separated list value"""
+    return tuple(value.split(","))
+
+
+# Default model lists; tuples so every config can share them
+_CLAUDE_MODELS = (
+    "claude-3-opus-20240229",
+    "claude-3-sonnet-20240229",
+    "claude-3-haiku-20240307",
+)
+_OPENAI_MODELS = (
+    "gpt-4o",
+    "gpt-4-turbo",
+    "gpt-4",
+    "gpt-3.5-turbo",
+)
+_EMBEDDING_MODELS = (
+    "text-embedding-3-small",
+    "text-embedding-3-large",
+)
+
+
+# (config attribute, environment variable, converter) for the settings that
+# from_env reads straight from the environment
+_ENV_SETTINGS = (
+    ("name", "MCP_SERVER_NAME", str),
+    ("version", "MCP_SERVER_VERSION", str),
+    ("transport_types", "MCP_TRANSPORT_TYPE", _split_transports),
+    ("tcp_host", "MCP_TCP_HOST", str),
+    ("tcp_port", "MCP_TCP_PORT", int),
+    # WebSocket settings
+    ("ws_port", "MCP_WS_PORT", int),
+    ("ws_path", "MCP_WS_PATH", str),
+    ("ws_origins", "MCP_WS_ORIGINS", _split_list),
+    # Unix domain socket settings
+    ("unix_socket_path", "MCP_UNIX_SOCKET", str),
+    # AI service type
+    ("ai_service_type", "AI_SERVICE_TYPE", str),
+    # Claude settings
+    ("claude_default_model", "CLAUDE_DEFAULT_MODEL", str),
+    ("claude_default_max_tokens", "CLAUDE_DEFAULT_MAX_TOKENS", int),
+    ("claude_default_temperature", "CLAUDE_DEFAULT_TEMPERATURE", float),
+    # OpenAI settings
+    ("openai_default_model", "OPENAI_DEFAULT_MODEL", str),
+    ("openai_default_max_tokens", "OPENAI_DEFAULT_MAX_TOKENS", int),
+    ("openai_default_temperature", "OPENAI_DEFAULT_TEMPERATURE", float),
+    # Embedding settings
+    ("embedding_model", "EMBEDDING_MODEL", str),
+)
+
+
+# __slots__ for dataclasses needs Python 3.10; older versions keep __dict__
+_DATACLASS_SLOTS = {"slots": True} if sys.version_info >= (3, 10) else {}
+
+
+@dataclass(frozen=True, **_DATACLASS_SLOTS)
 class MCPServerConfig:
-    """Configuration for the MCP Server"""
+    """Configuration for the MCP Server
+    
+    Instances are immutable; use dataclasses.replace() to derive a modified
+    configuration.
+    """
     # Server info
     name: str = "ai-mcp-server"
     version: str = "1.0.0"
     description: str = "MCP Server with multiple AI model integration"
     
     # Transport settings
-    transport_types: list = None  # List of transports: ['stdio', 'tcp', 'websocket']
+    transport_types: FrozenSet[str] = frozenset(("stdio",))  # Enabled transports: {'stdio', 'tcp', 'websocket', 'unix'}
     tcp_host: str = "127.0.0.1"
     tcp_port: int = 9000
     ws_port: int = 8765
     ws_path: str = "/"
-    ws_origins: Optional[list] = None
+    ws_origins: Optional[Tuple[str, ...]] = None
+    unix_socket_path: Optional[str] = None
     
     # AI service type
     ai_service_type: str = "claude"  # 'claude', 'openai', or 'mock'
@@ -75,176 +153,109 @@ class MCPServerConfig:
     qdrant_api_key: Optional[str] = None
     
     # Available models
-    claude_models: list = None
-    openai_models: list = None
-    embedding_models: list = None
+    claude_models: Tuple[str, ...] = _CLAUDE_MODELS
+    openai_models: Tuple[str, ...] = _OPENAI_MODELS
+    embedding_models: Tuple[str, ...] = _EMBEDDING_MODELS
     
-    def __post_init__(self):
-        # Set default models if not provided
-        if self.claude_models is None:
-            self.claude_models = [
-                "claude-3-opus-20240229",
-                "claude-3-sonnet-20240229",
-                "claude-3-haiku-20240307"
-            ]
+    @classmethod
+    def from_env(cls) -> "MCPServerConfig":
+        """Create a configuration from environment variables
         
-        if self.openai_models is None:
-            self.openai_models = [
-                "gpt-4o",
-                "gpt-4-turbo",
-                "gpt-4",
-                "gpt-3.5-turbo"
-            ]
-            
-        if self.embedding_models is None:
-            self.embedding_models = [
-                "text-embedding-3-small",
-                "text-embedding-3-large"
-            ]
-            
-        # Set default transport types if not provided
-        if self.transport_types is None:
-            self.transport_types = ["stdio"]
+        The environment is parsed once per process; configurations are
+        immutable, so every call shares the same instance. Call
+        clear_env_cache() after changing the environment (e.g. loading
+        another .env file).
+        """
+        return cls._from_env_cached()
     
     @classmethod
-    def from_env(cls) -> "MCPServerConfig":
-        """Create a configuration from environment variables"""
-        config = cls()
+    def clear_env_cache(cls):
+        """Forget the parsed environment so the next from_env() re-reads it"""
+        cls._from_env_cached.cache_clear()
+    
+    @classmethod
+    @lru_cache(maxsize=1)
+    def _from_env_cached(cls) -> "MCPServerConfig":
+        """Parse the environment into a configuration"""
         secrets = get_secrets_manager()
+        settings = {}
         
-        # Load environment variables if they exist
-        if os.environ.get("MCP_SERVER_NAME"):
-            config.name = os.environ.get("MCP_SERVER_NAME")
-            
-        if os.environ.get("MCP_SERVER_VERSION"):
-            config.version = os.environ.get("MCP_SERVER_VERSION")
-            
-        if os.environ.get("MCP_TRANSPORT_TYPE"):
-            transport_types = os.environ.get("MCP_TRANSPORT_TYPE").split(",")
-            config.transport_types = [t.strip() for t in transport_types]
-            
-        if os.environ.get("MCP_TCP_HOST"):
-            config.tcp_host = os.environ.get("MCP_TCP_HOST")
-            
-        if os.environ.get("MCP_TCP_PORT"):
-            try:
-                config.tcp_port = int(os.environ.get("MCP_TCP_PORT"))
-            except ValueError:
-                pass
-        
-        # WebSocket settings
-        if os.environ.get("MCP_WS_PORT"):
-            try:
-                config.ws_port = int(os.environ.get("MCP_WS_PORT"))
-            except ValueError:
-                pass
-            
-        if os.environ.get("MCP_WS_PATH"):
-            config.ws_path = os.environ.get("MCP_WS_PATH")
-            
-        if os.environ.get("MCP_WS_ORIGINS"):
-            try:
-                origins = os.environ.get("MCP_WS_ORIGINS")
-                config.ws_origins = origins.split(",")
-            except Exception:
-                pass
+        # Load environment variables if they exist; each variable is read
+        # once and values that fail to convert keep the default
+        get = os.environ.get
+        for attr, key, convert in _ENV_SETTINGS:
+            value = get(key)
+            if value:
+                try:
+                    settings[attr] = convert(value)
+                except ValueError:
+                    pass
         
-        # AI service type
-        if os.environ.get("AI_SERVICE_TYPE"):
-            config.ai_service_type = os.environ.get("AI_SERVICE_TYPE")
-            
         # API keys (use secrets manager for optional rotation)
-        config.anthropic_api_key = secrets.get("ANTHROPIC_API_KEY")
-        config.openai_api_key = secrets.get("OPENAI_API_KEY")
-        
-        # Claude settings
-        if os.environ.get("CLAUDE_DEFAULT_MODEL"):
-            config.claude_default_model = os.environ.get("CLAUDE_DEFAULT_MODEL")
-            
-        if os.environ.get("CLAUDE_DEFAULT_MAX_TOKENS"):
-            try:
-                config.claude_default_max_tokens = int(os.environ.get("CLAUDE_DEFAULT_MAX_TOKENS"))
-            except ValueError:
-                pass
-            
-        if os.environ.get("CLAUDE_DEFAULT_TEMPERATURE"):
-            try:
-                config.claude_default_temperature = float(os.environ.get("CLAUDE_DEFAULT_TEMPERATURE"))
-            except ValueError:
-                pass
-        
-        # OpenAI settings
-        if os.environ.get("OPENAI_DEFAULT_MODEL"):
-            config.openai_default_model = os.environ.get("OPENAI_DEFAULT_MODEL")
-            
-        if os.environ.get("OPENAI_DEFAULT_MAX_TOKENS"):
-            try:
-                config.openai_default_max_tokens = int(os.environ.get("OPENAI_DEFAULT_MAX_TOKENS"))
-            except ValueError:
-                pass
-            
-        if os.environ.get("OPENAI_DEFAULT_TEMPERATURE"):
-            try:
-                config.openai_default_temperature = float(os.environ.get("OPENAI_DEFAULT_TEMPERATURE"))
-            except ValueError:
-                pass
+        settings["anthropic_api_key"] = secrets.get("ANTHROPIC_API_KEY")
+        settings["openai_api_key"] = secrets.get("OPENAI_API_KEY")
         
-        # Embedding settings
-        if os.environ.get("EMBEDDING_MODEL"):
-            config.embedding_model = os.environ.get("EMBEDDING_MODEL")
-            
         # Azure OpenAI Embedding settings
-        config.embeddings_3_large_api_url = os.environ.get("EMBEDDINGS_3_LARGE_API_URL")
-        config.embeddings_3_large_api_key = secrets.get("EMBEDDINGS_3_LARGE_API_KEY")
+        settings["embeddings_3_large_api_url"] = get("EMBEDDINGS_3_LARGE_API_URL")
+        settings["embeddings_3_large_api_key"] = secrets.get("EMBEDDINGS_3_LARGE_API_KEY")
 
-        config.embeddings_3_small_api_url = os.environ.get("EMBEDDINGS_3_SMALL_API_URL")
-        config.embeddings_3_small_api_key = secrets.get("EMBEDDINGS_3_SMALL_API_KEY")
+        settings["embeddings_3_small_api_url"] = get("EMBEDDINGS_3_SMALL_API_URL")
+        settings["embeddings_3_small_api_key"] = secrets.get("EMBEDDINGS_3_SMALL_API_KEY")
 
-        config.qdrant_url = secrets.get("QDRANT_URL")
-        config.qdrant_api_key = secrets.get("QDRANT_API_KEY")
+        settings["qdrant_url"] = secrets.get("QDRANT_URL")
+        settings["qdrant_api_key"] = secrets.get("QDRANT_API_KEY")
 
-        config.azure_openai_embedding_deployment = os.environ.get("AZURE_OPENAI_EMBEDDING_DEPLOYMENT")
+        settings["azure_openai_embedding_deployment"] = get("AZURE_OPENAI_EMBEDDING_DEPLOYMENT")
         
-        return config
+        return cls(**settings)
     
     @classmethod
     def from_args(cls, args: Dict[str, Any]) -> "MCPServerConfig":
         """Create a configuration from command line arguments"""
         config = cls.from_env()  # Start with environment variables
+        overrides = {}
+        transport_types = config.transport_types
         
         # Override with command line arguments if provided
         if args.get("name"):
-            config.name = args.get("name")
+            overrides["name"] = args.get("name")
             
-        if args.get("tcp") and "tcp" not in config.transport_types:
-            config.transport_types.append("tcp")
+        if args.get("tcp"):
+            transport_types |= {"tcp"}
             
-        if args.get("websocket") and "websocket" not in config.transport_types:
-            config.transport_types.append("websocket")
+        if args.get("websocket"):
+            transport_types |= {"websocket"}
+            
+        if args.get("unix_socket"):
+            overrides["unix_socket_path"] = args.get("unix_socket")
+            transport_types |= {"unix"}
+        
+        if transport_types != config.transport_types:
+            overrides["transport_types"] = transport_types
             
         if args.get("host"):
-            config.tcp_host = args.get("host")
+            overrides["tcp_host"] = args.get("host")
             
         if args.get("port"):
-            config.tcp_port = args.get("port")
+            overrides["tcp_port"] = args.get("port")
             
         # AI service type
         if args.get("mock"):
-            config.ai_service_type = "mock"
+            overrides["ai_service_type"] = "mock"
         elif args.get("service_type"):
-            config.ai_service_type = args.get("service_type")
+            overrides["ai_service_type"] = args.get("service_type")
             
         # API keys
         if args.get("claude_api_key"):
-            config.anthropic_api_key = args.get("claude_api_key")
+            overrides["anthropic_api_key"] = args.get("claude_api_key")
             
         if args.get("openai_api_key"):
-            config.openai_api_key = args.get("openai_api_key")
+            overrides["openai_api_key"] = args.get("openai_api_key")
 
         if args.get("qdrant_url"):
-            config.qdrant_url = args.get("qdrant_url")
+            overrides["qdrant_url"] = args.get("qdrant_url")
 
         if args.get("qdrant_api_key"):
-            config.qdrant_api_key = args.get("qdrant_api_key")
+            overrides["qdrant_api_key"] = args.get("qdrant_api_key")
 
-        return config
+        return replace(config, **overrides) if overrides else config
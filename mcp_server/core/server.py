@@ -8,13 +8,33 @@ for handlers and transports.
 import asyncio
 import json
 import logging
-from typing import Any, Dict, List, Optional, Union, Callable, Type
+import sys
+from typing import Any, Dict, List, Optional, Tuple, Union, Callable, Type
 from abc import ABC, abstractmethod
 
 from mcp_server.models.json_rpc import MCPRequest, MCPResponse, JSONRPCErrorCode
 from mcp_server.config.settings import MCPServerConfig
 from mcp_server.services.claude_service import AIServiceInterface
 
+logger = logging.getLogger("mcp_server")
+
+# Response constructors and error codes used on every request, bound once
+_error_response = MCPResponse.error_response
+_result_response = MCPResponse.result_response
+_INVALID_REQUEST = JSONRPCErrorCode.INVALID_REQUEST
+_METHOD_NOT_FOUND = JSONRPCErrorCode.METHOD_NOT_FOUND
+_INVALID_PARAMS = JSONRPCErrorCode.INVALID_PARAMS
+_INTERNAL_ERROR = JSONRPCErrorCode.INTERNAL_ERROR
+
+
+def _parse_request(data: Any) -> Tuple[Optional[MCPRequest], Any, Optional[Exception]]:
+    """Parse one message into (request, id, error), reading the message once"""
+    try:
+        request = MCPRequest.from_dict(data)
+    except Exception as e:
+        return None, data.get("id") if type(data) is dict else None, e
+    return request, request.id, None
+
 
 class HandlerInterface(ABC):
     """Interface for method handlers"""
@@ -38,13 +58,20 @@ class MCPServer:
         
         # Registry for method handlers
         self.method_handlers = {}
+        # Bound lookup used on every request; registration mutates the dict in
+        # place, so this stays valid as handlers are added
+        self._get_handler = self.method_handlers.get
         
         # Tools and resources
         self.tools = {}
         self.resources = {}
         
+        # Cached tools/list and resources/list results, rebuilt on registration
+        self._tools_result = None
+        self._resources_result = None
+        
         # Setup logger
-        self.logger = logging.getLogger("mcp_server")
+        self.logger = logger
         
         # Initialize server components
         self.initialize()
@@ -56,122 +83,183 @@ class MCPServer:
     
     def register_method_handler(self, method: str, handler: HandlerInterface):
         """Register a handler for a specific method"""
-        self.logger.debug(f"Registering handler for method: {method}")
-        self.method_handlers[method] = handler
+        self.logger.debug("Registering handler for method: %s", method)
+        self.method_handlers[sys.intern(method)] = handler
+    
+    def register_method_handlers(self, handlers: Dict[str, HandlerInterface]):
+        """Register several method handlers with a single update"""
+        self.logger.debug("Registering handlers for methods: %s", ", ".join(handlers))
+        self.method_handlers.update((sys.intern(method), handler) for method, handler in handlers.items())
     
     def register_tool(self, tool_name: str, tool_config: Dict[str, Any]):
         """Register a tool with the server"""
         self.tools[tool_name] = tool_config
+        self._tools_result = None
+    
+    def register_tools(self, tools: Dict[str, Dict[str, Any]]):
+        """Register several tools, invalidating the tools/list result once"""
+        self.tools.update(tools)
+        self._tools_result = None
     
     def register_resource(self, resource_uri: str, resource_config: Dict[str, Any]):
         """Register a resource with the server"""
         self.resources[resource_uri] = resource_config
+        self._resources_result = None
+    
+    def list_tools(self) -> Dict[str, Any]:
+        """Return the tools/list result, building it once per registration change"""
+        result = self._tools_result
+        if result is None:
+            result = self._tools_result = {"tools": list(self.tools.values())}
+        return result
+    
+    def list_resources(self) -> Dict[str, Any]:
+        """Return the resources/list result, building it once per registration change"""
+        result = self._resources_result
+        if result is None:
+            result = self._resources_result = {"resources": list(self.resources.values())}
+        return result
     
     async def process_request(self, request: MCPRequest) -> MCPResponse:
         """Process a single request and return a response"""
+        method = request.method
+        handler = None
         try:
             # Validate JSON-RPC version
             if request.jsonrpc != "2.0":
-                return MCPResponse.error_response(
-                    JSONRPCErrorCode.INVALID_REQUEST,
+                return _error_response(
+                    _INVALID_REQUEST,
                     "Invalid JSON-RPC version, expected '2.0'",
                     request.id
                 )
             
             # Find the handler for this method
-            method = request.method
-            handler = self.method_handlers.get(method)
+            handler = self._get_handler(method)
             
             if not handler:
-                return MCPResponse.error_response(
-                    JSONRPCErrorCode.METHOD_NOT_FOUND,
+                return _error_response(
+                    _METHOD_NOT_FOUND,
                     f"Method not found: {method}",
                     request.id
                 )
             
             # Execute the handler
-            try:
-                result = await handler.handle(request.params or {})
-                return MCPResponse.result_response(result, request.id)
-            except ValueError as e:
-                return MCPResponse.error_response(
-                    JSONRPCErrorCode.INVALID_PARAMS,
-                    str(e),
-                    request.id
-                )
-            except Exception as e:
-                self.logger.exception(f"Error processing method {method}")
-                return MCPResponse.error_response(
-                    JSONRPCErrorCode.INTERNAL_ERROR,
-                    f"Internal server error: {str(e)}",
-                    request.id
-                )
+            result = await handler.handle(request.params or {})
+            return _result_response(result, request.id)
         
+        except ValueError as e:
+            return _error_response(
+                _INVALID_PARAMS,
+                str(e),
+                request.id
+            )
         except Exception as e:
-            self.logger.exception("Unexpected error processing request")
-            return MCPResponse.error_response(
-                JSONRPCErrorCode.INTERNAL_ERROR,
-                f"Server error: {str(e)}",
-                request.id if hasattr(request, 'id') else None
+            if handler is None:
+                # Failed before reaching a handler
+                self.logger.exception("Unexpected error processing request")
+                return _error_response(
+                    _INTERNAL_ERROR,
+                    f"Server error: {str(e)}",
+                    request.id
+                )
+            self.logger.exception("Error processing method %s", method)
+            return _error_response(
+                _INTERNAL_ERROR,
+                f"Internal server error: {str(e)}",
+                request.id
             )
     
+    async def process_notification(self, request: MCPRequest) -> None:
+        """Process a notification (a request without id); nothing is returned
+        
+        Per JSON-RPC a notification is never answered, so no response object
+        is built and failures are only logged.
+        """
+        try:
+            if request.jsonrpc != "2.0":
+                return
+            handler = self._get_handler(request.method)
+            if handler:
+                await handler.handle(request.params or {})
+        except Exception:
+            self.logger.exception("Error processing notification %s", request.method)
+    
     async def process_jsonrpc_message(self, data: Union[Dict, List]) -> Union[Dict, List, None]:
         """Process a JSON-RPC message which can be a batch or single request"""
-        if isinstance(data, list):
+        # Messages come straight from the JSON decoder, so exact type checks
+        # suffice; single requests are by far the common case, test them first
+        kind = type(data)
+        if kind is dict:
+            # Handle single request
+            request, id_, error = _parse_request(data)
+            if error is None:
+                try:
+                    # Don't return anything for notifications (requests without id)
+                    if id_ is None:
+                        await self.process_notification(request)
+                        return None
+                    
+                    response = await self.process_request(request)
+                    return response.to_dict()
+                except Exception as e:
+                    error = e
+            
+            if id_ is not None:
+                error_response = _error_response(
+                    _INTERNAL_ERROR,
+                    f"Internal error: {str(error)}",
+                    id_
+                )
+                return error_response.to_dict()
+            return None
+        
+        elif kind is list:
             # Handle batch request
             if not data:
                 # Empty batch is invalid
-                return MCPResponse.error_response(
-                    JSONRPCErrorCode.INVALID_REQUEST,
+                return _error_response(
+                    _INVALID_REQUEST,
                     "Invalid Request: empty batch",
                     None
                 ).to_dict()
             
+            # Parse every item first, keeping parse failures in place
+            parsed = [_parse_request(req_data) for req_data in data]
+            
+            # Handlers are independent, so run the whole batch concurrently
+            outcomes = iter(await asyncio.gather(
+                *(
+                    self.process_request(request) if id_ is not None else self.process_notification(request)
+                    for request, id_, error in parsed if error is None
+                ),
+                return_exceptions=True
+            ))
+            
             responses = []
-            for req_data in data:
-                try:
-                    request = MCPRequest.from_dict(req_data)
-                    response = await self.process_request(request)
-                    
+            for request, id_, error in parsed:
+                if error is None:
+                    outcome = next(outcomes)
                     # Only include responses for non-notifications (requests with id)
-                    if request.id is not None:
-                        responses.append(response.to_dict())
-                except Exception as e:
-                    if req_data.get("id") is not None:
-                        error_response = MCPResponse.error_response(
-                            JSONRPCErrorCode.INTERNAL_ERROR,
-                            f"Internal error: {str(e)}",
-                            req_data.get("id")
-                        )
-                        responses.append(error_response.to_dict())
+                    if id_ is None:
+                        continue
+                    if not isinstance(outcome, BaseException):
+                        responses.append(outcome.to_dict())
+                        continue
+                    error = outcome
+                if id_ is not None:
+                    error_response = _error_response(
+                        _INTERNAL_ERROR,
+                        f"Internal error: {str(error)}",
+                        id_
+                    )
+                    responses.append(error_response.to_dict())
             
             return responses if responses else None
         
-        elif isinstance(data, dict):
-            # Handle single request
-            try:
-                request = MCPRequest.from_dict(data)
-                response = await self.process_request(request)
-                
-                # Don't return anything for notifications (requests without id)
-                if request.id is None:
-                    return None
-                
-                return response.to_dict()
-            except Exception as e:
-                if data.get("id") is not None:
-                    error_response = MCPResponse.error_response(
-                        JSONRPCErrorCode.INTERNAL_ERROR,
-                        f"Internal error: {str(e)}",
-                        data.get("id")
-                    )
-                    return error_response.to_dict()
-                return None
-        
         else:
             # Invalid request
-            error_response = MCPResponse.error_response(
-                JSONRPCErrorCode.INVALID_REQUEST,
+            error_response = _error_response(
+                _INVALID_REQUEST,
                 "Invalid Request: expected object or array",
                 None
             )
@@ -4,14 +4,30 @@ Handlers for MCP Server
 This package provides request handlers for various RPC methods.
 """
 
+import importlib
+
 from .base_handlers import InitializeHandler, ToolsListHandler, ToolsCallHandler, ResourcesListHandler, ResourcesReadHandler
 from .system_handlers import SystemInfoHandler, SystemHealthHandler
-from .knowledge_handlers import RepositoryAnalysisHandler, KnowledgeExtractionHandler
-from .enhanced_knowledge_handlers import (
-    EnhancedRepositoryAnalysisHandler,
-    EnhancedCodeSearchHandler,
-    DependencyAnalysisHandler
-)
+
+# Knowledge handlers depend on the extraction services (networkx and friends),
+# so they are imported on first access rather than with the package
+_LAZY_HANDLERS = {
+    'RepositoryAnalysisHandler': '.knowledge_handlers',
+    'KnowledgeExtractionHandler': '.knowledge_handlers',
+    'EnhancedRepositoryAnalysisHandler': '.enhanced_knowledge_handlers',
+    'EnhancedCodeSearchHandler': '.enhanced_knowledge_handlers',
+    'DependencyAnalysisHandler': '.enhanced_knowledge_handlers',
+}
+
+
+def __getattr__(name):
+    module_name = _LAZY_HANDLERS.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(module_name, __name__), name)
+    globals()[name] = value
+    return value
+
 
 __all__ = [
     'InitializeHandler',
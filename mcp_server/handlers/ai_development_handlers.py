@@ -6,27 +6,223 @@ It integrates knowledge extraction, documentation generation, and vector storage
 for semantic search, allowing AIs to better understand and work with codebases.
 """
 
+from __future__ import annotations
+
 import os
+import re
 import json
+import collections
+import itertools
+import hashlib
 import logging
+import operator
 import asyncio
 import datetime
 import uuid
 import time
-from typing import Dict, List, Any, Optional, Tuple
+from typing import Dict, Iterable, Iterator, List, Any, Optional, Tuple, TYPE_CHECKING
+
+from pymongo import UpdateOne
 
 from mcp_server.core.server import HandlerInterface
-from mcp_server.services.embedding_service import EmbeddingService
-from mcp_server.services.vector_store.qdrant_service import QdrantVectorService
-from mcp_server.services.mongodb_service import MongoDBService
+from mcp_server.models.json_rpc import loads
 from mcp_server.services.knowledge_extraction.code_extractor import CodeExtractor
 from mcp_server.services.knowledge_extraction.call_graph_analyzer import CallGraphAnalyzer
 from mcp_server.services.knowledge_extraction.pattern_extractor import PatternExtractor
 from mcp_server.services.knowledge_extraction.environment_analyzer import EnvironmentAnalyzer
-from mcp_server.services.knowledge_extraction.md_builder import MarkdownBuilder
+from mcp_server.services.knowledge_extraction.md_builder import MarkdownBuilder, iter_extracted_files
 from mcp_server.services.knowledge_extraction.documentation_extractor import DocumentationExtractor
 from mcp_server.services.knowledge_extraction.code_chunker import CodeChunker
 
+if TYPE_CHECKING:
+    from mcp_server.services.embedding_service import EmbeddingService
+    from mcp_server.services.vector_store.qdrant_service import QdrantVectorService
+    from mcp_server.services.mongodb_service import MongoDBService
+
+# orjson is optional; it writes the analysis output several times faster
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+def _dump_json(data: Any, indent: bool = False, default: Any = None) -> bytes:
+    """Serialize analysis output to UTF-8 JSON bytes, via orjson when available"""
+    if orjson is not None:
+        option = orjson.OPT_NON_STR_KEYS | (orjson.OPT_INDENT_2 if indent else 0)
+        try:
+            return orjson.dumps(data, default=default, option=option)
+        except TypeError:
+            # Values orjson rejects still serialize with the standard library
+            pass
+    return json.dumps(data, indent=2 if indent else None, default=default).encode("utf-8")
+
+
+def _write_json(path: str, data: Any) -> None:
+    """Write data to path as indented JSON"""
+    with open(path, "wb") as f:
+        f.write(_dump_json(data, indent=True))
+
+
+def _read_text(path: str) -> str:
+    """Read a UTF-8 text file"""
+    with open(path, "r", encoding="utf-8") as f:
+        return f.read()
+
+
+# Programming language for each known file extension
+_EXTENSION_MAP: Dict[str, str] = {
+    ".py": "python",
+    ".js": "javascript",
+    ".ts": "typescript",
+    ".jsx": "javascript",
+    ".tsx": "typescript",
+    ".html": "html",
+    ".css": "css",
+    ".scss": "scss",
+    ".cs": "csharp",
+    ".java": "java",
+    ".cpp": "cpp",
+    ".c": "c",
+    ".h": "c",
+    ".hpp": "cpp",
+    ".go": "go",
+    ".rb": "ruby",
+    ".php": "php",
+    ".swift": "swift",
+    ".kt": "kotlin",
+    ".rs": "rust",
+    ".sql": "sql",
+    ".sh": "shell",
+    ".ps1": "powershell",
+    ".bat": "batch",
+    ".yaml": "yaml",
+    ".yml": "yaml",
+    ".json": "json",
+    ".xml": "xml",
+    ".md": "markdown",
+}
+
+# Repository fields the knowledge graph queries report on
+_REPO_KNOWLEDGE_FIELDS = {
+    "_id": 0,
+    "name": 1,
+    "updated_at": 1,
+    "metadata.knowledge.patterns": 1,
+    "metadata.knowledge.environment": 1
+}
+
+# Name of a stored pattern, or None for a pattern stored without one
+_get_name = operator.methodcaller("get", "name")
+
+# Patterns by lower-cased name, and (lower-cased name, type, pattern) in order
+_PatternIndex = Tuple[Dict[str, Tuple[str, Dict[str, Any]]], List[Tuple[str, str, Dict[str, Any]]]]
+
+
+def _index_patterns(patterns_data: Dict[str, Any]) -> _PatternIndex:
+    """Index a repository's patterns by lower-cased name
+    
+    The dict keeps the first pattern of each name for exact lookups; the
+    list keeps every pattern in search order for substring lookups, the
+    same order MongoDBService.find_pattern() searches stored patterns in.
+    """
+    from mcp_server.services.mongodb_service import MongoDBService
+    
+    patterns_by_name = {}
+    patterns_in_order = []
+    for key, pattern_type in MongoDBService.PATTERN_TYPES:
+        for pattern in patterns_data.get(key, []):
+            name = pattern.get("name", "").lower()
+            patterns_by_name.setdefault(name, (pattern_type, pattern))
+            patterns_in_order.append((name, pattern_type, pattern))
+    return patterns_by_name, patterns_in_order
+
+
+# How long (seconds) and how many repository documents queries keep cached
+_REPO_CACHE_TTL = 30.0
+_REPO_CACHE_SIZE = 512
+
+# Repository IDs are generated UUIDs; anything outside this shape is rejected
+_REPO_ID_RE = re.compile(r"[A-Za-z0-9_-]{1,64}")
+
+# How long (seconds) and how many unknown repository IDs queries remember
+_MISSING_REPO_TTL = 10.0
+_MISSING_REPO_SIZE = 1024
+
+# Length of the lower-cased name windows stored in code_files.name_grams
+_NAME_GRAM_SIZE = 3
+
+
+def _name_grams(names: Iterable[str]) -> List[str]:
+    """Lower-cased windows of _NAME_GRAM_SIZE characters over names
+    
+    A file whose class and interface names contain a query also has every
+    window of the query among its name grams, so the indexed grams narrow
+    substring lookups down to a few candidate files.
+    """
+    grams = set()
+    for name in names:
+        name = name.lower()
+        grams.update(name[i:i + _NAME_GRAM_SIZE] for i in range(len(name) - _NAME_GRAM_SIZE + 1))
+    return sorted(grams)
+
+
+# code_files fields an exact component lookup reads
+_COMPONENT_FIELDS = {
+    "_id": 0,
+    "path": 1,
+    "code_language": 1,
+    "metadata.namespace": 1,
+    "metadata.classes": 1,
+    "metadata.interfaces": 1
+}
+
+# Views a knowledge graph query can combine into one request
+_QUERY_VIEWS = ("general", "component", "pattern")
+
+# File extensions codebase analysis extracts knowledge from
+_SUPPORTED_EXTENSIONS = frozenset((".cs", ".py", ".js", ".ts", ".java", ".cpp", ".c", ".h", ".hpp"))
+
+
+def _scan_files(root: str, exclude_re: Optional[re.Pattern]) -> Iterator[os.DirEntry]:
+    """Yield the files under root in os.walk order, skipping excluded paths
+    
+    A directory whose path matches exclude_re is pruned with everything below
+    it; a file is skipped when its path matches, so patterns may span a
+    directory and a file name.
+    """
+    if exclude_re is not None and exclude_re.search(root):
+        return
+    
+    subdirs = []
+    try:
+        with os.scandir(root) as entries:
+            for entry in entries:
+                try:
+                    if entry.is_dir(follow_symlinks=False):
+                        subdirs.append(entry.path)
+                    elif entry.is_file() and (exclude_re is None or not exclude_re.search(entry.path)):
+                        yield entry
+                except OSError:
+                    continue
+    except OSError:
+        return
+    
+    for subdir in subdirs:
+        yield from _scan_files(subdir, exclude_re)
+
+
+def _checkpoint_order(name: str) -> Tuple[int, ...]:
+    """Sort key for checkpoint_<file_count>_<timestamp>.json file names
+    
+    Compares the counters numerically, so checkpoints written before names
+    were zero-padded still order correctly; unparseable names sort first.
+    """
+    try:
+        return tuple(int(part) for part in name[len("checkpoint_"):-len(".json")].split("_"))
+    except ValueError:
+        return ()
+
 
 class CodebaseAnalysisHandler(HandlerInterface):
     """Handler for codebase/analyze method which extracts and stores knowledge for AI development"""
@@ -62,10 +258,62 @@ class CodebaseAnalysisHandler(HandlerInterface):
         
         self.logger = logging.getLogger("mcp_server.handlers.codebase_analysis")
     
+    def _discover_files(
+        self, repo_path: str, exclude_re: Optional["re.Pattern"], skip_paths: Iterable[str]
+    ) -> Iterator[Tuple[str, str, int]]:
+        """Yield (file_path, language, size) for each supported file under repo_path
+        
+        Files listed in skip_paths (already processed when resuming) and files
+        larger than 1MB are skipped.
+        """
+        for entry in _scan_files(repo_path, exclude_re):
+            # Check if file extension is supported
+            file_ext = os.path.splitext(entry.name)[1].lower()
+            if file_ext not in _SUPPORTED_EXTENSIONS:
+                continue
+            
+            file_path = entry.path
+            
+            # Skip already processed files if resuming
+            if file_path in skip_paths:
+                continue
+                
+            # Skip very large files
+            try:
+                size = entry.stat().st_size
+                if size > 1024 * 1024:  # Skip files larger than 1MB
+                    continue
+                
+                # Determine file language; every supported extension is mapped
+                yield file_path, _EXTENSION_MAP[file_ext], size
+            except Exception as e:
+                self.logger.warning(f"Error checking file {file_path}: {str(e)}")
+    
+    def _extract_file(self, file_path: str, language: str) -> Tuple[Dict[str, Any], Dict[str, Any], List[Dict[str, Any]]]:
+        """Extract code knowledge, documentation and chunks for one file
+        
+        Runs in a worker thread with its own event loop; the extractors parse
+        synchronously, so running them inline would block the server.
+        
+        Args:
+            file_path: Path to the file
+            language: Programming language of the file
+            
+        Returns:
+            Tuple of (code knowledge, documentation, chunks)
+        """
+        async def extract():
+            code_result = await self.code_extractor.extract_knowledge_from_file(file_path, language)
+            doc_result = await self.doc_extractor.extract_documentation(file_path, language)
+            chunks = await self.code_chunker.chunk_file(file_path, language)
+            return code_result, doc_result, chunks
+        
+        return asyncio.run(extract())
+    
     def _save_intermediate_results(
         self,
         file_count: int,
-        file_results: List[Dict],
+        file_summaries: Iterable[Dict],
         output_dir: str,
         error_files: List[Dict]
     ) -> None:
@@ -73,7 +321,7 @@ class CodebaseAnalysisHandler(HandlerInterface):
         
         Args:
             file_count: Number of files processed
-            file_results: Results of file processing
+            file_summaries: Summaries of the most recently processed files
             output_dir: Directory to save intermediate results
             error_files: Files that failed to process
         """
@@ -84,28 +332,19 @@ class CodebaseAnalysisHandler(HandlerInterface):
             
             # Save checkpoint with timestamp
             timestamp = int(time.time())
-            checkpoint_file = os.path.join(checkpoint_dir, f"checkpoint_{file_count}_{timestamp}.json")
+            checkpoint_file = os.path.join(checkpoint_dir, f"checkpoint_{file_count:09d}_{timestamp}.json")
             
             # Create a summary of results (don't save full content to keep file size reasonable)
             summary = {
                 "file_count": file_count,
                 "timestamp": timestamp,
-                "files": [
-                    {
-                        "file_path": item["file_path"],
-                        "code_language": item["code_language"],
-                        "file_id": item.get("file_id", ""),
-                        "class_count": len(item["result"].get("classes", [])),
-                        "interface_count": len(item["result"].get("interfaces", [])),
-                        "namespace": item["result"].get("namespace", "Unknown")
-                    }
-                    for item in file_results[-100:]  # Only save the last 100 files for efficiency
-                ],
+                "files": list(file_summaries),
                 "errors": error_files[-100:]
             }
             
-            with open(checkpoint_file, "w", encoding="utf-8") as f:
-                json.dump(summary, f, indent=2)
+            # Checkpoints are only read back by resume, so skip pretty-printing
+            with open(checkpoint_file, "wb") as f:
+                f.write(_dump_json(summary))
                 
             self.logger.info(f"Saved checkpoint at {file_count} files")
         except Exception as e:
@@ -149,6 +388,7 @@ class CodebaseAnalysisHandler(HandlerInterface):
             repo_id = str(uuid.uuid4())  # Generate a UUID for the repository
             try:
                 # Use MongoDB's native methods for storing data
+                now = datetime.datetime.now()
                 await self.mongodb_service.repos.update_one(
                     {"repo_id": repo_id},
                     {"$set": {
@@ -158,7 +398,9 @@ class CodebaseAnalysisHandler(HandlerInterface):
                         "metadata": {
                             "analysis_type": "ai_development"
                         },
-                        "created_at": datetime.datetime.now()
+                        "created_at": now,
+                        # Lets query caches revalidate with a small read
+                        "updated_at": now
                     }},
                     upsert=True
                 )
@@ -172,25 +414,38 @@ class CodebaseAnalysisHandler(HandlerInterface):
         # Create output directory
         os.makedirs(output_dir, exist_ok=True)
         
+        # Result files are written in worker threads while analysis carries
+        # on; every write is awaited before documentation is returned
+        loop = asyncio.get_running_loop()
+        
         # Analyze environment first
         self.logger.info("Analyzing environment and dependencies...")
         env_results = await self.environment_analyzer.analyze_environment(repo_path)
         
         # Save environment results
-        with open(os.path.join(output_dir, "environment.json"), "w", encoding="utf-8") as f:
-            json.dump(env_results, f, indent=2)
+        env_write = loop.run_in_executor(None, _write_json, os.path.join(output_dir, "environment.json"), env_results)
         
         # Extract code patterns
         self.logger.info("Extracting development patterns...")
         pattern_results = await self.pattern_extractor.extract_patterns(repo_path, [])
         
         # Save pattern results
-        with open(os.path.join(output_dir, "patterns.json"), "w", encoding="utf-8") as f:
-            json.dump(pattern_results, f, indent=2)
+        pattern_write = loop.run_in_executor(None, _write_json, os.path.join(output_dir, "patterns.json"), pattern_results)
+        
+        # Store patterns individually so pattern queries can look them up by name
+        try:
+            await self.mongodb_service.store_patterns(repo_id, pattern_results)
+        except Exception as e:
+            self.logger.warning(f"Could not store patterns in MongoDB: {str(e)}")
         
         # Extract code content
         self.logger.info("Extracting code content...")
+        # Lightweight per-file summaries; the full results are streamed to
+        # files.jsonl as each batch completes instead of kept in memory
         file_results = []
+        # Checkpoint summaries of the last 100 files
+        recent_summaries = collections.deque(maxlen=100)
+        files_path = os.path.join(output_dir, "files.jsonl")
         error_files = []
         file_count = 0
         
@@ -202,14 +457,16 @@ class CodebaseAnalysisHandler(HandlerInterface):
             checkpoint_dir = os.path.join(output_dir, "checkpoints")
             if os.path.exists(checkpoint_dir):
                 # Find the latest checkpoint
-                checkpoint_files = [f for f in os.listdir(checkpoint_dir) if f.startswith("checkpoint_")]
-                if checkpoint_files:
-                    latest_checkpoint = sorted(checkpoint_files)[-1]
+                checkpoint_files = [
+                    f for f in os.listdir(checkpoint_dir) if f.startswith("checkpoint_") and f.endswith(".json")
+                ]
+                latest_checkpoint = max(checkpoint_files, key=_checkpoint_order, default=None)
+                if latest_checkpoint:
                     checkpoint_path = os.path.join(checkpoint_dir, latest_checkpoint)
                     
                     try:
-                        with open(checkpoint_path, "r", encoding="utf-8") as f:
-                            checkpoint_data = json.load(f)
+                        with open(checkpoint_path, "rb") as f:
+                            checkpoint_data = loads(f.read())
                             
                         # Get processed files from checkpoint
                         for file_info in checkpoint_data.get("files", []):
@@ -223,65 +480,49 @@ class CodebaseAnalysisHandler(HandlerInterface):
                     except Exception as e:
                         self.logger.warning(f"Failed to load checkpoint: {str(e)}")
         
-        # Create list of files to process
-        all_files_to_process = []
-        
-        # Find all supported code files
-        supported_extensions = [".cs", ".py", ".js", ".ts", ".java", ".cpp", ".c", ".h", ".hpp"]
-        for root, _, files in os.walk(repo_path):
-            # Skip excluded directories
-            if any(exclude in root for exclude in exclude_patterns):
-                continue
-                
-            for file in files:
-                # Skip excluded files
-                if any(exclude in file for exclude in exclude_patterns):
-                    continue
-                    
-                # Check if file extension is supported
-                file_ext = os.path.splitext(file)[1].lower()
-                if file_ext not in supported_extensions:
-                    continue
-                
-                file_path = os.path.join(root, file)
-                
-                # Skip already processed files if resuming
-                if resume_from_checkpoint and file_path in processed_files:
-                    continue
-                    
-                # Skip very large files
-                try:
-                    if os.path.getsize(file_path) > 1024 * 1024:  # Skip files larger than 1MB
-                        continue
-                    
-                    # Determine file language
-                    language = self._determine_language(file_ext)
-                    
-                    if language:
-                        all_files_to_process.append((file_path, language))
-                except Exception as e:
-                    self.logger.warning(f"Error checking file {file_path}: {str(e)}")
+        # Discover supported code files lazily; the walk only advances as far
+        # as the batches below actually need
+        exclude_re = re.compile("|".join(map(re.escape, exclude_patterns))) if exclude_patterns else None
+        files_to_process = self._discover_files(
+            repo_path, exclude_re, processed_files if resume_from_checkpoint else ()
+        )
         
         # Process files in batches for better memory management
-        self.logger.info(f"Found {len(all_files_to_process)} files to process")
         batch_size = 100  # Process files in batches of 100
+        batch_number = 0
         
-        for i in range(0, len(all_files_to_process), batch_size):
-            batch = all_files_to_process[i:i+batch_size]
-            self.logger.info(f"Processing batch {i//batch_size + 1}/{(len(all_files_to_process) + batch_size - 1)//batch_size}")
+        # Start a fresh results file for this analysis
+        open(files_path, "wb").close()
+        
+        while file_count < file_limit:
+            # Never extract more files than the file limit still allows
+            batch = list(itertools.islice(files_to_process, min(batch_size, file_limit - file_count)))
+            if not batch:
+                break
+            batch_number += 1
+            self.logger.info(f"Processing batch {batch_number} ({len(batch)} files)")
             
-            for file_path, language in batch:
-
-                # Extract knowledge from file
+            # Extract the whole batch concurrently, off the event loop
+            extractions = await asyncio.gather(
+                *(loop.run_in_executor(None, self._extract_file, file_path, language) for file_path, language, _ in batch),
+                return_exceptions=True
+            )
+            
+            # MongoDB writes and result lines for the batch, written together
+            # once it is processed
+            file_ops = []
+            chunk_ops = []
+            result_lines = []
+            now = datetime.datetime.now()
+            
+            for (file_path, language, size), extraction in zip(batch, extractions):
+                if isinstance(extraction, Exception):
+                    self.logger.warning(f"Error processing file {file_path}: {str(extraction)}")
+                    error_files.append({"file_path": file_path, "error": str(extraction)})
+                    continue
+                
                 try:
-                    # Extract code knowledge
-                    code_result = await self.code_extractor.extract_knowledge_from_file(file_path, language)
-                    
-                    # Extract documentation
-                    doc_result = await self.doc_extractor.extract_documentation(file_path, language)
-                    
-                    # Generate code chunks for semantic search
-                    chunks = await self.code_chunker.chunk_file(file_path, language)
+                    code_result, doc_result, chunks = extraction
                     
                     # Combine results
                     result = {
@@ -297,38 +538,43 @@ class CodebaseAnalysisHandler(HandlerInterface):
                         ]
                     }
 
-                    # Store in MongoDB
+                    # Queue the MongoDB writes for this file
                     try:
                         # Create a sanitized version of metadata for MongoDB
                         # This prevents issues with unsupported language overrides
-                        sanitized_metadata = {}
-                        for key, value in result.items():
-                            if key != "chunks":  # Don't store full chunks in metadata
-                                sanitized_metadata[key] = value
+                        sanitized_metadata = dict(result)
+                        del sanitized_metadata["chunks"]  # Don't store full chunks in metadata
                         
                         # For C# files, use a different language string to avoid MongoDB issues
                         safe_language = "csharp_safe" if language.lower() == "csharp" else language
                         
                         # Use direct MongoDB collection access
-                        file_id = str(uuid.uuid4())
-                        await self.mongodb_service.code_files.update_one(
-                            {"repo_id": repo_id, "path": os.path.relpath(file_path, repo_path)},
+                        file_id = uuid.uuid4().hex
+                        rel_path = os.path.relpath(file_path, repo_path)
+                        file_ops.append(UpdateOne(
+                            {"repo_id": repo_id, "path": rel_path},
                             {"$set": {
                                 "file_id": file_id,
                                 "repo_id": repo_id,
-                                "path": os.path.relpath(file_path, repo_path),
+                                "path": rel_path,
                                 "code_language": safe_language,
-                                "size": os.path.getsize(file_path),
+                                "size": size,
                                 "metadata": sanitized_metadata,
-                                "updated_at": datetime.datetime.now()
+                                "name_grams": _name_grams(
+                                    entry.get("name", "")
+                                    for entry in itertools.chain(
+                                        code_result.get("classes", []), code_result.get("interfaces", [])
+                                    )
+                                ),
+                                "updated_at": now
                             }},
                             upsert=True
-                        )
+                        ))
                         
                         # Store code chunks separately for better vector search
                         for i, chunk in enumerate(chunks):
                             chunk_id = f"{file_id}_chunk_{i}"
-                            await self.mongodb_service.chunks.update_one(
+                            chunk_ops.append(UpdateOne(
                                 {"chunk_id": chunk_id},
                                 {"$set": {
                                     "chunk_id": chunk_id,
@@ -338,22 +584,27 @@ class CodebaseAnalysisHandler(HandlerInterface):
                                     "content": chunk["content"],
                                     "language": safe_language,
                                     "metadata": chunk["metadata"],
-                                    "updated_at": datetime.datetime.now()
+                                    "updated_at": now
                                 }},
                                 upsert=True
-                            )
+                            ))
                     except Exception as mongo_err:
                         self.logger.warning(f"MongoDB error for file {file_path}: {str(mongo_err)}")
-                        file_id = str(uuid.uuid4())  # Generate ID even if storage fails
+                        file_id = uuid.uuid4().hex  # Generate ID even if storage fails
                     
                     # Add to results
-                    file_results.append({
+                    result_lines.append(_dump_json(result, default=str) + b"\n")
+                    file_summary = {
                         "file_path": file_path,
                         "code_language": language,
-                        "result": result,
                         "file_id": file_id,
+                        "class_count": len(result.get("classes", [])),
+                        "interface_count": len(result.get("interfaces", [])),
+                        "namespace": result.get("namespace", "Unknown"),
                         "chunk_count": len(chunks)
-                    })
+                    }
+                    file_results.append(file_summary)
+                    recent_summaries.append(file_summary)
                     
                     file_count += 1
                     
@@ -361,7 +612,7 @@ class CodebaseAnalysisHandler(HandlerInterface):
                     if file_count % 50 == 0:
                         self.logger.info(f"Processed {file_count} files...")
                         # Save intermediate results to allow for recovery
-                        self._save_intermediate_results(file_count, file_results, output_dir, error_files)
+                        self._save_intermediate_results(file_count, recent_summaries, output_dir, error_files)
                     
                     # Check file limit
                     if file_count >= file_limit:
@@ -373,31 +624,41 @@ class CodebaseAnalysisHandler(HandlerInterface):
                     error_files.append({"file_path": file_path, "error": str(e)})
                     # Continue processing other files despite errors
             
-            # Check file limit
-            if file_count >= file_limit:
-                break
+            # Append the batch's full results to the results file
+            with open(files_path, "ab") as f:
+                f.writelines(result_lines)
+            
+            # Store the batch in MongoDB with one round-trip per collection
+            try:
+                if file_ops:
+                    await self.mongodb_service.code_files.bulk_write(file_ops, ordered=False)
+                if chunk_ops:
+                    await self.mongodb_service.chunks.bulk_write(chunk_ops, ordered=False)
+            except Exception as mongo_err:
+                self.logger.warning(f"MongoDB error for batch {batch_number}: {str(mongo_err)}")
         
         # Save code extraction results
-        with open(os.path.join(output_dir, "code_content.json"), "w", encoding="utf-8") as f:
-            # We don't save the full results to avoid large files
-            summary = {
-                "file_count": file_count,
-                "languages": list(set(item["code_language"] for item in file_results if "code_language" in item)),
-                "files": [
-                    {
-                        "file_path": item["file_path"],
-                        "code_language": item["code_language"],
-                        "class_count": len(item["result"].get("classes", [])),
-                        "interface_count": len(item["result"].get("interfaces", [])),
-                        "namespace": item["result"].get("namespace", "Unknown")
-                    }
-                    for item in file_results
-                ]
-            }
-            json.dump(summary, f, indent=2)
+        # We don't save the full results to avoid large files
+        summary = {
+            "file_count": file_count,
+            "languages": list(set(item["code_language"] for item in file_results if "code_language" in item)),
+            "files": [
+                {
+                    "file_path": item["file_path"],
+                    "code_language": item["code_language"],
+                    "class_count": item["class_count"],
+                    "interface_count": item["interface_count"],
+                    "namespace": item["namespace"]
+                }
+                for item in file_results
+            ]
+        }
+        summary_write = loop.run_in_executor(None, _write_json, os.path.join(output_dir, "code_content.json"), summary)
 
         # Save final checkpoint
-        self._save_intermediate_results(file_count, file_results, output_dir, error_files)
+        checkpoint_write = loop.run_in_executor(
+            None, self._save_intermediate_results, file_count, recent_summaries, output_dir, error_files
+        )
         
         # Build knowledge structure
         knowledge = {
@@ -406,15 +667,21 @@ class CodebaseAnalysisHandler(HandlerInterface):
             "file_count": file_count,
             "patterns": pattern_results,
             "environment": env_results,
-            "files": [item["result"] for item in file_results]
+            "files_path": files_path
         }
         
-        # Generate Markdown documentation
+        # Generate Markdown documentation while the result files are written
         self.logger.info("Generating documentation...")
-        docs_result = await self.md_builder.generate_documentation(
-            repo_id=repo_id,
-            extracted_knowledge=knowledge,
-            output_dir=output_dir
+        docs_result, *_ = await asyncio.gather(
+            self.md_builder.generate_documentation(
+                repo_id=repo_id,
+                extracted_knowledge=knowledge,
+                output_dir=output_dir
+            ),
+            env_write,
+            pattern_write,
+            summary_write,
+            checkpoint_write
         )
         
         # Store vector embeddings if services are available and not explicitly skipped
@@ -449,39 +716,7 @@ class CodebaseAnalysisHandler(HandlerInterface):
         Returns:
             Language name
         """
-        extension_map = {
-            ".py": "python",
-            ".js": "javascript",
-            ".ts": "typescript",
-            ".jsx": "javascript",
-            ".tsx": "typescript",
-            ".html": "html",
-            ".css": "css",
-            ".scss": "scss",
-            ".cs": "csharp",
-            ".java": "java",
-            ".cpp": "cpp",
-            ".c": "c",
-            ".h": "c",
-            ".hpp": "cpp",
-            ".go": "go",
-            ".rb": "ruby",
-            ".php": "php",
-            ".swift": "swift",
-            ".kt": "kotlin",
-            ".rs": "rust",
-            ".sql": "sql",
-            ".sh": "shell",
-            ".ps1": "powershell",
-            ".bat": "batch",
-            ".yaml": "yaml",
-            ".yml": "yaml",
-            ".json": "json",
-            ".xml": "xml",
-            ".md": "markdown"
-        }
-        
-        return extension_map.get(file_extension.lower(), "unknown")
+        return _EXTENSION_MAP.get(file_extension.lower(), "unknown")
     
     async def _store_embeddings(
         self, 
@@ -525,9 +760,12 @@ class CodebaseAnalysisHandler(HandlerInterface):
             self.logger.info(f"Using {self.embedding_service.model} embeddings with {vector_size} dimensions")
         
         # Create a new vector service with the correct configuration
-        # This ensures we're using the right vector size for the embedding model
+        # This ensures we're using the right vector size for the embedding model,
+        # while keeping the Qdrant server the application was configured with
         from mcp_server.services.vector_store.qdrant_service import QdrantVectorService
         self.vector_service = QdrantVectorService(
+            url=getattr(self.vector_service, "url", None),
+            api_key=getattr(self.vector_service, "api_key", None),
             collection_name=collection_name,
             vector_size=vector_size,
             embedding_provider=embedding_provider
@@ -536,87 +774,64 @@ class CodebaseAnalysisHandler(HandlerInterface):
         # Initialize the reconfigured vector service
         await self.vector_service.initialize()
         
-        # Store embeddings for documentation pages
+        # Collect everything to embed as (text, metadata, chunk_id) so the
+        # embeddings can be requested in batches rather than one at a time
+        pending = []
+        
+        # Documentation pages, as (path, metadata) until they are read
+        doc_pages = []
         docs_dir = os.path.join(output_dir, "docs")
         if os.path.exists(docs_dir):
-            # Store main README
+            # Main README
             readme_path = os.path.join(docs_dir, "README.md")
             if os.path.exists(readme_path):
-                with open(readme_path, "r", encoding="utf-8") as f:
-                    readme_content = f.read()
-                
-                # Generate embedding
-                readme_embedding = await self.embedding_service.get_embedding(readme_content)
-                
-                # Store in vector database
-                await self.vector_service.store_code_chunk(
-                    embedding=readme_embedding,
-                    code_text=readme_content,
-                    metadata={
-                        "repo_id": repo_id,
-                        "type": "documentation",
-                        "title": "Repository Overview",
-                        "path": "docs/README.md"
-                    }
-                )
+                doc_pages.append((readme_path, {
+                    "repo_id": repo_id,
+                    "type": "documentation",
+                    "title": "Repository Overview",
+                    "path": "docs/README.md"
+                }))
             
-            # Store structure documentation
+            # Structure documentation
             structure_dir = os.path.join(docs_dir, "structure")
             if os.path.exists(structure_dir):
                 for file_name in os.listdir(structure_dir):
                     if file_name.endswith(".md"):
-                        file_path = os.path.join(structure_dir, file_name)
-                        with open(file_path, "r", encoding="utf-8") as f:
-                            content = f.read()
-                        
-                        # Generate embedding
-                        embedding = await self.embedding_service.get_embedding(content)
-                        
                         # Determine title
                         title = "Code Structure"
                         if file_name != "README.md":
                             title = f"Structure: {os.path.splitext(file_name)[0]}"
                         
-                        # Store in vector database
-                        await self.vector_service.store_code_chunk(
-                            embedding=embedding,
-                            code_text=content,
-                            metadata={
-                                "repo_id": repo_id,
-                                "type": "documentation",
-                                "category": "structure",
-                                "title": title,
-                                "path": f"docs/structure/{file_name}"
-                            }
-                        )
+                        doc_pages.append((os.path.join(structure_dir, file_name), {
+                            "repo_id": repo_id,
+                            "type": "documentation",
+                            "category": "structure",
+                            "title": title,
+                            "path": f"docs/structure/{file_name}"
+                        }))
             
-            # Store pattern documentation
+            # Pattern documentation
             patterns_dir = os.path.join(docs_dir, "patterns")
             if os.path.exists(patterns_dir):
                 for file_name in os.listdir(patterns_dir):
                     if file_name.endswith(".md"):
-                        file_path = os.path.join(patterns_dir, file_name)
-                        with open(file_path, "r", encoding="utf-8") as f:
-                            content = f.read()
-                        
-                        # Generate embedding
-                        embedding = await self.embedding_service.get_embedding(content)
-                        
-                        # Store in vector database
-                        await self.vector_service.store_code_chunk(
-                            embedding=embedding,
-                            code_text=content,
-                            metadata={
-                                "repo_id": repo_id,
-                                "type": "documentation",
-                                "category": "patterns",
-                                "title": "Design and Architecture Patterns",
-                                "path": f"docs/patterns/{file_name}"
-                            }
-                        )
-        
-        # Store embeddings for chunks using the improved code chunker
-        for file_info in knowledge.get("files", [])[:100]:  # Limit to 100 files for performance
+                        doc_pages.append((os.path.join(patterns_dir, file_name), {
+                            "repo_id": repo_id,
+                            "type": "documentation",
+                            "category": "patterns",
+                            "title": "Design and Architecture Patterns",
+                            "path": f"docs/patterns/{file_name}"
+                        }))
+        
+        # Read the pages in worker threads so the event loop keeps serving
+        # other requests while the disk is busy
+        loop = asyncio.get_running_loop()
+        contents = await asyncio.gather(*(loop.run_in_executor(None, _read_text, path) for path, _ in doc_pages))
+        for content, (_, metadata) in zip(contents, doc_pages):
+            pending.append((content, metadata, None))
+        
+        # Chunks from the improved code chunker
+        for file_info in itertools.islice(iter_extracted_files(knowledge), 100):  # Limit to 100 files for performance
             file_path = file_info.get("file_path")
             if not file_path:
                 continue
@@ -629,31 +844,20 @@ class CodebaseAnalysisHandler(HandlerInterface):
                 
                 # Store each chunk separately with its own embedding
                 for chunk in chunks:
-                    # Generate embedding for this chunk
-                    chunk_embedding = await self.embedding_service.get_embedding(chunk["content"])
-                    
                     # Create chunk ID using hashing to ensure valid UUID
-                    import hashlib
                     # Create a deterministic but unique hash from the components
-                    hash_input = f"{repo_id}:{file_path}:{chunk['type']}:{uuid.uuid4()}"
+                    hash_input = f"{repo_id}:{file_path}:{chunk['type']}:{uuid.uuid4().hex}"
                     chunk_id = str(uuid.UUID(hashlib.md5(hash_input.encode()).hexdigest()))
                     
-                    # Store in vector database with rich metadata
-                    await self.vector_service.store_code_chunk(
-                        embedding=chunk_embedding,
-                        code_text=chunk["content"],
-                        metadata={
-                            "id": chunk_id,
-                            "file_path": file_path,
-                            "code_language": language,
-                            "type": chunk["type"],
-                            "repo_id": repo_id,
-                            **chunk["metadata"]  # Include all chunk metadata
-                        },
-                        chunk_id=chunk_id
-                    )
-                    
-                    self.logger.debug(f"Stored chunk {chunk_id} of type {chunk['type']}")
+                    # Rich metadata for the vector database
+                    pending.append((chunk["content"], {
+                        "id": chunk_id,
+                        "file_path": file_path,
+                        "code_language": language,
+                        "type": chunk["type"],
+                        "repo_id": repo_id,
+                        **chunk["metadata"]  # Include all chunk metadata
+                    }, chunk_id))
                 
                 # Also store documentation with embeddings if available
                 if "documentation" in file_info and file_info["documentation"]:
@@ -664,30 +868,51 @@ class CodebaseAnalysisHandler(HandlerInterface):
                         if isinstance(doc_items, list) and doc_items:
                             for item in doc_items:
                                 if "docstring" in item and item["docstring"]:
-                                    # Generate embedding for this documentation
-                                    doc_embedding = await self.embedding_service.get_embedding(item["docstring"])
-                                    
                                     # Create doc ID using hashing to ensure valid UUID
-                                    hash_input = f"{repo_id}:{file_path}:doc:{doc_type}:{uuid.uuid4()}"
+                                    hash_input = f"{repo_id}:{file_path}:doc:{doc_type}:{uuid.uuid4().hex}"
                                     doc_id = str(uuid.UUID(hashlib.md5(hash_input.encode()).hexdigest()))
                                     
-                                    # Store in vector database
-                                    await self.vector_service.store_code_chunk(
-                                        embedding=doc_embedding,
-                                        code_text=item["docstring"],
-                                        metadata={
-                                            "id": doc_id,
-                                            "file_path": file_path,
-                                            "code_language": language,
-                                            "type": "documentation",
-                                            "doc_type": doc_type,
-                                            "name": item.get("name", ""),
-                                            "repo_id": repo_id
-                                        },
-                                        chunk_id=doc_id
-                                    )
+                                    pending.append((item["docstring"], {
+                                        "id": doc_id,
+                                        "file_path": file_path,
+                                        "code_language": language,
+                                        "type": "documentation",
+                                        "doc_type": doc_type,
+                                        "name": item.get("name", ""),
+                                        "repo_id": repo_id
+                                    }, doc_id))
             except Exception as chunk_err:
-                self.logger.warning(f"Error chunking/embedding file {file_path}: {str(chunk_err)}")
+                self.logger.warning(f"Error chunking file {file_path}: {str(chunk_err)}")
+        
+        if not pending:
+            return
+        
+        # Generate all embeddings; the embedding service splits the texts
+        # into provider-sized batches. Identical texts (shared boilerplate,
+        # repeated docstrings) are embedded once and the vector reused
+        text_index = {}
+        for text, _, _ in pending:
+            text_index.setdefault(text, len(text_index))
+        unique_embeddings = await self.embedding_service.get_embeddings(list(text_index))
+        embeddings = [unique_embeddings[text_index[text]] for text, _, _ in pending]
+        
+        # Store in vector database, one upsert per batch of points. The HNSW
+        # index is built once after the upload instead of on every upsert
+        await self.vector_service.pause_indexing()
+        try:
+            batch_size = 64
+            for i in range(0, len(pending), batch_size):
+                batch = pending[i:i+batch_size]
+                await self.vector_service.store_batch_code_chunks(
+                    embeddings=embeddings[i:i+batch_size],
+                    code_texts=[text for text, _, _ in batch],
+                    metadata_list=[metadata for _, metadata, _ in batch],
+                    chunk_ids=[chunk_id or str(uuid.uuid4()) for _, _, chunk_id in batch]
+                )
+        finally:
+            await self.vector_service.resume_indexing()
+        
+        self.logger.info(f"Stored {len(pending)} embeddings for repository {repo_id}")
     
     def _format_classes_for_embedding(self, classes: List[Dict[str, Any]]) -> str:
         """Format classes for embedding
@@ -701,11 +926,10 @@ class CodebaseAnalysisHandler(HandlerInterface):
         if not classes:
             return "No classes found."
         
-        result = ""
-        for cls in classes:
-            result += f"- {cls.get('name')}: {len(cls.get('methods', []))} methods, {len(cls.get('properties', []))} properties\n"
-        
-        return result
+        return "".join(
+            f"- {cls.get('name')}: {len(cls.get('methods', []))} methods, {len(cls.get('properties', []))} properties\n"
+            for cls in classes
+        )
     
     def _format_interfaces_for_embedding(self, interfaces: List[Dict[str, Any]]) -> str:
         """Format interfaces for embedding
@@ -719,11 +943,7 @@ class CodebaseAnalysisHandler(HandlerInterface):
         if not interfaces:
             return "No interfaces found."
         
-        result = ""
-        for interface in interfaces:
-            result += f"- {interface.get('name')}\n"
-        
-        return result
+        return "".join(f"- {interface.get('name')}\n" for interface in interfaces)
 
 
 class CodeSearchHandler(HandlerInterface):
@@ -887,8 +1107,16 @@ class CodeSearchHandler(HandlerInterface):
 
 
 class KnowledgeGraphQueryHandler(HandlerInterface):
-    """Handler for knowledge/query method which provides knowledge graph query capabilities"""
-    
+    """Handler for knowledge/query method which provides knowledge graph query capabilities
+
+    Queries rely on the code_files indexes created by MongoDBService.initialize():
+    repo_id for file counts, (repo_id, metadata.classes.name) and
+    (repo_id, metadata.interfaces.name) with MongoDBService.NAME_COLLATION for
+    exact component names, and (repo_id, name_grams) without a collation for
+    partial ones. Exact lookups must pass NAME_COLLATION and partial lookups
+    must not, or the indexes are not used.
+    """
+
     def __init__(
         self,
         mongodb_service: MongoDBService,
@@ -903,6 +1131,15 @@ class KnowledgeGraphQueryHandler(HandlerInterface):
         self.mongodb_service = mongodb_service
         self.ai_service = ai_service
         self.logger = logging.getLogger("mcp_server.handlers.knowledge_graph_query")
+        
+        # Recently read repositories as repo_id -> (expiry time, document)
+        self._repositories: Dict[str, Tuple[float, Dict[str, Any]]] = {}
+        
+        # Pattern indexes by (repo_id, updated_at)
+        self._pattern_indexes: Dict[Tuple[str, Any], _PatternIndex] = {}
+        
+        # Recently queried unknown repositories as repo_id -> expiry time
+        self._missing: Dict[str, float] = {}
     
     async def handle(self, params: Dict[str, Any]) -> Dict[str, Any]:
         """Handle knowledge graph query request
@@ -918,30 +1155,199 @@ class KnowledgeGraphQueryHandler(HandlerInterface):
         query_type = params.get("query_type", "general")  # "general", "component", "pattern"
         component_name = params.get("component_name")  # For component queries
         pattern_name = params.get("pattern_name")  # For pattern queries
+        include = params.get("include")  # Several views in one request
         
         # Validate parameters
+        if isinstance(repo_id, str):
+            repo_id = repo_id.strip()
         if not repo_id:
             raise ValueError("Repository ID is required")
+        if not isinstance(repo_id, str) or not _REPO_ID_RE.fullmatch(repo_id):
+            raise ValueError("Repository ID must be 1-64 letters, digits, '-' or '_'")
+        
+        if include is not None:
+            if not isinstance(include, list) or any(view not in _QUERY_VIEWS for view in include):
+                raise ValueError(f"include must be a list of views from {', '.join(_QUERY_VIEWS)}")
+            if "component" in include and not component_name:
+                raise ValueError("component_name is required to include the component view")
+            if "pattern" in include and not pattern_name:
+                raise ValueError("pattern_name is required to include the pattern view")
+            if len(include) == 1:
+                # A single view is answered like a query of that type
+                query_type = include[0]
+        
+        # Unknown repositories are rejected without a round-trip for a while
+        expires = self._missing.get(repo_id)
+        if expires is not None:
+            if time.monotonic() < expires:
+                raise ValueError(f"Repository with ID {repo_id} not found")
+            del self._missing[repo_id]
         
         self.logger.info(f"Querying knowledge graph for repository {repo_id}")
         
         # Initialize MongoDB
         await self.mongodb_service.initialize()
         
+        if include and len(include) > 1:
+            # Several views at once are answered in a single round-trip
+            return await self._query_batch(repo_id, include, component_name, pattern_name)
+        
+        if query_type == "pattern" and pattern_name:
+            # A stored pattern row answers without reading the repository
+            pattern = await self.mongodb_service.find_pattern(repo_id, pattern_name)
+            if pattern is not None:
+                return {
+                    "status": "success",
+                    "pattern_name": pattern_name,
+                    "pattern_info": pattern
+                }
+        
         # Get repository info
-        repo_info = await self.mongodb_service.get_repository(repo_id)
+        repo_info = await self._get_repository(repo_id)
         if not repo_info:
+            self._mark_missing(repo_id)
             raise ValueError(f"Repository with ID {repo_id} not found")
         
         if query_type == "component" and component_name:
             # Query for specific component
             return await self._query_component(repo_id, component_name)
         elif query_type == "pattern" and pattern_name:
-            # Query for specific pattern
-            return await self._query_pattern(repo_id, pattern_name)
+            # Repositories analyzed before patterns were stored individually
+            # are searched in their document
+            return self._pattern_result(repo_id, pattern_name, repo_info)
         else:
             # General repository query
-            return await self._query_general(repo_id)
+            return await self._query_general(repo_id, repo_info)
+    
+    async def _get_repository(self, repo_id: str) -> Optional[Dict[str, Any]]:
+        """Get the knowledge fields of a repository, cached for a short while
+        
+        A cached document is served without a query for _REPO_CACHE_TTL
+        seconds. After that, a projected read of updated_at revalidates it,
+        and the full document is only read again when the repository changed.
+        
+        Args:
+            repo_id: Repository ID
+            
+        Returns:
+            Repository document or None if not found
+        """
+        now = time.monotonic()
+        cached = self._repositories.get(repo_id)
+        if cached is not None:
+            expires, repo = cached
+            if now < expires:
+                return repo
+            
+            current = await self.mongodb_service.get_repository(repo_id, projection={"_id": 0, "updated_at": 1})
+            if current is None:
+                del self._repositories[repo_id]
+                return None
+            if repo.get("updated_at") is not None and current.get("updated_at") == repo["updated_at"]:
+                self._repositories[repo_id] = (now + _REPO_CACHE_TTL, repo)
+                return repo
+        
+        repo = await self.mongodb_service.get_repository(repo_id, projection=_REPO_KNOWLEDGE_FIELDS)
+        if repo is None:
+            self._repositories.pop(repo_id, None)
+            return None
+        
+        if repo_id not in self._repositories and len(self._repositories) >= _REPO_CACHE_SIZE:
+            # Drop the oldest repository
+            del self._repositories[next(iter(self._repositories))]
+        self._repositories[repo_id] = (now + _REPO_CACHE_TTL, repo)
+        return repo
+    
+    def _mark_missing(self, repo_id: str) -> None:
+        """Remember that a repository does not exist for _MISSING_REPO_TTL seconds
+        
+        Args:
+            repo_id: Repository ID
+        """
+        if repo_id not in self._missing and len(self._missing) >= _MISSING_REPO_SIZE:
+            # Drop the oldest repository
+            del self._missing[next(iter(self._missing))]
+        self._missing[repo_id] = time.monotonic() + _MISSING_REPO_TTL
+    
+    async def _query_batch(
+        self,
+        repo_id: str,
+        views: List[str],
+        component_name: Optional[str],
+        pattern_name: Optional[str]
+    ) -> Dict[str, Any]:
+        """Answer several query views with one aggregation
+        
+        The repository document is matched once; the file count and the
+        component search run as $lookup sub-pipelines on code_files.
+        
+        Args:
+            repo_id: Repository ID
+            views: Views to include ("general", "component", "pattern")
+            component_name: Name of the component to query
+            pattern_name: Name of the pattern to query
+            
+        Returns:
+            Results of each requested view, keyed by view
+        """
+        pipeline = [
+            {"$match": {"repo_id": repo_id}},
+            {"$project": _REPO_KNOWLEDGE_FIELDS}
+        ]
+        
+        if "general" in views:
+            pipeline.append({"$lookup": {
+                "from": "code_files",
+                "pipeline": [{"$match": {"repo_id": repo_id}}, {"$count": "count"}],
+                "as": "file_count"
+            }})
+        
+        if "component" in views:
+            # The component pipeline ranks on lower-cased names and matches
+            # lower-cased grams, so it needs no collation; the (repo_id,
+            # name_grams) index is built without one and still serves it
+            pipeline.append({"$lookup": {
+                "from": "code_files",
+                "pipeline": self._component_pipeline(repo_id, component_name),
+                "as": "components"
+            }})
+        
+        # A stored pattern row is looked up alongside the aggregation
+        if "pattern" in views:
+            repos, pattern = await asyncio.gather(
+                self.mongodb_service.aggregate(collection="repositories", pipeline=pipeline),
+                self.mongodb_service.find_pattern(repo_id, pattern_name)
+            )
+        else:
+            repos = await self.mongodb_service.aggregate(collection="repositories", pipeline=pipeline)
+            pattern = None
+        if not repos:
+            self._mark_missing(repo_id)
+            raise ValueError(f"Repository with ID {repo_id} not found")
+        repo = repos[0]
+        
+        results = {}
+        if "general" in views:
+            file_count = repo["file_count"][0]["count"] if repo["file_count"] else 0
+            results["general"] = self._general_result(repo_id, repo, file_count)
+        if "component" in views:
+            results["component"] = self._component_result(repo_id, component_name, repo["components"])
+        if "pattern" in views:
+            if pattern is not None:
+                results["pattern"] = {
+                    "status": "success",
+                    "pattern_name": pattern_name,
+                    "pattern_info": pattern
+                }
+            else:
+                # Repositories analyzed before patterns were stored individually
+                results["pattern"] = self._pattern_result(repo_id, pattern_name, repo)
+        
+        return {
+            "status": "success",
+            "repo_id": repo_id,
+            "results": results
+        }
     
     async def _query_component(self, repo_id: str, component_name: str) -> Dict[str, Any]:
         """Query knowledge graph for component information
@@ -953,12 +1359,9 @@ class KnowledgeGraphQueryHandler(HandlerInterface):
         Returns:
             Component information
         """
-        # Look for the component in the code files
-        components = []
-        
-        # Try different approaches to find the component
-        # 1. Exact match by name
-        component = await self.mongodb_service.find_one(
+        # Exact names are the common case and a plain find seeks them directly
+        # on the compound indexes; only misses go through the aggregation
+        files = await self.mongodb_service.find(
             collection="code_files",
             query={
                 "repo_id": repo_id,
@@ -966,27 +1369,174 @@ class KnowledgeGraphQueryHandler(HandlerInterface):
                     {"metadata.classes.name": component_name},
                     {"metadata.interfaces.name": component_name}
                 ]
-            }
+            },
+            limit=5,
+            # Names compare case-insensitively on the collated name indexes
+            collation=self.mongodb_service.NAME_COLLATION,
+            projection=_COMPONENT_FIELDS
         )
+        if files:
+            components = [self._exact_component(component_name, file) for file in files]
+        else:
+            # Grams are lower-cased, so the partial lookup runs without a
+            # collation, like its index
+            components = await self.mongodb_service.aggregate(
+                collection="code_files",
+                pipeline=self._component_pipeline(repo_id, component_name)
+            )
         
-        if component:
-            components.append(component)
+        return self._component_result(repo_id, component_name, components)
+    
+    @staticmethod
+    def _exact_component(component_name: str, file: Dict[str, Any]) -> Dict[str, Any]:
+        """Shape an exact-match file like a component pipeline result
         
-        # 2. Partial match by name
-        if not components:
-            partial_matches = await self.mongodb_service.find(
-                collection="code_files",
-                query={
-                    "repo_id": repo_id,
-                    "$or": [
-                        {"metadata.classes.name": {"$regex": component_name, "$options": "i"}},
-                        {"metadata.interfaces.name": {"$regex": component_name, "$options": "i"}}
+        Args:
+            component_name: Name of the component to query
+            file: code_files document projected to _COMPONENT_FIELDS
+            
+        Returns:
+            Document with the classes and interfaces matching component_name
+        """
+        name = component_name.lower()
+        metadata = file.get("metadata", {})
+        return {
+            "_rank": 0,
+            "path": file.get("path"),
+            "code_language": file.get("code_language"),
+            "metadata": {"namespace": metadata.get("namespace", "Unknown")},
+            "matched_classes": [
+                cls for cls in metadata.get("classes", [])
+                if name in (cls.get("name") or "").lower()
+            ],
+            "matched_interfaces": [
+                interface for interface in metadata.get("interfaces", [])
+                if name in (interface.get("name") or "").lower()
+            ]
+        }
+    
+    def _component_pipeline(self, repo_id: str, component_name: str) -> List[Dict[str, Any]]:
+        """Build the code_files aggregation that finds a component
+        
+        Files naming the component exactly rank first, then names starting
+        with it, then names containing it anywhere; each result carries only
+        its matching classes and interfaces.
+        
+        Args:
+            repo_id: Repository ID
+            component_name: Name of the component to query
+            
+        Returns:
+            Aggregation pipeline stages
+        """
+        escaped_name = re.escape(component_name)
+        names = {
+            "$map": {
+                "input": {
+                    "$concatArrays": [
+                        {"$ifNull": ["$metadata.classes.name", []]},
+                        {"$ifNull": ["$metadata.interfaces.name", []]}
                     ]
                 },
-                limit=5
-            )
+                "as": "name",
+                "in": {"$toLower": "$$name"}
+            }
+        }
+        
+        def matching(field):
+            # Only the entries of field whose name contains component_name
+            return {
+                "$filter": {
+                    "input": {"$ifNull": [field, []]},
+                    "as": "entry",
+                    "cond": {
+                        "$regexMatch": {
+                            "input": {"$ifNull": ["$$entry.name", ""]},
+                            "regex": escaped_name,
+                            "options": "i"
+                        }
+                    }
+                }
+            }
+        
+        def any_name_matches(regex):
+            return {
+                "$anyElementTrue": [{
+                    "$map": {
+                        "input": names,
+                        "as": "name",
+                        "in": {"$regexMatch": {"input": "$$name", "regex": regex, "options": "i"}}
+                    }
+                }]
+            }
+        
+        name_match = [
+            {"metadata.classes.name": {"$regex": escaped_name, "$options": "i"}},
+            {"metadata.interfaces.name": {"$regex": escaped_name, "$options": "i"}}
+        ]
+        if len(component_name) >= _NAME_GRAM_SIZE:
+            # Candidates are the files holding every window of the name, found
+            # on the (repo_id, name_grams) index; files stored before name
+            # grams existed are still matched by regex
+            name_match = [
+                {"name_grams": {"$all": _name_grams([component_name])}},
+                {"name_grams": {"$exists": False}, "$or": name_match}
+            ]
+        
+        return [
+            {"$match": {
+                "repo_id": repo_id,
+                "$or": name_match
+            }},
+            {"$addFields": {
+                "_rank": {
+                    "$cond": [
+                        {"$in": [component_name.lower(), names]},
+                        0,
+                        {"$cond": [
+                            any_name_matches(f"^{escaped_name}"),
+                            1,
+                            {"$cond": [any_name_matches(escaped_name), 2, 3]}
+                        ]}
+                    ]
+                }
+            }},
+            # Drop gram candidates whose windows are not contiguous in a name
+            {"$match": {"_rank": {"$lt": 3}}},
+            {"$sort": {"_rank": 1}},
+            {"$limit": 5},
+            {"$project": {
+                "_id": 0,
+                "_rank": 1,
+                "path": 1,
+                "code_language": 1,
+                "metadata.namespace": 1,
+                "matched_classes": matching("$metadata.classes"),
+                "matched_interfaces": matching("$metadata.interfaces")
+            }}
+        ]
+    
+    def _component_result(
+        self,
+        repo_id: str,
+        component_name: str,
+        components: List[Dict[str, Any]]
+    ) -> Dict[str, Any]:
+        """Build the component query response from the aggregation results
+        
+        Args:
+            repo_id: Repository ID
+            component_name: Name of the component to query
+            components: Documents returned by the component pipeline
             
-            components.extend(partial_matches)
+        Returns:
+            Component information
+        """
+        # Keep only the best kind of match, as an exact match makes the
+        # partial ones irrelevant
+        if components:
+            best_rank = components[0]["_rank"]
+            components = [component for component in components if component["_rank"] == best_rank]
         
         if not components:
             return {
@@ -1001,33 +1551,26 @@ class KnowledgeGraphQueryHandler(HandlerInterface):
             language = component.get("code_language", "Unknown")
             namespace = component.get("metadata", {}).get("namespace", "Unknown")
             
-            # Look for the class in the component
-            classes = component.get("metadata", {}).get("classes", [])
-            for cls in classes:
-                if component_name.lower() in cls.get("name", "").lower():
-                    component_info.append({
-                        "name": cls.get("name"),
-                        "type": "class",
-                        "file_path": file_path,
-                        "code_language": language,
-                        "namespace": namespace,
-                        "inheritance": cls.get("inheritance", []),
-                        "methods": cls.get("methods", []),
-                        "properties": cls.get("properties", [])
-                    })
+            # Classes and interfaces whose names matched, filtered by the pipeline
+            component_info.extend({
+                "name": cls.get("name"),
+                "type": "class",
+                "file_path": file_path,
+                "code_language": language,
+                "namespace": namespace,
+                "inheritance": cls.get("inheritance", []),
+                "methods": cls.get("methods", []),
+                "properties": cls.get("properties", [])
+            } for cls in component.get("matched_classes", []))
             
-            # Look for the interface in the component
-            interfaces = component.get("metadata", {}).get("interfaces", [])
-            for interface in interfaces:
-                if component_name.lower() in interface.get("name", "").lower():
-                    component_info.append({
-                        "name": interface.get("name"),
-                        "type": "interface",
-                        "file_path": file_path,
-                        "code_language": language,
-                        "namespace": namespace,
-                        "inheritance": interface.get("inheritance", [])
-                    })
+            component_info.extend({
+                "name": interface.get("name"),
+                "type": "interface",
+                "file_path": file_path,
+                "code_language": language,
+                "namespace": namespace,
+                "inheritance": interface.get("inheritance", [])
+            } for interface in component.get("matched_interfaces", []))
         
         return {
             "status": "success",
@@ -1035,67 +1578,39 @@ class KnowledgeGraphQueryHandler(HandlerInterface):
             "matches": component_info
         }
     
-    async def _query_pattern(self, repo_id: str, pattern_name: str) -> Dict[str, Any]:
-        """Query knowledge graph for pattern information
+    def _pattern_result(self, repo_id: str, pattern_name: str, repo: Dict[str, Any]) -> Dict[str, Any]:
+        """Build the pattern query response from a repository document
         
         Args:
             repo_id: Repository ID
             pattern_name: Name of the pattern to query
+            repo: Repository document with its knowledge patterns
             
         Returns:
             Pattern information
         """
-        # Get repository info
-        repo = await self.mongodb_service.get_repository(repo_id)
-        
-        # Look for the pattern in the repository metadata
-        patterns_data = repo.get("metadata", {}).get("knowledge", {}).get("patterns", {})
-        
-        # Check different pattern types
-        design_patterns = patterns_data.get("design_patterns", [])
-        arch_patterns = patterns_data.get("architectural_patterns", [])
-        org_patterns = patterns_data.get("code_organization", [])
+        # Look for the pattern in the repository metadata: an exact name
+        # first, then the first name containing it, checking design,
+        # architectural and code organization patterns in that order
+        patterns_by_name, patterns_in_order = self._pattern_index(repo_id, repo)
+        lowered_name = pattern_name.lower()
+        match = patterns_by_name.get(lowered_name)
+        if match is None:
+            match = next(
+                ((pattern_type, pattern) for name, pattern_type, pattern in patterns_in_order if lowered_name in name),
+                None
+            )
         
-        # Search for the pattern
         pattern_info = None
-        
-        # Check design patterns
-        for pattern in design_patterns:
-            if pattern_name.lower() in pattern.get("name", "").lower():
-                pattern_info = {
-                    "name": pattern.get("name"),
-                    "type": "design_pattern",
-                    "confidence": pattern.get("confidence"),
-                    "sources": pattern.get("sources", []),
-                    "count": pattern.get("count", 1)
-                }
-                break
-        
-        # Check architectural patterns if not found
-        if not pattern_info:
-            for pattern in arch_patterns:
-                if pattern_name.lower() in pattern.get("name", "").lower():
-                    pattern_info = {
-                        "name": pattern.get("name"),
-                        "type": "architectural_pattern",
-                        "confidence": pattern.get("confidence"),
-                        "sources": pattern.get("sources", []),
-                        "count": pattern.get("count", 1)
-                    }
-                    break
-        
-        # Check code organization patterns if not found
-        if not pattern_info:
-            for pattern in org_patterns:
-                if pattern_name.lower() in pattern.get("name", "").lower():
-                    pattern_info = {
-                        "name": pattern.get("name"),
-                        "type": "code_organization",
-                        "confidence": pattern.get("confidence"),
-                        "sources": pattern.get("sources", []),
-                        "count": pattern.get("count", 1)
-                    }
-                    break
+        if match is not None:
+            pattern_type, pattern = match
+            pattern_info = {
+                "name": pattern.get("name"),
+                "type": pattern_type,
+                "confidence": pattern.get("confidence"),
+                "sources": pattern.get("sources", []),
+                "count": pattern.get("count", 1)
+            }
         
         if not pattern_info:
             return {
@@ -1109,35 +1624,70 @@ class KnowledgeGraphQueryHandler(HandlerInterface):
             "pattern_info": pattern_info
         }
     
-    async def _query_general(self, repo_id: str) -> Dict[str, Any]:
+    def _pattern_index(self, repo_id: str, repo: Dict[str, Any]) -> _PatternIndex:
+        """Get the pattern index of a repository document
+        
+        Indexes are cached per repository version (its updated_at), so a
+        re-analyzed repository is indexed afresh; documents without
+        updated_at are indexed on every call.
+        
+        Args:
+            repo_id: Repository ID
+            repo: Repository document with its knowledge patterns
+            
+        Returns:
+            Patterns by lower-cased name, and (lower-cased name, type, pattern)
+            in search order
+        """
+        patterns_data = repo.get("metadata", {}).get("knowledge", {}).get("patterns", {})
+        version = repo.get("updated_at")
+        if version is None:
+            return _index_patterns(patterns_data)
+        
+        key = (repo_id, version)
+        index = self._pattern_indexes.get(key)
+        if index is None:
+            if len(self._pattern_indexes) >= 256:
+                # Drop the oldest index
+                del self._pattern_indexes[next(iter(self._pattern_indexes))]
+            index = self._pattern_indexes[key] = _index_patterns(patterns_data)
+        return index
+    
+    async def _query_general(self, repo_id: str, repo: Dict[str, Any]) -> Dict[str, Any]:
         """Query knowledge graph for general repository information
         
         Args:
             repo_id: Repository ID
+            repo: Repository document, as fetched by handle()
             
         Returns:
             Repository information
         """
-        # Get repository info
-        repo = await self.mongodb_service.get_repository(repo_id)
-        
-        # Get code file count
+        # Get code file count, counted on the repo_id index
         file_count = await self.mongodb_service.count(
             collection="code_files",
-            query={"repo_id": repo_id}
+            query={"repo_id": repo_id},
+            hint=[("repo_id", 1)]
         )
         
-        # Get knowledge information
-        knowledge = repo.get("metadata", {}).get("knowledge", {})
-        
-        # Get patterns
-        patterns = knowledge.get("patterns", {})
-        design_patterns = patterns.get("design_patterns", [])
-        arch_patterns = patterns.get("architectural_patterns", [])
-        org_patterns = patterns.get("code_organization", [])
+        return self._general_result(repo_id, repo, file_count)
+    
+    def _general_result(self, repo_id: str, repo: Dict[str, Any], file_count: int) -> Dict[str, Any]:
+        """Build the general query response from a repository document
         
-        # Get environment
-        environment = knowledge.get("environment", {})
+        Args:
+            repo_id: Repository ID
+            repo: Repository document with its knowledge
+            file_count: Number of code files in the repository
+            
+        Returns:
+            Repository information
+        """
+        # Bind each level once; `or {}` only builds a default when one is missing
+        metadata = repo.get("metadata") or {}
+        knowledge = metadata.get("knowledge") or {}
+        patterns = knowledge.get("patterns") or {}
+        environment = knowledge.get("environment") or {}
         
         return {
             "status": "success",
@@ -1145,13 +1695,13 @@ class KnowledgeGraphQueryHandler(HandlerInterface):
             "repo_name": repo.get("name"),
             "file_count": file_count,
             "patterns": {
-                "design_patterns": [p.get("name") for p in design_patterns],
-                "architectural_patterns": [p.get("name") for p in arch_patterns],
-                "code_organization": [p.get("name") for p in org_patterns]
+                "design_patterns": list(map(_get_name, patterns.get("design_patterns", ()))),
+                "architectural_patterns": list(map(_get_name, patterns.get("architectural_patterns", ()))),
+                "code_organization": list(map(_get_name, patterns.get("code_organization", ())))
             },
             "environment": {
-                "package_managers": environment.get("package_managers", []),
-                "build_systems": environment.get("build_systems", []),
-                "frameworks": environment.get("frameworks", [])
+                "package_managers": environment.get("package_managers") or [],
+                "build_systems": environment.get("build_systems") or [],
+                "frameworks": environment.get("frameworks") or []
             }
         }
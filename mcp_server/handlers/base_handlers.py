@@ -7,7 +7,7 @@ This module provides implementations of standard MCP method handlers.
 import json
 import ast
 import operator as op
-from typing import Any, Dict, List, Optional
+from typing import Any, Callable, Dict, List, Optional, Union
 
 from mcp_server.core.server import HandlerInterface
 from mcp_server.services import AIServiceRegistry, AIServiceInterface
@@ -44,29 +44,33 @@ class InitializeHandler(HandlerInterface):
 class ToolsListHandler(HandlerInterface):
     """Handler for the tools/list method"""
     
-    def __init__(self, tools: Dict[str, Dict[str, Any]]):
-        """Initialize with tools registry"""
+    def __init__(self, tools: Union[Dict[str, Dict[str, Any]], Callable[[], Dict[str, Any]]]):
+        """Initialize with tools registry or a callable returning the cached result"""
         self.tools = tools
+        if callable(tools):
+            self._result = tools
+        else:
+            self._result = lambda: {"tools": list(tools.values())}
     
     async def handle(self, params: Dict[str, Any]) -> Dict[str, Any]:
         """Handle tools/list request"""
-        return {
-            "tools": list(self.tools.values())
-        }
+        return self._result()
 
 
 class ResourcesListHandler(HandlerInterface):
     """Handler for the resources/list method"""
     
-    def __init__(self, resources: Dict[str, Dict[str, Any]]):
-        """Initialize with resources registry"""
+    def __init__(self, resources: Union[Dict[str, Dict[str, Any]], Callable[[], Dict[str, Any]]]):
+        """Initialize with resources registry or a callable returning the cached result"""
         self.resources = resources
+        if callable(resources):
+            self._result = resources
+        else:
+            self._result = lambda: {"resources": list(resources.values())}
     
     async def handle(self, params: Dict[str, Any]) -> Dict[str, Any]:
         """Handle resources/list request"""
-        return {
-            "resources": list(self.resources.values())
-        }
+        return self._result()
 
 
 class ResourcesReadHandler(HandlerInterface):
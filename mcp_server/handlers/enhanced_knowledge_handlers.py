@@ -6,21 +6,26 @@ including deep code content extraction, function call graphs, pattern extraction
 and environment analysis.
 """
 
+from __future__ import annotations
+
 import os
+import re
 import json
 import logging
 import asyncio
-from typing import Dict, List, Any, Optional
+from typing import Dict, List, Any, Optional, TYPE_CHECKING
 
 from mcp_server.core.server import HandlerInterface
-from mcp_server.services.embedding_service import EmbeddingService
-from mcp_server.services.vector_store.qdrant_service import QdrantVectorService
-from mcp_server.services.mongodb_service import MongoDBService
 from mcp_server.services.knowledge_extraction.code_extractor import CodeExtractor
 from mcp_server.services.knowledge_extraction.call_graph_analyzer import CallGraphAnalyzer
 from mcp_server.services.knowledge_extraction.pattern_extractor import PatternExtractor
 from mcp_server.services.knowledge_extraction.environment_analyzer import EnvironmentAnalyzer
 
+if TYPE_CHECKING:
+    from mcp_server.services.embedding_service import EmbeddingService
+    from mcp_server.services.vector_store.qdrant_service import QdrantVectorService
+    from mcp_server.services.mongodb_service import MongoDBService
+
 
 class EnhancedRepositoryAnalysisHandler(HandlerInterface):
     """Handler for enhanced repository analysis providing deeper code understanding"""
@@ -100,17 +105,21 @@ class EnhancedRepositoryAnalysisHandler(HandlerInterface):
         file_infos = []
         file_count = 0
         
+        # Match every exclude pattern in one regex scan per path
+        exclude_re = re.compile("|".join(map(re.escape, exclude_patterns))) if exclude_patterns else None
+        
         # Walk through repository and analyze files
         for root, dirs, files in os.walk(repo_path):
             # Skip excluded directories
-            dirs[:] = [d for d in dirs if not any(pat in os.path.join(root, d) for pat in exclude_patterns)]
+            if exclude_re is not None:
+                dirs[:] = [d for d in dirs if not exclude_re.search(os.path.join(root, d))]
             
             for file in files:
                 file_path = os.path.join(root, file)
                 rel_path = os.path.relpath(file_path, repo_path)
                 
                 # Skip excluded files
-                if any(pat in file_path for pat in exclude_patterns):
+                if exclude_re is not None and exclude_re.search(file_path):
                     continue
                 
                 # Skip very large files and binary files
@@ -4,18 +4,22 @@ Knowledge extraction handlers for MCP Server
 This module provides handlers for repository analysis and knowledge extraction.
 """
 
+from __future__ import annotations
+
 import os
 import json
 import logging
 import asyncio
-from typing import Dict, List, Any, Optional
+from typing import Dict, List, Any, Optional, TYPE_CHECKING
 
 from mcp_server.core.server import HandlerInterface
-from mcp_server.services.scanners.csharp_scanner import CSharpScannerService
-from mcp_server.services.scanners.angular_scanner import AngularScannerService
-from mcp_server.services.embedding_service import EmbeddingService
-from mcp_server.services.vector_store.qdrant_service import QdrantVectorService
-from mcp_server.services.mongodb_service import MongoDBService
+
+if TYPE_CHECKING:
+    from mcp_server.services.scanners.csharp_scanner import CSharpScannerService
+    from mcp_server.services.scanners.angular_scanner import AngularScannerService
+    from mcp_server.services.embedding_service import EmbeddingService
+    from mcp_server.services.vector_store.qdrant_service import QdrantVectorService
+    from mcp_server.services.mongodb_service import MongoDBService
 
 
 class RepositoryAnalysisHandler(HandlerInterface):
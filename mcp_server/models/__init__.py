@@ -5,6 +5,8 @@ from .json_rpc import (
     MCPResponse,
     JSONRPCErrorCode,
     StreamChunk,
+    dumps,
+    loads,
 )
 
 __all__ = [
@@ -12,5 +14,7 @@ __all__ = [
     "MCPResponse",
     "JSONRPCErrorCode",
     "StreamChunk",
+    "dumps",
+    "loads",
 ]
 
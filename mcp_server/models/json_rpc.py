@@ -4,9 +4,36 @@ JSON-RPC Models for MCP Server
 This module defines the data structures for JSON-RPC communication.
 """
 
+import json
+import sys
 from dataclasses import dataclass, asdict, field
 from typing import Any, Dict, List, Optional, Union
 
+# orjson is optional; it serializes responses several times faster than json
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+def dumps(data: Any) -> bytes:
+    """Serialize a JSON-RPC message to UTF-8 JSON bytes"""
+    if orjson is not None:
+        try:
+            return orjson.dumps(data, option=orjson.OPT_NON_STR_KEYS)
+        except TypeError:
+            # Values orjson rejects (e.g. integers beyond 64 bits) still
+            # serialize with the standard library
+            pass
+    return json.dumps(data).encode('utf-8')
+
+
+def loads(data: Union[bytes, str]) -> Any:
+    """Parse a JSON-RPC message; raises json.JSONDecodeError on invalid input"""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
 
 class JSONRPCErrorCode:
     """Standard JSON-RPC 2.0 error codes"""
@@ -31,10 +58,15 @@ class MCPRequest:
     @classmethod
     def from_dict(cls, data: Dict[str, Any]) -> "MCPRequest":
         """Create a request object from a dictionary"""
+        method = data.get("method", "")
+        if type(method) is str:
+            # Handler keys are interned, so an interned method name lets the
+            # dispatch lookup succeed on identity without comparing strings
+            method = sys.intern(method)
         return cls(
             jsonrpc=data.get("jsonrpc", "2.0"),
             id=data.get("id"),
-            method=data.get("method", ""),
+            method=method,
             params=data.get("params")
         )
 
@@ -49,8 +81,15 @@ class MCPResponse:
     
     def to_dict(self) -> Dict[str, Any]:
         """Convert response to a dictionary, removing None values"""
-        response_dict = asdict(self)
-        return {k: v for k, v in response_dict.items() if v is not None}
+        # Built field by field rather than with asdict(), which deep-copies
+        # the whole result payload only for it to be serialized and dropped
+        fields = (
+            ("jsonrpc", self.jsonrpc),
+            ("id", self.id),
+            ("result", self.result),
+            ("error", self.error),
+        )
+        return {k: v for k, v in fields if v is not None}
     
     @classmethod
     def error_response(cls, error_code: int, message: str, 
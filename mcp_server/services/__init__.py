@@ -4,7 +4,8 @@ AI Services package
 This module provides a registry of AI services that can be used by the MCP server.
 """
 
-from typing import Dict, Optional, Type
+from types import MappingProxyType
+from typing import Dict, Mapping, Optional, Type
 import logging
 
 from mcp_server.services.claude_service import AIServiceInterface, ClaudeService, MockClaudeService
@@ -20,11 +21,13 @@ class AIServiceRegistry:
         """Initialize an empty registry"""
         self.services: Dict[str, AIServiceInterface] = {}
         self.default_service: Optional[str] = None
+        self._service_types: Optional[Mapping[str, str]] = None
     
     def register_service(self, service_name: str, service: AIServiceInterface, 
                         make_default: bool = False):
         """Register a service with the registry"""
         self.services[service_name] = service
+        self._service_types = None
         logger.info(f"Registered AI service: {service_name}")
         
         if make_default or self.default_service is None:
@@ -47,9 +50,18 @@ class AIServiceRegistry:
         
         return service
     
-    def list_services(self) -> Dict[str, str]:
-        """List available services and their types"""
-        return {name: service.__class__.__name__ for name, service in self.services.items()}
+    def list_services(self) -> Mapping[str, str]:
+        """List available services and their types
+        
+        The read-only mapping is built once and reused until another
+        service is registered.
+        """
+        service_types = self._service_types
+        if service_types is None:
+            service_types = self._service_types = MappingProxyType(
+                {name: service.__class__.__name__ for name, service in self.services.items()}
+            )
+        return service_types
 
 
 def create_ai_services_from_config(config):
@@ -87,12 +87,6 @@ class EmbeddingService:
         # Always set Ollama as the default provider
         self.provider = "ollama"
         
-        # Check if Ollama is available and log appropriate message
-        if self._is_ollama_available():
-            self.logger.info(f"Using Ollama for embeddings with model {self.ollama_model}")
-        else:
-            self.logger.warning(f"Ollama not available at {self.ollama_url}, but keeping as provider. Will try to use it during execution or fall back to mock embeddings.")
-            
         # Only override the provider if explicitly specified
         if model.startswith("text-embedding-3") and self.azure_api_url and self.azure_api_key and os.environ.get("USE_AZURE_EMBEDDINGS") == "true":
             self.provider = "azure"
@@ -104,6 +98,14 @@ class EmbeddingService:
             self.provider = "anthropic"
             self.logger.info(f"Using Anthropic for embeddings with model {model}")
             self.logger.info("No valid embedding provider found, using mock embeddings")
+        
+        # Probe Ollama only when it stays the provider; a keyed provider never
+        # talks to it, so the blocking request would be wasted startup time
+        if self.provider == "ollama":
+            if self._is_ollama_available():
+                self.logger.info(f"Using Ollama for embeddings with model {self.ollama_model}")
+            else:
+                self.logger.warning(f"Ollama not available at {self.ollama_url}, but keeping as provider. Will try to use it during execution or fall back to mock embeddings.")
             
         self.logger.info(f"Initialized embedding service with {self.provider} provider and model {model}")
     
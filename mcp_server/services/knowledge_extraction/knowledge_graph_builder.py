@@ -301,6 +301,9 @@ The following components are central to the system architecture:
             }
         )
         
+        # Store patterns individually for indexed lookups by name
+        await self.mongodb_service.store_patterns(repo_id, knowledge.get("patterns", {}))
+        
         # Store code structure
         for file_info in knowledge.get("files", []):
             file_path = file_info.get("file_path")
@@ -395,11 +398,10 @@ Interfaces:
         if not classes:
             return "No classes found."
         
-        result = ""
-        for cls in classes:
-            result += f"- {cls.get('name')}: {len(cls.get('methods', []))} methods, {len(cls.get('properties', []))} properties\n"
-        
-        return result
+        return "".join(
+            f"- {cls.get('name')}: {len(cls.get('methods', []))} methods, {len(cls.get('properties', []))} properties\n"
+            for cls in classes
+        )
     
     def _format_interfaces_for_embedding(self, interfaces: List[Dict[str, Any]]) -> str:
         """Format interfaces for embedding
@@ -413,8 +415,4 @@ Interfaces:
         if not interfaces:
             return "No interfaces found."
         
-        result = ""
-        for interface in interfaces:
-            result += f"- {interface.get('name')}\n"
-        
-        return result
+        return "".join(f"- {interface.get('name')}\n" for interface in interfaces)
@@ -7,11 +7,31 @@ It creates Markdown files for AI-assisted development and documentation.
 
 import os
 import logging
-import json
 import asyncio
-from typing import Dict, List, Any, Optional, Set, Tuple
+from typing import Dict, Iterator, List, Any, Optional, Set, Tuple
 from pathlib import Path
 
+from mcp_server.models.json_rpc import loads
+
+
+def iter_extracted_files(knowledge: Dict[str, Any]) -> Iterator[Dict[str, Any]]:
+    """Iterate over the per-file results in extracted knowledge
+    
+    Results come from knowledge["files"] when it is present; otherwise they
+    are streamed one at a time from the JSON Lines file named by
+    knowledge["files_path"], so large analyses need not keep them in memory.
+    """
+    files = knowledge.get("files")
+    if files is not None:
+        yield from files
+        return
+    
+    files_path = knowledge.get("files_path")
+    if files_path and os.path.exists(files_path):
+        with open(files_path, "rb") as f:
+            for line in f:
+                yield loads(line)
+
 class MarkdownBuilder:
     """Builds Markdown documentation from extracted code knowledge"""
     
@@ -150,22 +170,22 @@ The codebase is organized into the following main components:
 
 """
         
-        # Add information about extracted files
-        files = knowledge.get("files", [])
-        if files:
-            # Collect namespaces
-            namespaces = {}
-            for file in files:
-                namespace = file.get("namespace", "Unknown")
-                if namespace not in namespaces:
-                    namespaces[namespace] = []
-                
-                namespaces[namespace].append({
-                    "file_path": file.get("file_path", ""),
-                    "classes": file.get("classes", []),
-                    "interfaces": file.get("interfaces", [])
-                })
+        # Collect namespaces from the extracted files, keeping only what the
+        # structure pages need so streamed results are not held in full
+        namespaces = {}
+        for file in iter_extracted_files(knowledge):
+            namespace = file.get("namespace", "Unknown")
+            if namespace not in namespaces:
+                namespaces[namespace] = []
             
+            namespaces[namespace].append({
+                "file_path": file.get("file_path", ""),
+                "classes": file.get("classes", []),
+                "interfaces": file.get("interfaces", [])
+            })
+        
+        # Add information about extracted files
+        if namespaces:
             # Add namespaces to documentation
             structure_readme += "### Namespaces\n\n"
             for namespace, ns_files in namespaces.items():
@@ -0,0 +1,62 @@
+"""
+Lazy service construction for MCP Server
+
+This module provides a proxy that defers building a service until it is first
+used, so sessions that never touch a subsystem never pay for its setup.
+"""
+
+import threading
+from typing import Any, Callable
+
+
+class LazyService:
+    """Proxy that builds the wrapped service on first attribute access
+
+    Handlers can hold a LazyService exactly like the service itself; the
+    factory runs once, under a lock, the first time an attribute is read.
+    Attributes assigned before then (e.g. a handler configuring the service
+    in its constructor) are recorded and applied right after construction.
+    """
+
+    __slots__ = ("_factory", "_instance", "_lock", "_pending")
+
+    def __init__(self, factory: Callable[[], Any]):
+        """Initialize with a zero-argument factory returning the service"""
+        object.__setattr__(self, "_factory", factory)
+        object.__setattr__(self, "_instance", None)
+        object.__setattr__(self, "_lock", threading.Lock())
+        object.__setattr__(self, "_pending", {})
+
+    @property
+    def resolved(self) -> bool:
+        """Whether the wrapped service has been built yet"""
+        return self._instance is not None
+
+    def resolve(self) -> Any:
+        """Build the wrapped service if needed and return it"""
+        instance = self._instance
+        if instance is None:
+            with self._lock:
+                instance = self._instance
+                if instance is None:
+                    instance = self._factory()
+                    for name, value in self._pending.items():
+                        setattr(instance, name, value)
+                    self._pending.clear()
+                    object.__setattr__(self, "_instance", instance)
+        return instance
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self.resolve(), name)
+
+    def __setattr__(self, name: str, value: Any) -> None:
+        with self._lock:
+            if self._instance is None:
+                self._pending[name] = value
+                return
+        setattr(self._instance, name, value)
+
+    def __repr__(self) -> str:
+        if self._instance is None:
+            return f"<LazyService (unresolved) {self._factory!r}>"
+        return f"<LazyService {self._instance!r}>"
@@ -6,6 +6,7 @@ for storing code metadata and relationships.
 """
 
 import logging
+import re
 import uuid
 import datetime
 from typing import Dict, List, Optional, Any, Union
@@ -16,6 +17,18 @@ from pymongo import IndexModel, ASCENDING, TEXT
 class MongoDBService:
     """Service for document storage and retrieval using MongoDB"""
     
+    # Case-insensitive collation for exact class and interface name lookups;
+    # queries must pass the same collation to use the name indexes
+    NAME_COLLATION = {"locale": "en", "strength": 2}
+    
+    # Pattern lists of a repository's knowledge with the type each reports,
+    # in the order pattern lookups search them
+    PATTERN_TYPES = (
+        ("design_patterns", "design_pattern"),
+        ("architectural_patterns", "architectural_pattern"),
+        ("code_organization", "code_organization")
+    )
+    
     def __init__(
         self,
         uri: str = "mongodb://localhost:27017",
@@ -41,11 +54,22 @@ class MongoDBService:
         self.components = self.db["components"]
         self.relationships = self.db["relationships"]
         self.chunks = self.db["chunks"]
+        self.patterns = self.db["repo_patterns"]
+        
+        # Set once the indexes exist; handlers initialize on every request
+        self.initialized = False
         
         self.logger.info(f"Initialized MongoDB client with database '{db_name}'")
     
     async def initialize(self):
-        """Initialize the database (create indexes)"""
+        """Initialize the database (create indexes)
+        
+        Only the first successful call creates the indexes; later calls
+        return True straight away.
+        """
+        if self.initialized:
+            return True
+        
         try:
             # Create indexes for repositories
             await self.repos.create_index("repo_id", unique=True)
@@ -56,6 +80,17 @@ class MongoDBService:
             await self.code_files.create_index("repo_id")
             await self.code_files.create_index("path")
             await self.code_files.create_index("code_language")
+            await self.code_files.create_index(
+                [("repo_id", ASCENDING), ("metadata.classes.name", ASCENDING)],
+                collation=self.NAME_COLLATION
+            )
+            await self.code_files.create_index(
+                [("repo_id", ASCENDING), ("metadata.interfaces.name", ASCENDING)],
+                collation=self.NAME_COLLATION
+            )
+            # Name grams are stored lower-cased, so their index needs no
+            # collation and serves plain queries and $lookup sub-pipelines
+            await self.code_files.create_index([("repo_id", ASCENDING), ("name_grams", ASCENDING)])
             
             # Create indexes for classes (C#)
             await self.classes.create_index("class_id", unique=True)
@@ -81,6 +116,11 @@ class MongoDBService:
             await self.chunks.create_index("repo_id")
             await self.chunks.create_index("vector_id")  # Link to Qdrant vector ID
             
+            # Create indexes for patterns, serving name lookups in search order
+            await self.patterns.create_index(
+                [("repo_id", ASCENDING), ("name_lc", ASCENDING), ("order", ASCENDING)]
+            )
+            
             # Create a text index for code content search - if it fails, that's okay
             try:
                 await self.code_files.create_index(
@@ -92,6 +132,7 @@ class MongoDBService:
                 self.logger.warning(f"Could not create text index, may already exist: {str(text_index_err)}")
             
             self.logger.info("MongoDB indexes created successfully")
+            self.initialized = True
             return True
             
         except Exception as e:
@@ -128,6 +169,7 @@ class MongoDBService:
             "name": name,
             "path": path,
             "created_at": datetime.datetime.utcnow(),
+            "updated_at": datetime.datetime.utcnow(),
         }
         
         # Add metadata if provided
@@ -143,6 +185,22 @@ class MongoDBService:
         
         return repo_id
     
+    async def get_repository(
+        self,
+        repo_id: str,
+        projection: Optional[Dict[str, Any]] = None
+    ) -> Optional[Dict[str, Any]]:
+        """Get a repository by ID
+        
+        Args:
+            repo_id: Repository ID
+            projection: Optional fields to return instead of the whole document
+            
+        Returns:
+            Repository document or None if not found
+        """
+        return await self.repos.find_one({"repo_id": repo_id}, projection)
+    
     # Code file operations
     
     async def store_code_file(
@@ -394,6 +452,40 @@ class MongoDBService:
         
         return chunk_id
     
+    async def store_patterns(self, repo_id: str, patterns: Dict[str, List[Dict[str, Any]]]) -> int:
+        """Replace the patterns stored for a repository
+        
+        Each pattern becomes one repo_patterns document carrying its type,
+        lower-cased name and position in PATTERN_TYPES order, so a lookup
+        by name is a single index seek.
+        
+        Args:
+            repo_id: Repository ID
+            patterns: Pattern lists by PATTERN_TYPES key, as extracted
+            
+        Returns:
+            Number of patterns stored
+        """
+        pattern_docs = []
+        for key, pattern_type in self.PATTERN_TYPES:
+            for pattern in patterns.get(key, []):
+                pattern_docs.append({
+                    "repo_id": repo_id,
+                    "type": pattern_type,
+                    "name": pattern.get("name"),
+                    "name_lc": pattern.get("name", "").lower(),
+                    "confidence": pattern.get("confidence"),
+                    "sources": pattern.get("sources", []),
+                    "count": pattern.get("count", 1),
+                    "order": len(pattern_docs)
+                })
+        
+        await self.patterns.delete_many({"repo_id": repo_id})
+        if pattern_docs:
+            await self.patterns.insert_many(pattern_docs)
+        
+        return len(pattern_docs)
+    
     # Query operations
     
     async def get_class_by_id(self, class_id: str) -> Optional[Dict[str, Any]]:
@@ -418,6 +510,33 @@ class MongoDBService:
         """
         return await self.components.find_one({"component_id": component_id})
     
+    async def find_pattern(self, repo_id: str, name: str) -> Optional[Dict[str, Any]]:
+        """Find a repository pattern by name
+        
+        An exact (case-insensitive) name wins; otherwise the first pattern,
+        in PATTERN_TYPES order, whose name contains the given one.
+        
+        Args:
+            repo_id: Repository ID
+            name: Pattern name to look up
+            
+        Returns:
+            Pattern document (name, type, confidence, sources, count) or None
+            if not found
+        """
+        projection = {"_id": 0, "name": 1, "type": 1, "confidence": 1, "sources": 1, "count": 1}
+        sort = [("order", ASCENDING)]
+        name_lc = name.lower()
+        
+        pattern = await self.patterns.find_one(
+            {"repo_id": repo_id, "name_lc": name_lc}, projection, sort=sort
+        )
+        if pattern is None:
+            pattern = await self.patterns.find_one(
+                {"repo_id": repo_id, "name_lc": {"$regex": re.escape(name_lc)}}, projection, sort=sort
+            )
+        return pattern
+    
     async def get_related_entities(
         self,
         entity_id: str,
@@ -507,3 +626,83 @@ class MongoDBService:
         ).sort([("score", {"$meta": "textScore"})]).limit(limit)
         
         return await cursor.to_list(length=limit)
+    
+    async def find_one(
+        self,
+        collection: str,
+        query: Dict[str, Any],
+        collation: Optional[Dict[str, Any]] = None
+    ) -> Optional[Dict[str, Any]]:
+        """Find a single document in a collection
+        
+        Args:
+            collection: Collection name
+            query: Query filter
+            collation: Optional collation for string comparisons
+            
+        Returns:
+            Matching document or None if not found
+        """
+        return await self.db[collection].find_one(query, collation=collation)
+    
+    async def count(
+        self,
+        collection: str,
+        query: Dict[str, Any],
+        hint: Optional[Union[str, List[Any]]] = None
+    ) -> int:
+        """Count the documents in a collection matching a query
+        
+        Args:
+            collection: Collection name
+            query: Query filter
+            hint: Optional index to count with, by name or key pattern
+            
+        Returns:
+            Number of matching documents
+        """
+        if hint is None:
+            return await self.db[collection].count_documents(query)
+        return await self.db[collection].count_documents(query, hint=hint)
+    
+    async def find(
+        self,
+        collection: str,
+        query: Dict[str, Any],
+        limit: int = 0,
+        collation: Optional[Dict[str, Any]] = None,
+        projection: Optional[Dict[str, Any]] = None
+    ) -> List[Dict[str, Any]]:
+        """Find documents in a collection
+        
+        Args:
+            collection: Collection name
+            query: Query filter
+            limit: Maximum number of results (0 for no limit)
+            collation: Optional collation for string comparisons
+            projection: Optional fields to return
+            
+        Returns:
+            List of matching documents
+        """
+        cursor = self.db[collection].find(query, projection, limit=limit, collation=collation)
+        return await cursor.to_list(length=limit or None)
+    
+    async def aggregate(
+        self,
+        collection: str,
+        pipeline: List[Dict[str, Any]],
+        collation: Optional[Dict[str, Any]] = None
+    ) -> List[Dict[str, Any]]:
+        """Run an aggregation pipeline on a collection
+        
+        Args:
+            collection: Collection name
+            pipeline: Aggregation pipeline stages
+            collation: Optional collation for string comparisons
+            
+        Returns:
+            List of result documents
+        """
+        cursor = self.db[collection].aggregate(pipeline, collation=collation)
+        return await cursor.to_list(length=None)
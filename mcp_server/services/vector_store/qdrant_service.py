@@ -25,6 +25,7 @@ class QdrantVectorService:
         vector_size: int = 768,  # Default for OpenAI embeddings
         distance: str = "Cosine",
         embedding_provider: str = "ollama",  # Added provider parameter
+        quantize: bool = True,
     ):
         """Initialize the Qdrant vector service
         
@@ -35,9 +36,14 @@ class QdrantVectorService:
             vector_size: Size of the embedding vectors
             distance: Distance metric to use ("Cosine", "Euclid", or "Dot")
             embedding_provider: Provider of embeddings (openai, ollama, etc.)
+            quantize: Keep int8 copies of the vectors in RAM for search, with
+                the full-precision originals on disk for rescoring
         """
         self.logger = logging.getLogger("mcp_server.services.qdrant")
+        self.url = url
+        self.api_key = api_key
         self.collection_name = collection_name
+        self.quantize = quantize
         
         # Set vector size based on embedding provider
         # Different providers have different dimensions
@@ -77,13 +83,32 @@ class QdrantVectorService:
                 self.logger.info(f"Creating collection '{self.collection_name}'")
                 
                 # Create the collection with vector configuration
-                self.client.create_collection(
-                    collection_name=self.collection_name,
-                    vectors_config=VectorParams(
-                        size=self.vector_size,
-                        distance=self.distance
+                if self.quantize:
+                    # Search runs on int8 copies held in RAM; the float32
+                    # originals stay on disk and are only read for rescoring
+                    self.client.create_collection(
+                        collection_name=self.collection_name,
+                        vectors_config=VectorParams(
+                            size=self.vector_size,
+                            distance=self.distance,
+                            on_disk=True
+                        ),
+                        quantization_config=models.ScalarQuantization(
+                            scalar=models.ScalarQuantizationConfig(
+                                type=models.ScalarType.INT8,
+                                quantile=0.99,
+                                always_ram=True
+                            )
+                        )
+                    )
+                else:
+                    self.client.create_collection(
+                        collection_name=self.collection_name,
+                        vectors_config=VectorParams(
+                            size=self.vector_size,
+                            distance=self.distance
+                        )
                     )
-                )
                 
                 # Create payload index for efficient filtering
                 self._create_payload_indices()
@@ -95,6 +120,26 @@ class QdrantVectorService:
             self.logger.error(f"Failed to initialize Qdrant: {str(e)}")
             return False
     
+    async def pause_indexing(self) -> None:
+        """Stop building the HNSW index while a bulk upload runs
+        
+        Points uploaded meanwhile are still stored and searchable; call
+        resume_indexing once the upload is done to index them in one pass.
+        """
+        self.client.update_collection(
+            collection_name=self.collection_name,
+            optimizers_config=models.OptimizersConfigDiff(indexing_threshold=0),
+            hnsw_config=models.HnswConfigDiff(m=0)
+        )
+    
+    async def resume_indexing(self) -> None:
+        """Restore HNSW indexing after a bulk upload"""
+        self.client.update_collection(
+            collection_name=self.collection_name,
+            optimizers_config=models.OptimizersConfigDiff(indexing_threshold=20000),
+            hnsw_config=models.HnswConfigDiff(m=16)
+        )
+    
     def _create_payload_indices(self):
         """Create payload indices for efficient querying"""
         # Create index for code file path
@@ -236,11 +281,20 @@ class QdrantVectorService:
         if filter_params:
             filter_condition = self._build_filter(filter_params)
         
+        # Rescore quantized candidates against the original vectors, drawing
+        # twice as many candidates to keep recall close to unquantized search
+        search_params = None
+        if self.quantize:
+            search_params = models.SearchParams(
+                quantization=models.QuantizationSearchParams(rescore=True, oversampling=2.0)
+            )
+        
         # Search for similar vectors
         search_result = self.client.search(
             collection_name=self.collection_name,
             query_vector=query_embedding,
             query_filter=filter_condition,
+            search_params=search_params,
             limit=limit
         )
         
@@ -1,11 +1,12 @@
 """Transport implementations for MCP Server."""
 
-from .base import Transport, StdioTransport, TCPTransport
+from .base import Transport, StdioTransport, TCPTransport, UnixSocketTransport
 from .websocket import WebSocketTransport
 
 __all__ = [
     "Transport",
     "StdioTransport",
     "TCPTransport",
+    "UnixSocketTransport",
     "WebSocketTransport",
 ]
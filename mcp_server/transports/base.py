@@ -6,14 +6,19 @@ This module defines the abstract interfaces for different transport mechanisms
 """
 
 import asyncio
+import errno
 import json
+import os
+import socket
+import stat
+import struct
 import sys
 import logging
 from abc import ABC, abstractmethod
 from typing import Any, Dict, Optional, Union, List
 
 from mcp_server.core.server import MCPServer
-from mcp_server.models.json_rpc import JSONRPCErrorCode, MCPResponse
+from mcp_server.models.json_rpc import JSONRPCErrorCode, MCPResponse, dumps, loads
 
 
 class Transport(ABC):
@@ -58,7 +63,7 @@ class StdioTransport(Transport):
                 
                 # Parse JSON-RPC request
                 try:
-                    data = json.loads(line)
+                    data = loads(line)
                 except json.JSONDecodeError:
                     # Send error response for parse error
                     error_response = MCPResponse.error_response(
@@ -66,8 +71,7 @@ class StdioTransport(Transport):
                         "Parse error: invalid JSON",
                         None
                     )
-                    print(json.dumps(error_response.to_dict()))
-                    sys.stdout.flush()
+                    self._write(dumps(error_response.to_dict()))
                     continue
                 
                 # Process the message
@@ -75,13 +79,25 @@ class StdioTransport(Transport):
                 
                 # Send response if any
                 if response is not None:
-                    print(json.dumps(response))
-                    sys.stdout.flush()
+                    self._write(dumps(response))
         
         except KeyboardInterrupt:
             self.logger.info("Received keyboard interrupt, shutting down")
         except Exception as e:
-            self.logger.exception(f"Error in stdio transport: {e}")
+            self.logger.exception("Error in stdio transport: %s", e)
+    
+    @staticmethod
+    def _write(payload: bytes):
+        """Write one serialized message line to stdout"""
+        stream = getattr(sys.stdout, 'buffer', None)
+        if stream is None:
+            # Text-only replacement stream (e.g. captured output)
+            sys.stdout.write(payload.decode('utf-8') + '\n')
+            sys.stdout.flush()
+            return
+        sys.stdout.flush()
+        stream.write(payload + b'\n')
+        stream.flush()
     
     async def stop(self):
         """Stop the stdio transport"""
@@ -99,24 +115,58 @@ class TCPTransport(Transport):
         self.port = port
         self.server_instance = None
     
+    @staticmethod
+    async def _read_message(reader) -> Optional[tuple]:
+        """Read one framed message from a client
+        
+        Messages are normally newline-delimited. A message starting with a
+        zero byte instead carries a 4-byte big-endian length prefix; JSON text
+        never starts with NUL, so clients can use either framing on the same
+        connection.
+        
+        Returns a (payload, length_prefixed) tuple, or None at end of stream.
+        """
+        try:
+            first = await reader.readexactly(1)
+        except asyncio.IncompleteReadError:
+            return None
+        
+        if first == b'\n':
+            return first, False
+        
+        if first == b'\0':
+            header = first + await reader.readexactly(3)
+            length = struct.unpack('>I', header)[0]
+            return await reader.readexactly(length), True
+        
+        return first + await reader.readline(), False
+    
+    @staticmethod
+    def _frame(payload: bytes, length_prefixed: bool) -> bytes:
+        """Frame a response the same way the request was framed"""
+        if length_prefixed:
+            return struct.pack('>I', len(payload)) + payload
+        return payload + b'\n'
+    
     async def handle_client(self, reader, writer):
         """Handle a TCP client connection"""
         addr = writer.get_extra_info('peername')
-        self.logger.info(f"New client connected: {addr}")
+        self.logger.info("New client connected: %s", addr)
         
         try:
             while not reader.at_eof():
-                data = await reader.readline()
-                if not data:
+                message = await self._read_message(reader)
+                if message is None:
                     break
                 
-                line = data.decode('utf-8').strip()
+                data, length_prefixed = message
+                line = data.strip()
                 if not line:
                     continue
                 
                 # Parse JSON-RPC request
                 try:
-                    request_data = json.loads(line)
+                    request_data = loads(line)
                 except json.JSONDecodeError:
                     # Send error response for parse error
                     error_response = MCPResponse.error_response(
@@ -124,7 +174,7 @@ class TCPTransport(Transport):
                         "Parse error: invalid JSON",
                         None
                     )
-                    writer.write(json.dumps(error_response.to_dict()).encode('utf-8') + b'\n')
+                    writer.write(self._frame(dumps(error_response.to_dict()), length_prefixed))
                     await writer.drain()
                     continue
                 
@@ -133,26 +183,28 @@ class TCPTransport(Transport):
                 
                 # Send response if any
                 if response is not None:
-                    writer.write(json.dumps(response).encode('utf-8') + b'\n')
+                    writer.write(self._frame(dumps(response), length_prefixed))
                     await writer.drain()
         
+        except asyncio.IncompleteReadError:
+            self.logger.info("Client %s closed the connection mid-message", addr)
         except Exception as e:
-            self.logger.exception(f"Error handling client {addr}: {e}")
+            self.logger.exception("Error handling client %s: %s", addr, e)
         finally:
             writer.close()
             await writer.wait_closed()
-            self.logger.info(f"Client disconnected: {addr}")
+            self.logger.info("Client disconnected: %s", addr)
     
     async def start(self):
         """Start the TCP server"""
-        self.logger.info(f"Starting MCP Server on {self.host}:{self.port}")
+        self.logger.info("Starting MCP Server on %s:%s", self.host, self.port)
         
         self.server_instance = await asyncio.start_server(
             self.handle_client, self.host, self.port
         )
         
         addr = self.server_instance.sockets[0].getsockname()
-        self.logger.info(f"Server running on {addr}")
+        self.logger.info("Server running on %s", addr)
         
         async with self.server_instance:
             await self.server_instance.serve_forever()
@@ -164,3 +216,75 @@ class TCPTransport(Transport):
             self.server_instance.close()
             await self.server_instance.wait_closed()
             self.server_instance = None
+
+
+class UnixSocketTransport(TCPTransport):
+    """Transport using a Unix domain socket
+    
+    Speaks the same protocol as the TCP transport but avoids the TCP/IP stack,
+    which makes it the faster option for clients on the same host.
+    """
+    
+    def __init__(self, server: MCPServer, path: str):
+        """Initialize with server and socket path"""
+        super().__init__(server)
+        self.path = path
+        
+        # (st_dev, st_ino) of the socket file this transport created
+        self._socket_id = None
+    
+    def _remove_stale_socket(self):
+        """Remove a socket file left behind by a previous run
+        
+        Raises:
+            OSError: If the path is not a socket, or a server is still
+                accepting connections on it
+        """
+        try:
+            mode = os.lstat(self.path).st_mode
+        except FileNotFoundError:
+            return
+        
+        if not stat.S_ISSOCK(mode):
+            raise OSError(errno.EEXIST, f"{self.path} exists and is not a socket")
+        
+        probe = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        try:
+            probe.connect(self.path)
+        except (ConnectionRefusedError, FileNotFoundError):
+            # Nothing is listening; the file is stale
+            os.unlink(self.path)
+            return
+        finally:
+            probe.close()
+        
+        raise OSError(errno.EADDRINUSE, f"Another server is listening on {self.path}")
+    
+    async def start(self):
+        """Start the Unix socket server"""
+        self.logger.info("Starting MCP Server on unix socket %s", self.path)
+        
+        self._remove_stale_socket()
+        
+        self.server_instance = await asyncio.start_unix_server(
+            self.handle_client, path=self.path
+        )
+        socket_stat = os.lstat(self.path)
+        self._socket_id = (socket_stat.st_dev, socket_stat.st_ino)
+        
+        async with self.server_instance:
+            await self.server_instance.serve_forever()
+    
+    async def stop(self):
+        """Stop the Unix socket server and remove the socket file it created"""
+        await super().stop()
+        if self._socket_id is None:
+            return
+        
+        try:
+            socket_stat = os.lstat(self.path)
+            if (socket_stat.st_dev, socket_stat.st_ino) == self._socket_id:
+                os.unlink(self.path)
+        except FileNotFoundError:
+            pass
+        self._socket_id = None
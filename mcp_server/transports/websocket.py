@@ -15,7 +15,7 @@ from websockets.server import WebSocketServerProtocol
 
 from mcp_server.core.server import MCPServer
 from mcp_server.transports.base import Transport
-from mcp_server.models.json_rpc import JSONRPCErrorCode, MCPResponse, StreamChunk
+from mcp_server.models.json_rpc import JSONRPCErrorCode, MCPResponse, StreamChunk, dumps, loads
 
 
 class WebSocketTransport(Transport):
@@ -48,7 +48,7 @@ class WebSocketTransport(Transport):
     
     async def start(self):
         """Start the WebSocket server"""
-        self.logger.info(f"Starting MCP Server WebSocket transport on ws://{self.host}:{self.port}{self.path}")
+        self.logger.info("Starting MCP Server WebSocket transport on ws://%s:%s%s", self.host, self.port, self.path)
         
         # Create WebSocket server
         self.server_instance = await websockets.serve(
@@ -61,7 +61,7 @@ class WebSocketTransport(Transport):
             ping_timeout=10    # Wait 10 seconds for pong response
         )
         
-        self.logger.info(f"WebSocket server running on {'wss' if self.ssl_context else 'ws'}://{self.host}:{self.port}{self.path}")
+        self.logger.info("WebSocket server running on %s://%s:%s%s", 'wss' if self.ssl_context else 'ws', self.host, self.port, self.path)
         
         # Keep server running
         await self.server_instance.wait_closed()
@@ -89,13 +89,13 @@ class WebSocketTransport(Transport):
         # Track active connections
         self.active_connections.add(websocket)
         client_id = f"{websocket.remote_address[0]}:{websocket.remote_address[1]}"
-        self.logger.info(f"New WebSocket client connected: {client_id}")
+        self.logger.info("New WebSocket client connected: %s", client_id)
         
         try:
             async for message in websocket:
                 # Parse JSON-RPC message
                 try:
-                    request_data = json.loads(message)
+                    request_data = loads(message)
                 except json.JSONDecodeError:
                     # Send error response for parse error
                     error_response = MCPResponse.error_response(
@@ -103,7 +103,7 @@ class WebSocketTransport(Transport):
                         "Parse error: invalid JSON",
                         None
                     )
-                    await websocket.send(json.dumps(error_response.to_dict()))
+                    await websocket.send(dumps(error_response.to_dict()).decode('utf-8'))
                     continue
                 
                 # Special handling for streaming
@@ -128,12 +128,12 @@ class WebSocketTransport(Transport):
                 
                 # Send response if any (non-streaming case)
                 if response is not None and not is_streaming_request:
-                    await websocket.send(json.dumps(response))
+                    await websocket.send(dumps(response).decode('utf-8'))
         
         except websockets.exceptions.ConnectionClosed as e:
-            self.logger.info(f"WebSocket connection closed with {client_id}: {e}")
+            self.logger.info("WebSocket connection closed with %s: %s", client_id, e)
         except Exception as e:
-            self.logger.exception(f"Error handling WebSocket client {client_id}: {e}")
+            self.logger.exception("Error handling WebSocket client %s: %s", client_id, e)
         finally:
             # Clean up
             self.active_connections.discard(websocket)
@@ -142,7 +142,7 @@ class WebSocketTransport(Transport):
                 if self.streaming_clients[key] == websocket:
                     del self.streaming_clients[key]
             
-            self.logger.info(f"WebSocket client disconnected: {client_id}")
+            self.logger.info("WebSocket client disconnected: %s", client_id)
     
     async def send_stream_chunk(self, stream_id: str, chunk: Dict[str, Any]):
         """Send a stream chunk to a specific client
@@ -152,10 +152,10 @@ class WebSocketTransport(Transport):
         websocket = self.streaming_clients.get(stream_id)
         if websocket and websocket.open:
             try:
-                await websocket.send(json.dumps(chunk))
+                await websocket.send(dumps(chunk).decode('utf-8'))
                 return True
             except Exception as e:
-                self.logger.error(f"Error sending stream chunk to {stream_id}: {e}")
+                self.logger.error("Error sending stream chunk to %s: %s", stream_id, e)
                 return False
         return False
     
@@ -3,6 +3,7 @@ Tests for the AI Development Handlers.
 """
 import pytest
 import os
+import re
 import tempfile
 import shutil
 import asyncio
@@ -12,7 +13,8 @@ from unittest.mock import patch, MagicMock, AsyncMock
 from mcp_server.handlers.ai_development_handlers import (
     CodebaseAnalysisHandler,
     CodeSearchHandler,
-    KnowledgeGraphQueryHandler
+    KnowledgeGraphQueryHandler,
+    _scan_files
 )
 
 class TestCodebaseAnalysisHandler:
@@ -26,6 +28,10 @@ class TestCodebaseAnalysisHandler:
         mongodb_service.repos.update_one = AsyncMock(return_value=None)
         mongodb_service.code_files = MagicMock()
         mongodb_service.code_files.update_one = AsyncMock(return_value=None)
+        mongodb_service.code_files.bulk_write = AsyncMock(return_value=None)
+        mongodb_service.chunks = MagicMock()
+        mongodb_service.chunks.bulk_write = AsyncMock(return_value=None)
+        mongodb_service.store_patterns = AsyncMock(return_value=2)
         
         embedding_service = MagicMock()
         embedding_service.get_embedding = AsyncMock(return_value=[0.1] * 384)
@@ -134,10 +140,21 @@ class TestController:
             
             # Verify repo was stored
             mock_services["mongodb_service"].repos.update_one.assert_called_once()
+            stored = mock_services["mongodb_service"].repos.update_one.call_args[0][1]["$set"]
+            assert stored["updated_at"] == stored["created_at"]
+            
+            # Verify the file batch was stored with a single bulk write
+            mock_services["mongodb_service"].code_files.bulk_write.assert_called_once()
             
             # Verify pattern extractor was called
             mock_services["pattern_extractor"].extract_patterns.assert_called_once()
             
+            # Verify the extracted patterns were stored for pattern queries
+            mock_services["mongodb_service"].store_patterns.assert_called_once_with(
+                "12345678-1234-5678-1234-567812345678",
+                mock_services["pattern_extractor"].extract_patterns.return_value
+            )
+            
             # Verify MD builder was called
             mock_services["md_builder"].generate_documentation.assert_called_once()
     
@@ -214,6 +231,21 @@ class TestController:
                 "exclude_patterns": [],
                 "file_limit": 10
             })
+    
+    def test_scan_files_excludes_by_path(self, tmp_path):
+        """Test exclude patterns match across directory and file names."""
+        for rel_path in ("src/app.py", "src/main.py", "src/models/user.py",
+                         "src/models/order.py", "node_modules/lib.js"):
+            path = tmp_path / rel_path
+            path.parent.mkdir(parents=True, exist_ok=True)
+            path.write_text("")
+        
+        exclude_re = re.compile("|".join(map(re.escape, ["models/user", "src/app", "node_modules/"])))
+        found = {
+            os.path.relpath(entry.path, tmp_path)
+            for entry in _scan_files(str(tmp_path), exclude_re)
+        }
+        assert found == {os.path.join("src", "main.py"), os.path.join("src", "models", "order.py")}
 
 
 class TestCodeSearchHandler:
@@ -398,30 +430,35 @@ class TestKnowledgeGraphQueryHandler:
             }
         })
         
-        # Mock component query
-        service.find_one = AsyncMock(return_value={
+        # Mock component query; no exact match, so the aggregation answers
+        service.find = AsyncMock(return_value=[])
+        service.aggregate = AsyncMock(return_value=[{
+            "_rank": 0,
             "file_id": "file1",
             "path": "src/components/UserComponent.jsx",
             "language": "javascript",
             "metadata": {
-                "classes": [
-                    {
-                        "name": "UserComponent",
-                        "methods": [
-                            {"name": "render", "params": [], "return_type": "JSX.Element"}
-                        ],
-                        "properties": [
-                            {"name": "state", "type": "object"}
-                        ]
-                    }
-                ],
                 "namespace": "components"
-            }
-        })
+            },
+            "matched_classes": [
+                {
+                    "name": "UserComponent",
+                    "methods": [
+                        {"name": "render", "params": [], "return_type": "JSX.Element"}
+                    ],
+                    "properties": [
+                        {"name": "state", "type": "object"}
+                    ]
+                }
+            ]
+        }])
         
         # Mock file count
         service.count = AsyncMock(return_value=120)
         
+        # No stored pattern rows; pattern queries search the repository
+        service.find_pattern = AsyncMock(return_value=None)
+        
         return service
     
     @pytest.mark.asyncio
@@ -456,9 +493,20 @@ class TestKnowledgeGraphQueryHandler:
         
         # Verify services were called correctly
         mock_mongodb_service.initialize.assert_called_once()
-        mock_mongodb_service.get_repository.assert_called_once_with("test-repo-id")
+        mock_mongodb_service.get_repository.assert_called_once()
+        assert mock_mongodb_service.get_repository.call_args[0][0] == "test-repo-id"
         mock_mongodb_service.count.assert_called_once()
     
+    def test_general_result_pattern_without_name(self, mock_mongodb_service):
+        """Test a stored pattern without a name is reported as None."""
+        handler = KnowledgeGraphQueryHandler(
+            mongodb_service=mock_mongodb_service
+        )
+        
+        repo = {"metadata": {"knowledge": {"patterns": {"design_patterns": [{"name": "Factory"}, {}]}}}}
+        result = handler._general_result("test-repo-id", repo, 1)
+        assert result["patterns"]["design_patterns"] == ["Factory", None]
+    
     @pytest.mark.asyncio
     async def test_component_query(self, mock_mongodb_service):
         """Test component-specific knowledge graph query."""
@@ -489,8 +537,58 @@ class TestKnowledgeGraphQueryHandler:
         assert "render" in [m["name"] for m in component["methods"]]
         
         # Verify services were called correctly
-        mock_mongodb_service.get_repository.assert_called_once_with("test-repo-id")
-        mock_mongodb_service.find_one.assert_called_once()
+        mock_mongodb_service.get_repository.assert_called_once()
+        assert mock_mongodb_service.get_repository.call_args[0][0] == "test-repo-id"
+        mock_mongodb_service.aggregate.assert_called_once()
+    
+    @pytest.mark.asyncio
+    async def test_component_exact_match(self, mock_mongodb_service):
+        """Test an exact component name is answered by find without aggregating."""
+        mock_mongodb_service.find.return_value = [{
+            "path": "src/services/UserService.cs",
+            "code_language": "csharp",
+            "metadata": {
+                "namespace": "App.Services",
+                "classes": [
+                    {"name": "UserService", "methods": [{"name": "GetUser"}]},
+                    {"name": "OrderService"}
+                ],
+                "interfaces": [
+                    {"name": "IUserService"}
+                ]
+            }
+        }]
+        
+        # Create handler
+        handler = KnowledgeGraphQueryHandler(
+            mongodb_service=mock_mongodb_service
+        )
+        
+        # Handle request
+        result = await handler.handle({
+            "repo_id": "test-repo-id",
+            "query_type": "component",
+            "component_name": "userservice"
+        })
+        
+        # Only the entries containing the name are reported
+        assert result["status"] == "success"
+        assert [(m["name"], m["type"]) for m in result["matches"]] == [
+            ("UserService", "class"),
+            ("IUserService", "interface")
+        ]
+        assert result["matches"][0]["namespace"] == "App.Services"
+        assert result["matches"][0]["code_language"] == "csharp"
+        
+        # The exact lookup is collated and projected; no aggregation ran
+        kwargs = mock_mongodb_service.find.call_args[1]
+        assert kwargs["collation"] == mock_mongodb_service.NAME_COLLATION
+        assert kwargs["projection"]["metadata.classes"] == 1
+        assert kwargs["query"]["$or"] == [
+            {"metadata.classes.name": "userservice"},
+            {"metadata.interfaces.name": "userservice"}
+        ]
+        mock_mongodb_service.aggregate.assert_not_called()
     
     @pytest.mark.asyncio
     async def test_pattern_query(self, mock_mongodb_service):
@@ -515,7 +613,214 @@ class TestKnowledgeGraphQueryHandler:
         assert "src/factories/UserFactory.java" in result["pattern_info"]["sources"]
         
         # Verify services were called correctly
-        mock_mongodb_service.get_repository.assert_called_once_with("test-repo-id")
+        mock_mongodb_service.get_repository.assert_called_once()
+        assert mock_mongodb_service.get_repository.call_args[0][0] == "test-repo-id"
+    
+    @pytest.mark.asyncio
+    async def test_stored_pattern_query(self, mock_mongodb_service):
+        """Test a stored pattern row answers without reading the repository."""
+        mock_mongodb_service.find_pattern.return_value = {
+            "name": "Factory",
+            "type": "design_pattern",
+            "confidence": 0.8,
+            "sources": ["src/factories/UserFactory.java"],
+            "count": 1
+        }
+        handler = KnowledgeGraphQueryHandler(
+            mongodb_service=mock_mongodb_service
+        )
+        
+        result = await handler.handle({
+            "repo_id": "test-repo-id",
+            "query_type": "pattern",
+            "pattern_name": "factory"
+        })
+        
+        assert result["status"] == "success"
+        assert result["pattern_info"]["type"] == "design_pattern"
+        mock_mongodb_service.find_pattern.assert_called_once_with("test-repo-id", "factory")
+        mock_mongodb_service.get_repository.assert_not_called()
+    
+    @pytest.mark.asyncio
+    async def test_repository_cache(self, mock_mongodb_service):
+        """Test repository documents are reused across queries and revalidated."""
+        mock_mongodb_service.get_repository.return_value = {
+            **mock_mongodb_service.get_repository.return_value,
+            "updated_at": "2024-01-01T00:00:00"
+        }
+        handler = KnowledgeGraphQueryHandler(
+            mongodb_service=mock_mongodb_service
+        )
+        
+        # Back-to-back queries read the repository once
+        await handler.handle({"repo_id": "test-repo-id", "query_type": "general"})
+        await handler.handle({"repo_id": "test-repo-id", "query_type": "pattern", "pattern_name": "MVC"})
+        mock_mongodb_service.get_repository.assert_called_once()
+        
+        # Once expired, an unchanged repository is only revalidated
+        handler._repositories["test-repo-id"] = (0.0, handler._repositories["test-repo-id"][1])
+        mock_mongodb_service.get_repository.reset_mock()
+        mock_mongodb_service.get_repository.return_value = {"updated_at": "2024-01-01T00:00:00"}
+        result = await handler.handle({"repo_id": "test-repo-id", "query_type": "general"})
+        assert result["repo_name"] == "test-repo"
+        mock_mongodb_service.get_repository.assert_called_once_with(
+            "test-repo-id", projection={"_id": 0, "updated_at": 1}
+        )
+    
+    @pytest.mark.asyncio
+    async def test_missing_repository_cache(self, mock_mongodb_service):
+        """Test unknown repositories are rejected without querying again."""
+        mock_mongodb_service.get_repository.return_value = None
+        handler = KnowledgeGraphQueryHandler(
+            mongodb_service=mock_mongodb_service
+        )
+        
+        for _ in range(2):
+            with pytest.raises(ValueError, match="not found"):
+                await handler.handle({"repo_id": "missing-repo", "query_type": "general"})
+        mock_mongodb_service.get_repository.assert_called_once()
+        
+        # Once expired, the repository is looked up again
+        handler._missing["missing-repo"] = 0.0
+        with pytest.raises(ValueError, match="not found"):
+            await handler.handle({"repo_id": "missing-repo", "query_type": "general"})
+        assert mock_mongodb_service.get_repository.call_count == 2
+    
+    def test_component_pipeline_uses_name_grams(self, mock_mongodb_service):
+        """Test component lookups narrow candidates with the stored name grams."""
+        handler = KnowledgeGraphQueryHandler(
+            mongodb_service=mock_mongodb_service
+        )
+        
+        # Names long enough are matched on their grams, with a regex for
+        # files stored without grams
+        match = handler._component_pipeline("test-repo-id", "UserComp")[0]["$match"]
+        assert match["repo_id"] == "test-repo-id"
+        assert match["$or"][0] == {"name_grams": {"$all": ["com", "erc", "omp", "rco", "ser", "use"]}}
+        assert match["$or"][1]["name_grams"] == {"$exists": False}
+        
+        # Shorter names fall back to the regex alone
+        match = handler._component_pipeline("test-repo-id", "Us")[0]["$match"]
+        assert "name_grams" not in str(match)
+    
+    def test_pattern_index(self, mock_mongodb_service):
+        """Test pattern lookups prefer exact names and cache per repository version."""
+        handler = KnowledgeGraphQueryHandler(
+            mongodb_service=mock_mongodb_service
+        )
+        repo = {
+            "updated_at": "2024-01-01T00:00:00",
+            "metadata": {
+                "knowledge": {
+                    "patterns": {
+                        "design_patterns": [{"name": "Abstract Factory"}, {"name": "Factory"}],
+                        "code_organization": [{"name": "Layer-based Organization"}]
+                    }
+                }
+            }
+        }
+        
+        # An exact name wins over an earlier substring match
+        result = handler._pattern_result("test-repo-id", "factory", repo)
+        assert result["pattern_info"]["name"] == "Factory"
+        
+        # Otherwise the first name containing the query is used
+        result = handler._pattern_result("test-repo-id", "layer", repo)
+        assert result["pattern_info"]["type"] == "code_organization"
+        
+        # The index is built once for this version of the repository
+        assert handler._pattern_index("test-repo-id", repo) is handler._pattern_index("test-repo-id", repo)
+    
+    @pytest.mark.asyncio
+    async def test_batch_query(self, mock_mongodb_service):
+        """Test several views are answered by a single aggregation."""
+        # The repository document with the file count and component lookups
+        mock_mongodb_service.aggregate.return_value = [{
+            **mock_mongodb_service.get_repository.return_value,
+            "file_count": [{"count": 120}],
+            "components": mock_mongodb_service.aggregate.return_value
+        }]
+        
+        # Create handler
+        handler = KnowledgeGraphQueryHandler(
+            mongodb_service=mock_mongodb_service
+        )
+        
+        # Handle request
+        result = await handler.handle({
+            "repo_id": "test-repo-id",
+            "include": ["general", "component", "pattern"],
+            "component_name": "UserComponent",
+            "pattern_name": "Factory"
+        })
+        
+        # Verify result
+        assert result["status"] == "success"
+        views = result["results"]
+        assert views["general"]["file_count"] == 120
+        assert "MVC" in views["general"]["patterns"]["architectural_patterns"]
+        assert views["component"]["matches"][0]["name"] == "UserComponent"
+        assert views["pattern"]["pattern_info"]["name"] == "Factory"
+        
+        # Verify one aggregation answered every view
+        mock_mongodb_service.aggregate.assert_called_once()
+        assert mock_mongodb_service.aggregate.call_args[1]["collection"] == "repositories"
+        mock_mongodb_service.get_repository.assert_not_called()
+        mock_mongodb_service.count.assert_not_called()
+        
+        # A view needing a name is rejected without one
+        with pytest.raises(ValueError, match="pattern_name is required"):
+            await handler.handle({
+                "repo_id": "test-repo-id",
+                "include": ["general", "pattern"]
+            })
+    
+    @pytest.mark.asyncio
+    async def test_batch_query_stored_pattern(self, mock_mongodb_service):
+        """Test the batched pattern view answers from stored pattern rows."""
+        # An analyzed repository keeps its patterns only in repo_patterns
+        mock_mongodb_service.aggregate.return_value = [{
+            "name": "test-repo",
+            "file_count": [{"count": 120}]
+        }]
+        mock_mongodb_service.find_pattern.return_value = {
+            "name": "Factory",
+            "type": "design_pattern",
+            "confidence": 0.8,
+            "sources": ["src/factories/UserFactory.java"],
+            "count": 1
+        }
+        handler = KnowledgeGraphQueryHandler(
+            mongodb_service=mock_mongodb_service
+        )
+        
+        result = await handler.handle({
+            "repo_id": "test-repo-id",
+            "include": ["general", "pattern"],
+            "pattern_name": "factory"
+        })
+        
+        views = result["results"]
+        assert views["general"]["file_count"] == 120
+        assert views["pattern"]["status"] == "success"
+        assert views["pattern"]["pattern_info"]["type"] == "design_pattern"
+        mock_mongodb_service.find_pattern.assert_called_once_with("test-repo-id", "factory")
+    
+    @pytest.mark.asyncio
+    async def test_single_included_view(self, mock_mongodb_service):
+        """Test including one view answers it like a query of that type."""
+        handler = KnowledgeGraphQueryHandler(
+            mongodb_service=mock_mongodb_service
+        )
+        
+        result = await handler.handle({
+            "repo_id": "test-repo-id",
+            "include": ["pattern"],
+            "pattern_name": "Factory"
+        })
+        
+        assert result["status"] == "success"
+        assert result["pattern_info"]["name"] == "Factory"
     
     @pytest.mark.asyncio
     async def test_error_handling(self, mock_mongodb_service):
@@ -531,8 +836,16 @@ class TestKnowledgeGraphQueryHandler:
                 "query_type": "general"
             })
         
+        # Test malformed repo_id, rejected before touching MongoDB
+        with pytest.raises(ValueError, match="Repository ID must be"):
+            await handler.handle({
+                "repo_id": "test-repo-id.*",
+                "query_type": "general"
+            })
+        mock_mongodb_service.initialize.assert_not_called()
+        
         # Test component not found
-        mock_mongodb_service.find_one.return_value = None
+        mock_mongodb_service.aggregate.return_value = []
         result = await handler.handle({
             "repo_id": "test-repo-id",
             "query_type": "component",
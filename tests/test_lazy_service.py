@@ -0,0 +1,42 @@
+"""
+Tests for the lazy service proxy.
+"""
+from mcp_server.services.lazy import LazyService
+
+
+class _Service:
+    def __init__(self):
+        self.model = "default"
+
+    def describe(self):
+        return f"service:{self.model}"
+
+
+class TestLazyService:
+
+    def test_factory_runs_on_first_access(self):
+        """Test the service is only built when an attribute is read."""
+        calls = []
+
+        def factory():
+            calls.append(1)
+            return _Service()
+
+        proxy = LazyService(factory)
+        assert not proxy.resolved
+        assert calls == []
+
+        assert proxy.describe() == "service:default"
+        assert proxy.resolved
+        proxy.describe()
+        assert calls == [1]
+
+    def test_pending_attributes_applied_after_construction(self):
+        """Test attributes set before construction are replayed on the service."""
+        proxy = LazyService(_Service)
+        proxy.model = "configured"
+        assert not proxy.resolved
+
+        assert proxy.model == "configured"
+        proxy.model = "changed"
+        assert proxy.resolve().model == "changed"
@@ -26,6 +26,7 @@ class TestMongoDBService:
         mock_components = MagicMock()
         mock_relationships = MagicMock()
         mock_chunks = MagicMock()
+        mock_patterns = MagicMock()
         
         # Set up the collections dict
         mock_db.__getitem__.side_effect = {
@@ -34,7 +35,8 @@ class TestMongoDBService:
             "classes": mock_classes,
             "components": mock_components,
             "relationships": mock_relationships,
-            "chunks": mock_chunks
+            "chunks": mock_chunks,
+            "repo_patterns": mock_patterns
         }.__getitem__
         
         # Set up successful index creation
@@ -44,6 +46,7 @@ class TestMongoDBService:
         mock_components.create_index = AsyncMock(return_value=None)
         mock_relationships.create_index = AsyncMock(return_value=None)
         mock_chunks.create_index = AsyncMock(return_value=None)
+        mock_patterns.create_index = AsyncMock(return_value=None)
         
         # Create service
         service = MongoDBService(uri="mongodb://localhost:27017", db_name="test-db")
@@ -62,6 +65,16 @@ class TestMongoDBService:
         assert mock_components.create_index.called
         assert mock_relationships.create_index.called
         assert mock_chunks.create_index.called
+        assert mock_patterns.create_index.called
+        
+        # Lower-cased name grams are indexed without a collation
+        name_grams_keys = [("repo_id", 1), ("name_grams", 1)]
+        mock_code_files.create_index.assert_any_call(name_grams_keys)
+        
+        # Later calls reuse the existing indexes
+        mock_repos.create_index.reset_mock()
+        assert await service.initialize() is True
+        mock_repos.create_index.assert_not_called()
     
     @pytest.mark.asyncio
     @patch('motor.motor_asyncio.AsyncIOMotorClient')
@@ -225,4 +238,113 @@ class TestMongoDBService:
             # Verify the results
             assert len(results) == 2
             assert results[0]["file_id"] == "file1"
-            assert results[1]["file_id"] == "file2"
\ No newline at end of file
+            assert results[1]["file_id"] == "file2"    
+    @pytest.mark.asyncio
+    @patch('motor.motor_asyncio.AsyncIOMotorClient')
+    async def test_queries_with_collation(self, mock_motor_client):
+        """Test generic queries pass the collation through to the collection."""
+        # Setup mocks
+        mock_client = MagicMock()
+        mock_db = MagicMock()
+        mock_client.__getitem__.return_value = mock_db
+        mock_motor_client.return_value = mock_client
+        
+        mock_code_files = MagicMock()
+        mock_db.__getitem__.return_value = mock_code_files
+        
+        cursor = MagicMock()
+        cursor.to_list = AsyncMock(return_value=[{"path": "file1.py"}])
+        mock_code_files.find.return_value = cursor
+        mock_code_files.find_one = AsyncMock(return_value={"path": "file1.py"})
+        
+        # Create service
+        service = MongoDBService(uri="mongodb://localhost:27017", db_name="test-db")
+        collation = MongoDBService.NAME_COLLATION
+        
+        # Find many
+        results = await service.find("code_files", {"repo_id": "test-repo"}, limit=5, collation=collation)
+        assert results == [{"path": "file1.py"}]
+        mock_code_files.find.assert_called_once_with({"repo_id": "test-repo"}, None, limit=5, collation=collation)
+        cursor.to_list.assert_called_once_with(length=5)
+        
+        # Find one
+        result = await service.find_one("code_files", {"repo_id": "test-repo"}, collation=collation)
+        assert result == {"path": "file1.py"}
+        mock_code_files.find_one.assert_called_once_with({"repo_id": "test-repo"}, collation=collation)
+        
+        # Aggregate
+        mock_code_files.aggregate.return_value = cursor
+        pipeline = [{"$match": {"repo_id": "test-repo"}}]
+        results = await service.aggregate("code_files", pipeline, collation=collation)
+        assert results == [{"path": "file1.py"}]
+        mock_code_files.aggregate.assert_called_once_with(pipeline, collation=collation)
+    
+    @pytest.mark.asyncio
+    @patch('motor.motor_asyncio.AsyncIOMotorClient')
+    async def test_get_repository_and_count(self, mock_motor_client):
+        """Test repository lookups pass the projection and counts pass the index hint."""
+        # Setup mocks
+        mock_client = MagicMock()
+        mock_db = MagicMock()
+        mock_client.__getitem__.return_value = mock_db
+        mock_motor_client.return_value = mock_client
+        
+        mock_collection = MagicMock()
+        mock_db.__getitem__.return_value = mock_collection
+        mock_collection.find_one = AsyncMock(return_value={"name": "test-repo"})
+        mock_collection.count_documents = AsyncMock(return_value=3)
+        
+        # Create service
+        service = MongoDBService(uri="mongodb://localhost:27017", db_name="test-db")
+        
+        # Projected repository lookup
+        repo = await service.get_repository("test-repo", projection={"name": 1})
+        assert repo == {"name": "test-repo"}
+        mock_collection.find_one.assert_called_once_with({"repo_id": "test-repo"}, {"name": 1})
+        
+        # Count with and without an index hint
+        assert await service.count("code_files", {"repo_id": "test-repo"}, hint=[("repo_id", 1)]) == 3
+        mock_collection.count_documents.assert_called_with({"repo_id": "test-repo"}, hint=[("repo_id", 1)])
+        assert await service.count("code_files", {"repo_id": "test-repo"}) == 3
+        mock_collection.count_documents.assert_called_with({"repo_id": "test-repo"})
+    
+    @pytest.mark.asyncio
+    @patch('motor.motor_asyncio.AsyncIOMotorClient')
+    async def test_store_and_find_patterns(self, mock_motor_client):
+        """Test patterns are stored one per document and found exact match first."""
+        # Setup mocks
+        mock_client = MagicMock()
+        mock_db = MagicMock()
+        mock_client.__getitem__.return_value = mock_db
+        mock_motor_client.return_value = mock_client
+        
+        mock_patterns = MagicMock()
+        mock_db.__getitem__.return_value = mock_patterns
+        mock_patterns.delete_many = AsyncMock()
+        mock_patterns.insert_many = AsyncMock()
+        mock_patterns.find_one = AsyncMock(side_effect=[None, {"name": "Factory Method"}])
+        
+        # Create service
+        service = MongoDBService(uri="mongodb://localhost:27017", db_name="test-db")
+        
+        # Store patterns, replacing the repository's previous ones
+        stored = await service.store_patterns("test-repo", {
+            "design_patterns": [{"name": "Factory Method", "confidence": 0.8, "sources": ["a.py"]}],
+            "code_organization": [{"name": "Layer-based Organization", "confidence": 0.9}]
+        })
+        assert stored == 2
+        mock_patterns.delete_many.assert_called_once_with({"repo_id": "test-repo"})
+        docs = mock_patterns.insert_many.call_args[0][0]
+        assert [(d["name_lc"], d["type"], d["order"]) for d in docs] == [
+            ("factory method", "design_pattern", 0),
+            ("layer-based organization", "code_organization", 1)
+        ]
+        assert docs[1]["count"] == 1
+        
+        # An exact miss falls back to a substring match
+        pattern = await service.find_pattern("test-repo", "Factory")
+        assert pattern == {"name": "Factory Method"}
+        exact, contains = mock_patterns.find_one.call_args_list
+        assert exact[0][0] == {"repo_id": "test-repo", "name_lc": "factory"}
+        assert contains[0][0] == {"repo_id": "test-repo", "name_lc": {"$regex": "factory"}}
+        assert contains[1]["sort"] == [("order", 1)]
@@ -61,6 +61,46 @@ class TestQdrantVectorService:
         assert result is True
         client_instance.create_collection.assert_not_called()
     
+    @pytest.mark.asyncio
+    async def test_initialize_quantization(self):
+        """Test the collection is created with int8 quantization unless disabled."""
+        client_instance = MagicMock()
+        client_instance.get_collections.return_value = MagicMock(collections=[])
+        
+        service = QdrantVectorService(collection_name="test-collection")
+        service.client = client_instance
+        await service.initialize()
+        
+        call_args = client_instance.create_collection.call_args
+        assert call_args[1]["vectors_config"].on_disk is True
+        assert call_args[1]["quantization_config"].scalar.type == "int8"
+        
+        # Quantization can be turned off
+        client_instance.reset_mock()
+        service = QdrantVectorService(collection_name="test-collection", quantize=False)
+        service.client = client_instance
+        await service.initialize()
+        
+        assert "quantization_config" not in client_instance.create_collection.call_args[1]
+    
+    @pytest.mark.asyncio
+    async def test_pause_and_resume_indexing(self):
+        """Test HNSW indexing is switched off and back on around bulk uploads."""
+        client_instance = MagicMock()
+        service = QdrantVectorService(collection_name="test-collection")
+        service.client = client_instance
+        
+        await service.pause_indexing()
+        call_args = client_instance.update_collection.call_args
+        assert call_args[1]["collection_name"] == "test-collection"
+        assert call_args[1]["optimizers_config"].indexing_threshold == 0
+        assert call_args[1]["hnsw_config"].m == 0
+        
+        await service.resume_indexing()
+        call_args = client_instance.update_collection.call_args
+        assert call_args[1]["optimizers_config"].indexing_threshold > 0
+        assert call_args[1]["hnsw_config"].m == 16
+    
     @pytest.mark.asyncio
     @patch('qdrant_client.QdrantClient')
     async def test_store_code_chunk(self, mock_client):
@@ -161,6 +201,8 @@ class TestQdrantVectorService:
         assert call_args[1]["limit"] == 5
         # Filter should have been passed
         assert call_args[1]["query_filter"] is not None
+        # Quantized candidates should be rescored
+        assert call_args[1]["search_params"].quantization.rescore is True
     
     @pytest.mark.asyncio
     @patch('qdrant_client.QdrantClient')
@@ -0,0 +1,80 @@
+"""
+Tests for the core MCP server request processing.
+"""
+import asyncio
+import pytest
+
+from mcp_server.config.settings import MCPServerConfig
+from mcp_server.core.server import HandlerInterface, MCPServer
+
+
+class _SleepHandler(HandlerInterface):
+    def __init__(self):
+        self.active = 0
+        self.peak = 0
+
+    async def handle(self, params):
+        self.active += 1
+        self.peak = max(self.peak, self.active)
+        await asyncio.sleep(params.get("delay", 0))
+        self.active -= 1
+        return {"value": params.get("value")}
+
+
+class TestMCPServer:
+
+    @pytest.fixture
+    def server(self):
+        server = MCPServer(MCPServerConfig())
+        server.register_method_handler("sleep", _SleepHandler())
+        return server
+
+    @pytest.mark.asyncio
+    async def test_batch_runs_concurrently_in_order(self, server):
+        """Test batch items are dispatched together and answered in request order."""
+        batch = [
+            {"jsonrpc": "2.0", "id": i, "method": "sleep", "params": {"delay": 0.05 * (3 - i), "value": i}}
+            for i in range(3)
+        ]
+
+        responses = await server.process_jsonrpc_message(batch)
+
+        assert [r["id"] for r in responses] == [0, 1, 2]
+        assert [r["result"]["value"] for r in responses] == [0, 1, 2]
+        assert server.method_handlers["sleep"].peak == 3
+
+    @pytest.mark.asyncio
+    async def test_batch_skips_notifications_and_reports_errors(self, server):
+        """Test notifications get no response and bad items keep their position."""
+        batch = [
+            {"jsonrpc": "2.0", "method": "sleep", "params": {"value": "note"}},
+            {"jsonrpc": "2.0", "id": 1, "method": "missing"},
+            {"jsonrpc": "2.0", "id": 2, "method": "sleep", "params": {"value": 2}},
+        ]
+
+        responses = await server.process_jsonrpc_message(batch)
+
+        assert [r["id"] for r in responses] == [1, 2]
+        assert responses[0]["error"]["code"] == -32601
+        assert responses[1]["result"] == {"value": 2}
+
+    @pytest.mark.asyncio
+    async def test_notification_runs_handler_without_response(self, server):
+        """Test a single notification is handled but never answered."""
+        handler = server.method_handlers["sleep"]
+
+        response = await server.process_jsonrpc_message(
+            {"jsonrpc": "2.0", "method": "sleep", "params": {"value": 1}}
+        )
+
+        assert response is None
+        assert handler.peak == 1
+
+    @pytest.mark.asyncio
+    async def test_batch_tolerates_non_object_items(self, server):
+        """Test a malformed batch item does not fail the rest of the batch."""
+        batch = [1, {"jsonrpc": "2.0", "id": 2, "method": "sleep", "params": {"value": 2}}]
+
+        responses = await server.process_jsonrpc_message(batch)
+
+        assert responses == [{"jsonrpc": "2.0", "id": 2, "result": {"value": 2}}]
@@ -0,0 +1,78 @@
+"""
+Tests for the Unix socket transport's socket file handling.
+"""
+import asyncio
+import os
+import socket
+import tempfile
+
+import pytest
+
+from mcp_server.config.settings import MCPServerConfig
+from mcp_server.core.server import MCPServer
+from mcp_server.transports.base import UnixSocketTransport
+
+
+class TestUnixSocketTransport:
+
+    @pytest.fixture
+    def socket_path(self):
+        # Short directory; socket paths are limited to ~100 characters
+        with tempfile.TemporaryDirectory(dir="/tmp") as tmp:
+            yield os.path.join(tmp, "mcp.sock")
+
+    @pytest.fixture
+    def transport(self, socket_path):
+        return UnixSocketTransport(MCPServer(MCPServerConfig()), socket_path)
+
+    def test_refuses_regular_file(self, transport, socket_path):
+        """Test a path holding a regular file is left untouched."""
+        with open(socket_path, "w") as f:
+            f.write("notes")
+
+        with pytest.raises(OSError, match="not a socket"):
+            transport._remove_stale_socket()
+        assert os.path.isfile(socket_path)
+
+    def test_refuses_live_socket(self, transport, socket_path):
+        """Test the socket of a running server is not taken over."""
+        listener = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        listener.bind(socket_path)
+        listener.listen(1)
+        try:
+            with pytest.raises(OSError, match="listening"):
+                transport._remove_stale_socket()
+            assert os.path.exists(socket_path)
+        finally:
+            listener.close()
+
+    def test_removes_stale_socket(self, transport, socket_path):
+        """Test a socket nothing listens on is removed."""
+        stale = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        stale.bind(socket_path)
+        stale.close()
+
+        transport._remove_stale_socket()
+        assert not os.path.exists(socket_path)
+
+    @pytest.mark.asyncio
+    async def test_stop_removes_only_own_socket(self, transport, socket_path):
+        """Test stop() unlinks the socket it created but not a replacement."""
+        task = asyncio.ensure_future(transport.start())
+        while transport._socket_id is None:
+            await asyncio.sleep(0.01)
+
+        await transport.stop()
+        await asyncio.gather(task, return_exceptions=True)
+        assert not os.path.exists(socket_path)
+
+        # A file another process put at the path since survives stop()
+        task = asyncio.ensure_future(transport.start())
+        while transport._socket_id is None:
+            await asyncio.sleep(0.01)
+        os.unlink(socket_path)
+        with open(socket_path, "w") as f:
+            f.write("other")
+        await transport.stop()
+        await asyncio.gather(task, return_exceptions=True)
+        assert os.path.isfile(socket_path)